@@ -0,0 +1,5 @@
+"""
+Воспроизводимые бенчмарки для проекта TaskBot.
+
+Запуск из корня проекта: python -m benchmarks.<имя_модуля>
+"""
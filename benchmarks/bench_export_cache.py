@@ -0,0 +1,110 @@
+"""
+Бенчмарк повторных выгрузок CSV.
+
+Через настоящий диспетчер (create_bot) и RecordingSession выполняются:
+1. первая выгрузка /list_csv — чтение задач и формирование файла;
+2. повторная выгрузка без изменений — отправка сохраненного file_id;
+3. /list_csv new после добавления нескольких задач — только новые строки;
+4. /list_csv после изменения — файл формируется заново.
+
+Для каждого шага печатается время обработки, число запросов к базе
+данных (по метрикам query_hook) и способ отправки документа.
+
+Запуск:
+    python -m benchmarks.bench_export_cache --tasks 100000 --new 50
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.fake_telegram import FAKE_BOT_TOKEN, RecordingSession, make_message_update
+from config import Config
+from main import create_bot, shutdown_bot
+from utils.logger import setup_logger
+from utils.metrics import MetricsRegistry
+
+USER_ID = 1
+QUERIES = ("get_csv_export", "iter_user_task_rows", "save_csv_export")
+
+
+def _query_counts(metrics: MetricsRegistry) -> dict:
+    """Возвращает число выполненных запросов выгрузки по именам."""
+    histogram = metrics.histogram(
+        "taskbot_db_query_duration_seconds", "Время запроса к базе данных", ("query",)
+    )
+    return {name: histogram.count(query=name) for name in QUERIES}
+
+
+async def run(tasks: int, new_tasks: int) -> None:
+    """Выполняет сценарий выгрузок и печатает результаты."""
+    session = RecordingSession()
+    metrics = MetricsRegistry()
+    update_ids = iter(range(1, 1_000_000))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bot, dispatcher = await create_bot(
+            os.path.join(tmp_dir, "tasks.db"), session=session, metrics=metrics
+        )
+        db = getattr(bot, "db_manager")
+        try:
+            await db.add_tasks_bulk(
+                ((f"Задача номер {index}", None, None, None) for index in range(tasks)), USER_ID
+            )
+
+            async def export(name: str, text: str) -> None:
+                before = _query_counts(metrics)
+                calls = len(session.calls)
+                started = time.perf_counter()
+                await dispatcher.feed_raw_update(
+                    bot, make_message_update(next(update_ids), USER_ID, text)
+                )
+                elapsed = time.perf_counter() - started
+                after = _query_counts(metrics)
+                queries = sum(after[key] - before[key] for key in QUERIES)
+                documents = [
+                    call for call in session.calls[calls:] if call.__api_method__ == "sendDocument"
+                ]
+                if not documents:
+                    how = "документ не отправлен"
+                elif isinstance(documents[0].document, str):
+                    how = "повторно по file_id"
+                else:
+                    how = f"новый файл {len(documents[0].document.data)} байт"
+                print(f"{name:<34} {elapsed * 1000:9.2f} мс  запросов к БД: {queries}  {how}")
+
+            await export("Первая выгрузка", "/list_csv")
+            await export("Повторная выгрузка без изменений", "/list_csv")
+            await export("Еще одна без изменений", "/list_csv")
+
+            for index in range(new_tasks):
+                await db.add_task(f"Новая задача {index}", USER_ID)
+            await export(f"Только новые ({new_tasks} задач)", "/list_csv new")
+            await export("Новые после выгрузки новых", "/list_csv new")
+            await export("Полная после добавления", "/list_csv")
+            await export("Полная без изменений", "/list_csv")
+        finally:
+            await shutdown_bot(bot, dispatcher)
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--new", type=int, default=50, help="задач, добавляемых после выгрузки")
+    args = parser.parse_args()
+
+    Config.BOT_TOKEN = FAKE_BOT_TOKEN
+    Config.RATE_LIMIT_ENABLED = False
+    Config.SEND_RATE_LIMIT = False
+    setup_logger("database.db_manager", "WARNING")
+    setup_logger("handlers.task_handler", "WARNING")
+    setup_logger("utils.csv_generator", "WARNING")
+    setup_logger("utils.export_executor", "WARNING")
+    asyncio.run(run(args.tasks, args.new))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Бенчмарк форматов выгрузки задач.
+
+Для каждого экспортера из utils.exporters потоково кодирует одни и те же
+строки задач (порциями, как при чтении из базы данных) и печатает размер
+файла, время кодирования и их отношение к несжатому CSV.
+
+Запуск:
+    python -m benchmarks.bench_exporters --tasks 100000 --repeat 3
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import AsyncIterator, List
+
+from database.db_manager import format_created_at
+from database.models import TASK_STATUSES, TaskRow
+from utils.exporters import EXPORTERS, build_export, get_exporter
+from utils.logger import setup_logger
+
+WORDS = (
+    "купить", "молоко", "позвонить", "маме", "отчет", "встреча", "проект", "сдать",
+    "оплатить", "счет", "заказать", "билеты", "починить", "кран", "написать", "письмо",
+    "подготовить", "презентацию", "забрать", "посылку", "записаться", "к врачу",
+)
+CATEGORIES = ("", "Работа", "Личное", "Учеба")
+
+
+def make_rows(tasks: int, seed: int = 1) -> List[TaskRow]:
+    """Формирует строки задач с текстом из 3–8 случайных слов."""
+    generator = random.Random(seed)
+    created_at = format_created_at()
+    return [
+        (
+            task_id,
+            " ".join(generator.choices(WORDS, k=generator.randint(3, 8))),
+            123456789,
+            created_at,
+            generator.choice(list(TASK_STATUSES)),
+            generator.choice(CATEGORIES),
+        )
+        for task_id in range(1, tasks + 1)
+    ]
+
+
+async def _chunks(rows: List[TaskRow], chunk_size: int) -> AsyncIterator[List[TaskRow]]:
+    """Отдает строки порциями, как DatabaseManager.iter_user_task_rows."""
+    for start in range(0, len(rows), chunk_size):
+        yield rows[start:start + chunk_size]
+
+
+async def run(tasks: int, repeat: int, chunk_size: int) -> None:
+    """Кодирует строки во всех форматах и печатает результаты."""
+    rows = make_rows(tasks)
+    baseline_size = baseline_time = 0.0
+    print(f"{'Формат':<8} {'Байт':>12} {'Размер':>8} {'Время, мс':>10} {'Время':>7}")
+    for name in EXPORTERS:
+        timings = []
+        size = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content, count = await build_export(get_exporter(name), _chunks(rows, chunk_size))
+            timings.append(time.perf_counter() - started)
+            size = len(content)
+            assert count == tasks
+        elapsed = min(timings)
+        if not baseline_size:
+            baseline_size, baseline_time = size, elapsed
+        print(
+            f"{name:<8} {size:>12} {size / baseline_size:>7.1%} "
+            f"{elapsed * 1000:>10.1f} {elapsed / baseline_time:>6.2f}x"
+        )
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3, help="повторов, берется лучший")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_logger("utils.exporters", "WARNING")
+    asyncio.run(run(args.tasks, args.repeat, args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Бенчмарк пропускной способности хранилищ FSM: SQLiteStorage против MemoryStorage.
+
+Для каждого хранилища выполняется типичный диалог /add для N пользователей:
+set_state -> get_state -> get_data -> set_state(None). Отдельно измеряется
+«холодное» чтение состояний SQLiteStorage после перезапуска (пустой кэш).
+
+Запуск:
+    python -m benchmarks.bench_fsm_storage --users 10000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List
+
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from database.db_manager import DatabaseManager
+from database.fsm_storage import SQLiteStorage
+from utils.logger import setup_logger
+
+BOT_ID = 42
+STATE = "TaskStates:waiting_for_task_text"
+
+
+def _keys(users: int) -> List[StorageKey]:
+    """Формирует ключи FSM для личных чатов пользователей."""
+    return [StorageKey(bot_id=BOT_ID, chat_id=user_id, user_id=user_id) for user_id in range(users)]
+
+
+async def _dialog(storage: BaseStorage, keys: List[StorageKey]) -> float:
+    """
+    Выполняет сценарий диалога для всех ключей и возвращает операций в секунду.
+    """
+    started = time.perf_counter()
+    for key in keys:
+        await storage.set_state(key, STATE)
+    for key in keys:
+        await storage.get_state(key)
+        await storage.get_data(key)
+    for key in keys:
+        await storage.set_state(key, None)
+    elapsed = time.perf_counter() - started
+    return len(keys) * 4 / elapsed
+
+
+async def _cold_reads(db: DatabaseManager, keys: List[StorageKey]) -> float:
+    """
+    Читает состояния новым экземпляром SQLiteStorage (как после перезапуска)
+    и возвращает операций в секунду.
+    """
+    storage = SQLiteStorage(db)
+    started = time.perf_counter()
+    for key in keys:
+        await storage.get_state(key)
+    elapsed = time.perf_counter() - started
+    await storage.close()
+    return len(keys) / elapsed
+
+
+async def run(users: int) -> None:
+    """Выполняет бенчмарк и печатает результаты."""
+    keys = _keys(users)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = DatabaseManager(os.path.join(tmp_dir, "bench.db"))
+        setup_logger("database.db_manager", "WARNING")
+        setup_logger("database.fsm_storage", "WARNING")
+        await db.create_tables()
+
+        memory_rate = await _dialog(MemoryStorage(), keys)
+
+        sqlite_storage = SQLiteStorage(db)
+        sqlite_rate = await _dialog(sqlite_storage, keys)
+        flush_started = time.perf_counter()
+        await sqlite_storage.close()
+        flush_ms = (time.perf_counter() - flush_started) * 1000
+
+        # Оставляем пользователей «посреди диалога» и читаем состояния с пустым кэшем
+        persisted = SQLiteStorage(db)
+        for key in keys:
+            await persisted.set_state(key, STATE)
+        await persisted.close()
+        cold_rate = await _cold_reads(db, keys)
+
+        await db.close()
+
+    print(f"Пользователей: {users}")
+    print(f"MemoryStorage:                {memory_rate:>12,.0f} опер./с")
+    print(f"SQLiteStorage (кэш):          {sqlite_rate:>12,.0f} опер./с")
+    print(f"SQLiteStorage (холодное чтение): {cold_rate:>9,.0f} опер./с")
+    print(f"Сброс изменений при закрытии: {flush_ms:>12.1f} мс")
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=10_000)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.users))
+
+
+if __name__ == "__main__":
+    main()
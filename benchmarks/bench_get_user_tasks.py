@@ -0,0 +1,122 @@
+"""
+Бенчмарк DatabaseManager.get_user_tasks при росте таблицы tasks.
+
+Для каждого размера таблицы измеряется медианная задержка получения задач
+одного пользователя с фиксированным числом задач. Благодаря индексу
+(user_id, created_at, id) задержка не должна зависеть от общего числа строк.
+Для сравнения тот же набор данных загружается в базу со схемой до миграций
+(без индекса) и измеряется прежний запрос с ORDER BY datetime(created_at).
+
+Запуск:
+    python -m benchmarks.bench_get_user_tasks --sizes 10000 100000 1000000
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from database.db_manager import DatabaseManager, format_created_at
+from utils.logger import setup_logger
+
+TARGET_USER_ID = 1
+LEGACY_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS tasks ("
+    "id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT NOT NULL, "
+    "user_id INTEGER NOT NULL, created_at TEXT NOT NULL);"
+)
+LEGACY_QUERY = (
+    "SELECT id, text, user_id, created_at FROM tasks "
+    "WHERE user_id = ? ORDER BY datetime(created_at) ASC;"
+)
+
+
+def _fill_table(db_path: str, total_rows: int, target_tasks: int, users: int) -> None:
+    """
+    Дополняет таблицу tasks до total_rows строк.
+    Первые target_tasks строк принадлежат TARGET_USER_ID, остальные — другим пользователям.
+    """
+    connection = sqlite3.connect(db_path)
+    current = connection.execute("SELECT COUNT(*) FROM tasks;").fetchone()[0]
+    start = datetime(2024, 1, 1)
+
+    def rows():
+        for index in range(current, total_rows):
+            user_id = TARGET_USER_ID if index < target_tasks else 2 + index % users
+            moment = start + timedelta(seconds=index)
+            yield (f"Задача {index}", user_id, format_created_at(moment))
+
+    connection.executemany(
+        "INSERT INTO tasks (text, user_id, created_at) VALUES (?, ?, ?);", rows()
+    )
+    connection.commit()
+    connection.close()
+
+
+def _measure_legacy(db_path: str, repeats: int) -> float:
+    """Возвращает медианную задержку прежнего запроса в миллисекундах."""
+    connection = sqlite3.connect(db_path)
+    timings: List[float] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        connection.execute(LEGACY_QUERY, (TARGET_USER_ID,)).fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    connection.close()
+    return statistics.median(timings)
+
+
+async def _measure(db: DatabaseManager, repeats: int) -> float:
+    """Возвращает медианную задержку get_user_tasks в миллисекундах."""
+    timings: List[float] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await db.get_user_tasks(TARGET_USER_ID)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def run(sizes: List[int], target_tasks: int, users: int, repeats: int) -> None:
+    """Выполняет бенчмарк для каждого размера таблицы и печатает результаты."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        legacy_path = os.path.join(tmp_dir, "legacy.db")
+
+        db = DatabaseManager(db_path)
+        # Подавляем INFO-логи на каждый запрос, чтобы не искажать измерения
+        setup_logger("database.db_manager", "WARNING")
+        await db.create_tables()
+
+        legacy_connection = sqlite3.connect(legacy_path)
+        legacy_connection.execute(LEGACY_SCHEMA)
+        legacy_connection.close()
+
+        print(f"{'строк':>10} | {'get_user_tasks, мс':>18} | {'прежний запрос, мс':>18}")
+        for size in sorted(sizes):
+            _fill_table(db_path, size, target_tasks, users)
+            _fill_table(legacy_path, size, target_tasks, users)
+            indexed = await _measure(db, repeats)
+            legacy = _measure_legacy(legacy_path, max(1, repeats // 10))
+            print(f"{size:>10} | {indexed:>18.3f} | {legacy:>18.3f}")
+
+        await db.close()
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--target-tasks", type=int, default=100)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.sizes, args.target_tasks, args.users, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
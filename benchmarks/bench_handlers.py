@@ -0,0 +1,266 @@
+"""
+Офлайн-бенчмарк обработчиков бота на синтетических обновлениях Telegram.
+
+Обновления передаются в настоящий диспетчер с роутерами start_handler
+и task_handler (тот же create_bot, что и при запуске бота), а запросы
+к Bot API обрабатывает RecordingSession без сети. Таблица задач заранее
+заполняется до заданного размера. Для сценариев /add (команда и текст
+задачи), /list и /list_csv измеряются p50/p95/p99 задержки обработки
+и пропускная способность в обновлениях в секунду.
+
+Результаты печатаются таблицей и при --output сохраняются в JSON;
+с --baseline выводится изменение относительно ранее сохраненного JSON.
+
+Запуск:
+    python -m benchmarks.bench_handlers --users 100 --table-size 100000 --output result.json
+    python -m benchmarks.bench_handlers --baseline result.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import aiogram
+from aiogram import Bot, Dispatcher
+
+from benchmarks.fake_telegram import FAKE_BOT_TOKEN, RecordingSession, make_message_update
+from config import Config
+from database.db_manager import format_created_at
+from main import configure_logging, create_bot, shutdown_bot
+from utils.metrics import MetricsRegistry
+
+SCENARIOS = ("add", "list", "list_csv")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Возвращает перцентиль по методу ближайшего ранга для отсортированного списка."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def _prefill(db_path: str, users: int, table_size: int) -> None:
+    """Заполняет таблицу задач, равномерно распределяя задачи по пользователям."""
+    started = datetime.datetime(2024, 1, 1)
+    rows = (
+        (
+            f"Задача {index}",
+            index % users + 1,
+            format_created_at(started + datetime.timedelta(seconds=index)),
+        )
+        for index in range(table_size)
+    )
+    connection = sqlite3.connect(db_path)
+    with connection:
+        connection.executemany(
+            "INSERT INTO tasks (text, user_id, created_at) VALUES (?, ?, ?)", rows
+        )
+    connection.close()
+
+
+class _UpdateFactory:
+    """Выдает последовательные идентификаторы обновлений."""
+
+    def __init__(self) -> None:
+        self._next_id = 1
+
+    def message(self, user_id: int, text: str) -> Dict[str, Any]:
+        update = make_message_update(self._next_id, user_id, text)
+        self._next_id += 1
+        return update
+
+
+def _scenario_updates(scenario: str, factory: _UpdateFactory, user_id: int) -> List[Dict[str, Any]]:
+    """Формирует обновления одной операции сценария."""
+    if scenario == "add":
+        return [
+            factory.message(user_id, "/add"),
+            factory.message(user_id, f"Новая задача {random.randint(0, 10 ** 6)}"),
+        ]
+    return [factory.message(user_id, f"/{scenario}")]
+
+
+async def run_scenario(
+    scenario: str,
+    bot: Bot,
+    dispatcher: Dispatcher,
+    session: RecordingSession,
+    users: int,
+    operations: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    """
+    Выполняет операции сценария и возвращает статистику задержек.
+
+    Операции распределяются по concurrency сопрограммам; каждая обслуживает
+    собственное подмножество пользователей последовательно, чтобы диалоги
+    одного пользователя (FSM /add) не пересекались.
+    """
+    factory = _UpdateFactory()
+    latencies: List[float] = []
+    updates_fed = 0
+    calls_before = session.call_count
+
+    async def worker(worker_index: int) -> None:
+        nonlocal updates_fed
+        worker_users = list(range(worker_index + 1, users + 1, concurrency))
+        for operation in range(worker_index, operations, concurrency):
+            user_id = worker_users[(operation // concurrency) % len(worker_users)]
+            updates = _scenario_updates(scenario, factory, user_id)
+            started = time.perf_counter()
+            for update in updates:
+                await dispatcher.feed_raw_update(bot, update)
+            latencies.append((time.perf_counter() - started) * 1000)
+            updates_fed += len(updates)
+
+    concurrency = max(1, min(concurrency, users))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "operations": len(latencies),
+        "updates": updates_fed,
+        "seconds": round(elapsed, 4),
+        "updates_per_sec": round(updates_fed / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "bot_calls": session.call_count - calls_before,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    """Возвращает хэш текущего коммита или None вне git-репозитория."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Готовит базу, выполняет сценарии и возвращает результаты."""
+    Config.BOT_TOKEN = FAKE_BOT_TOKEN
+    Config.LOG_LEVEL = "WARNING"
+    # Бенчмарк измеряет обработчики, а не ограничения частоты запросов
+    Config.RATE_LIMIT_ENABLED = False
+    Config.SEND_RATE_LIMIT = False
+    if args.no_cache:
+        Config.TASK_CACHE_USERS = 0
+
+    random.seed(args.seed)
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "bench.db")
+        session = RecordingSession(latency=args.latency_ms / 1000, record=False)
+        metrics = MetricsRegistry() if args.metrics else None
+        bot, dispatcher = await create_bot(db_path, session=session, metrics=metrics)
+        configure_logging()
+        _prefill(db_path, args.users, args.table_size)
+
+        try:
+            for scenario in args.scenarios:
+                results[scenario] = await run_scenario(
+                    scenario,
+                    bot,
+                    dispatcher,
+                    session,
+                    args.users,
+                    args.operations,
+                    args.concurrency,
+                )
+        finally:
+            await shutdown_bot(bot, dispatcher)
+
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "aiogram": aiogram.__version__,
+            "users": args.users,
+            "table_size": args.table_size,
+            "operations": args.operations,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "task_cache": not args.no_cache,
+            "metrics": args.metrics,
+        },
+        "scenarios": results,
+    }
+
+
+def _print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    """Печатает результаты и, если задан baseline, их изменение в процентах."""
+    meta = report["meta"]
+    print(
+        f"Пользователей: {meta['users']}, задач в таблице: {meta['table_size']}, "
+        f"операций: {meta['operations']}, параллельно: {meta['concurrency']}"
+    )
+    print(f"{'сценарий':<10} {'обн./с':>10} {'p50, мс':>9} {'p95, мс':>9} {'p99, мс':>9}")
+    for scenario, stats in report["scenarios"].items():
+        line = (
+            f"{scenario:<10} {stats['updates_per_sec']:>10,.0f} "
+            f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+        previous = (baseline or {}).get("scenarios", {}).get(scenario)
+        if previous:
+            changes = []
+            for key in ("updates_per_sec", "p50_ms", "p95_ms", "p99_ms"):
+                if previous[key]:
+                    changes.append(f"{(stats[key] / previous[key] - 1) * 100:+.1f}%")
+            line += "   (" + " ".join(changes) + ")"
+        print(line)
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--table-size", type=int, default=10_000, help="задач в таблице до замера")
+    parser.add_argument("--operations", type=int, default=500, help="операций на сценарий")
+    parser.add_argument("--concurrency", type=int, default=1, help="одновременных пользователей")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="задержка ответа Bot API")
+    parser.add_argument("--no-cache", action="store_true", help="отключить кэш задач")
+    parser.add_argument("--metrics", action="store_true", help="включить сбор метрик")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="файл для сохранения результатов в JSON")
+    parser.add_argument("--baseline", help="JSON предыдущего запуска для сравнения")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+    _print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены в {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Бенчмарк массового импорта задач.
+
+Сравнивает добавление задач по одной (add_task, транзакция на задачу)
+с add_tasks_bulk (executemany порциями) и измеряет полный путь импорта
+CSV-файла через диспетчер: /import, загрузка документа из RecordingSession,
+потоковый разбор и запись в базу.
+
+Запуск:
+    python -m benchmarks.bench_import --rows 100000
+"""
+
+import argparse
+import asyncio
+import codecs
+import csv
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.fake_telegram import FAKE_BOT_TOKEN, RecordingSession, make_message_update
+from config import Config
+from database.db_manager import DatabaseManager, format_created_at
+from main import create_bot, shutdown_bot
+from utils.csv_generator import CSV_HEADER
+from utils.logger import setup_logger
+
+USER_ID = 1
+
+
+def _build_csv(rows: int) -> bytes:
+    """Формирует CSV в формате выгрузки /list_csv."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow(CSV_HEADER)
+    created_at = format_created_at()
+    for index in range(rows):
+        writer.writerow((index, f"Импортированная задача {index}", USER_ID, created_at, "", ""))
+    return codecs.BOM_UTF8 + buffer.getvalue().encode("utf-8")
+
+
+async def _one_by_one(db_path: str, rows: int) -> float:
+    """Добавляет задачи по одной и возвращает задач в секунду."""
+    db = DatabaseManager(db_path)
+    await db.connect()
+    await db.create_tables()
+    started = time.perf_counter()
+    for index in range(rows):
+        await db.add_task(f"Задача {index}", USER_ID)
+    elapsed = time.perf_counter() - started
+    await db.close()
+    return rows / elapsed
+
+
+async def _bulk(db_path: str, rows: int, chunk_size: int) -> float:
+    """Добавляет задачи через add_tasks_bulk и возвращает задач в секунду."""
+    db = DatabaseManager(db_path)
+    await db.connect()
+    await db.create_tables()
+    started = time.perf_counter()
+    await db.add_tasks_bulk(
+        ((f"Задача {index}", None, None, None) for index in range(rows)),
+        USER_ID,
+        chunk_size=chunk_size,
+    )
+    elapsed = time.perf_counter() - started
+    await db.close()
+    return rows / elapsed
+
+
+async def _csv_upload(db_path: str, rows: int) -> float:
+    """Импортирует CSV-файл через обработчики бота и возвращает задач в секунду."""
+    session = RecordingSession()
+    content = _build_csv(rows)
+    session.add_file("import.csv", content)
+    bot, dispatcher = await create_bot(db_path, session=session)
+    document = {
+        "file_id": "import.csv",
+        "file_unique_id": "import.csv",
+        "file_name": "tasks.csv",
+        "mime_type": "text/csv",
+        "file_size": len(content),
+    }
+    try:
+        await dispatcher.feed_raw_update(bot, make_message_update(1, USER_ID, "/import"))
+        started = time.perf_counter()
+        await dispatcher.feed_raw_update(bot, make_message_update(2, USER_ID, document=document))
+        elapsed = time.perf_counter() - started
+        imported = await getattr(bot, "db_manager").get_user_task_rows_page(USER_ID, limit=1)
+        assert imported[0], "CSV-файл не импортирован"
+    finally:
+        await shutdown_bot(bot, dispatcher)
+    return rows / elapsed
+
+
+async def run(rows: int, single_rows: int, chunk_size: int) -> None:
+    """Выполняет замеры в отдельных временных базах и печатает результаты."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        single = await _one_by_one(os.path.join(tmp_dir, "single.db"), single_rows)
+        bulk = await _bulk(os.path.join(tmp_dir, "bulk.db"), rows, chunk_size)
+        upload = await _csv_upload(os.path.join(tmp_dir, "upload.db"), rows)
+
+    print(f"add_task по одной ({single_rows} задач): {single:>10,.0f} задач/с")
+    print(f"add_tasks_bulk ({rows} задач, порции по {chunk_size}): {bulk:>10,.0f} задач/с")
+    print(f"импорт CSV через бота ({rows} задач): {upload:>10,.0f} задач/с "
+          f"({rows / upload:.2f} с)")
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--single-rows", type=int, default=2_000, help="задач для add_task по одной")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    Config.BOT_TOKEN = FAKE_BOT_TOKEN
+    Config.SEND_RATE_LIMIT = False
+    # Логи добавления отдельных задач искажают замер
+    setup_logger("database.db_manager", "WARNING")
+    asyncio.run(run(args.rows, args.single_rows, args.chunk_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Бенчмарк стоимости логирования для цикла событий: синхронный вывод против очереди.
+
+Асинхронные «обработчики» пишут в лог строки, как add_task и get_user_tasks,
+а вывод идет в поток с искусственной задержкой записи (как stderr,
+который медленно читает сборщик логов). Измеряется время, которое цикл
+событий тратит на вызовы логгера, для режимов:
+синхронный StreamHandler, очередь (QueueHandler/QueueListener)
+и очередь с прореживанием записей.
+
+Запуск:
+    python -m benchmarks.bench_logging --records 20000 --write-delay-us 50
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import sys
+import time
+
+from utils.logger import setup_log_output, setup_logger, shutdown_logging
+
+
+class _SlowStream(io.TextIOBase):
+    """Поток вывода, каждая запись в который занимает delay секунд."""
+
+    def __init__(self, delay: float):
+        self._delay = delay
+
+    def write(self, text: str) -> int:
+        # Как и настоящая блокирующая запись, sleep освобождает GIL
+        if self._delay:
+            time.sleep(self._delay)
+        return len(text)
+
+
+async def _handlers(logger: logging.Logger, records: int, concurrency: int) -> float:
+    """Выполняет records вызовов логгера в concurrency задачах и возвращает время в секундах."""
+
+    async def handler(worker: int) -> None:
+        for index in range(worker, records, concurrency):
+            logger.info("Задача ID %s добавлена для пользователя %s", index, worker)
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(handler(worker) for worker in range(concurrency)))
+    return time.perf_counter() - started
+
+
+def run_mode(name: str, records: int, delay: float, **output_options) -> None:
+    """Настраивает вывод логов, выполняет замер и печатает результат."""
+    original_stderr = sys.stderr
+    sys.stderr = _SlowStream(delay)
+    try:
+        setup_log_output(**output_options)
+        logger = setup_logger("benchmarks.bench_logging", "INFO")
+        elapsed = asyncio.run(_handlers(logger, records, concurrency=50))
+        drain_started = time.perf_counter()
+        shutdown_logging()
+        drain = time.perf_counter() - drain_started
+    finally:
+        sys.stderr = original_stderr
+
+    print(
+        f"{name:<28} цикл событий: {elapsed * 1000:>8.1f} мс "
+        f"({elapsed / records * 1e6:>6.1f} мкс/запись), "
+        f"дописывание очереди: {drain * 1000:>8.1f} мс"
+    )
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--write-delay-us", type=float, default=50.0)
+    args = parser.parse_args()
+
+    delay = args.write_delay_us / 1e6
+    print(f"Записей: {args.records}, задержка записи в stderr: {args.write_delay_us} мкс")
+    run_mode("синхронный вывод", args.records, delay, use_queue=False)
+    run_mode("очередь", args.records, delay, use_queue=True)
+    run_mode("очередь, JSON", args.records, delay, use_queue=True, json_format=True)
+    run_mode("очередь, 1 из 10", args.records, delay, use_queue=True, sample_rate=0.1)
+    run_mode("очередь, до 100 в секунду", args.records, delay, use_queue=True, rate_limit=100)
+
+
+if __name__ == "__main__":
+    main()
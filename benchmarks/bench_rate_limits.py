@@ -0,0 +1,130 @@
+"""
+Офлайн-проверка ограничений частоты запросов.
+
+1. Входящие события: один пользователь отправляет серию /list_csv и /list
+   через настоящий диспетчер (create_bot). Проверяется, что выгрузок
+   выполнено не больше RATE_LIMIT_HEAVY_BURST, остальные команды ограничены
+   корзиной пользователя, а предупреждение отправлено по одному на серию.
+2. Исходящие запросы: сообщения в несколько чатов отправляются
+   одновременно через FloodControlSession, которая отвечает 429, как Telegram.
+   Без планировщика часть отправок завершается ошибкой TelegramRetryAfter,
+   с SendSchedulerMiddleware все сообщения доставляются без ответов 429.
+
+Запуск:
+    python -m benchmarks.bench_rate_limits --chats 5 --messages 6
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Tuple
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+
+from benchmarks.fake_telegram import (
+    FAKE_BOT_TOKEN,
+    FloodControlSession,
+    RecordingSession,
+    make_message_update,
+)
+from config import Config
+from main import create_bot, shutdown_bot
+from utils.logger import setup_logger
+from utils.send_scheduler import SendSchedulerMiddleware
+
+USER_ID = 7
+
+
+async def check_throttling(commands: int) -> None:
+    """Отправляет серию команд от одного пользователя и печатает итог."""
+    Config.RATE_LIMIT_ENABLED = True
+    Config.SEND_RATE_LIMIT = False
+    session = RecordingSession()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bot, dispatcher = await create_bot(os.path.join(tmp_dir, "tasks.db"), session=session)
+        try:
+            await getattr(bot, "db_manager").add_task("Задача для выгрузки", USER_ID)
+            update_id = 1
+            for text in ("/list_csv", "/list"):
+                for _ in range(commands):
+                    await dispatcher.feed_raw_update(
+                        bot, make_message_update(update_id, USER_ID, text)
+                    )
+                    update_id += 1
+        finally:
+            await shutdown_bot(bot, dispatcher)
+
+    calls = session.calls_by_method()
+    warnings = sum(
+        1 for call in session.calls if "Слишком много запросов" in (getattr(call, "text", None) or "")
+    )
+    documents = calls.get("sendDocument", 0)
+    listed = sum(
+        1 for call in session.calls if (getattr(call, "text", None) or "").startswith("Ваши задачи")
+    )
+    print(
+        f"Входящие: {commands} x /list_csv -> выгрузок {documents}; "
+        f"{commands} x /list -> списков {listed}; предупреждений {warnings}"
+    )
+    assert documents == Config.RATE_LIMIT_HEAVY_BURST, "лимит выгрузок не соблюден"
+    assert documents + listed <= Config.RATE_LIMIT_USER_BURST + 1, "лимит пользователя не соблюден"
+
+
+async def _send_burst(bot: Bot, chats: int, messages: int) -> Tuple[int, float]:
+    """Одновременно отправляет messages сообщений в каждый из chats чатов."""
+
+    async def send(chat_id: int, index: int) -> bool:
+        try:
+            await bot.send_message(chat_id, f"Сообщение {index}")
+            return True
+        except TelegramRetryAfter:
+            return False
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(send(chat_id, index) for chat_id in range(1, chats + 1) for index in range(messages))
+    )
+    return sum(results), time.perf_counter() - started
+
+
+async def check_send_scheduler(chats: int, messages: int) -> None:
+    """Сравнивает отправку без планировщика и с ним и печатает итог."""
+    total = chats * messages
+    for scheduled in (False, True):
+        session = FloodControlSession()
+        bot = Bot(token=FAKE_BOT_TOKEN, session=session)
+        if scheduled:
+            bot.session.middleware(SendSchedulerMiddleware(max_retries=Config.SEND_MAX_RETRIES))
+        delivered, elapsed = await _send_burst(bot, chats, messages)
+        await bot.session.close()
+        name = "с планировщиком" if scheduled else "без планировщика"
+        print(
+            f"Исходящие {name:<16}: доставлено {delivered}/{total}, "
+            f"ответов 429: {session.rejected}, время {elapsed:.2f} с"
+        )
+        if scheduled:
+            assert delivered == total and session.rejected == 0, "планировщик получил 429"
+
+
+def main() -> None:
+    """Точка входа проверки."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=int, default=10, help="команд каждого вида")
+    parser.add_argument("--chats", type=int, default=5)
+    parser.add_argument("--messages", type=int, default=6, help="сообщений в каждый чат")
+    args = parser.parse_args()
+
+    Config.BOT_TOKEN = FAKE_BOT_TOKEN
+    setup_logger("database.db_manager", "WARNING")
+    setup_logger("handlers.task_handler", "WARNING")
+    setup_logger("utils.throttling", "WARNING")
+    setup_logger("utils.send_scheduler", "ERROR")
+    asyncio.run(check_throttling(args.commands))
+    asyncio.run(check_send_scheduler(args.chats, args.messages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Бенчмарк объединения конкурентных чтений (database/read_coalescer.py).
+
+users пользователей одновременно отправляют по burst одинаковых запросов
+get_user_tasks (двойное нажатие «📋 Список задач», /list вместе с /list_csv).
+Сравниваются режимы DatabaseManager:
+    - без объединения — каждый вызов выполняет свой запрос;
+    - объединение одинаковых чтений (coalesce_reads);
+    - объединение и пакетное чтение разных пользователей одним запросом
+      WHERE user_id IN (...) (read_batch_delay_ms).
+Кэш задач отключен. Печатаются время всей волны запросов, медианная
+задержка вызова, число выполненных запросов к базе и доля объединенных чтений.
+
+Запуск:
+    python -m benchmarks.bench_read_coalescing --users 200 --tasks 50 --burst 3
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from database.db_manager import DatabaseManager, format_created_at
+from utils.logger import setup_logger
+
+MODES = (
+    ("без объединения", {}),
+    ("объединение", {"coalesce_reads": True}),
+    ("объединение + пакеты 2 мс", {"coalesce_reads": True, "read_batch_delay_ms": 2}),
+)
+
+
+def _fill_table(db_path: str, users: int, tasks: int) -> None:
+    """Заполняет таблицу tasks задачами пользователей."""
+    start = datetime(2024, 1, 1)
+    rows = (
+        (f"Задача {index}", user_id, format_created_at(start + timedelta(seconds=index)))
+        for user_id in range(1, users + 1)
+        for index in range(tasks)
+    )
+    connection = sqlite3.connect(db_path)
+    connection.executemany("INSERT INTO tasks (text, user_id, created_at) VALUES (?, ?, ?);", rows)
+    connection.commit()
+    connection.close()
+
+
+async def _run_mode(
+    db_path: str, users: int, burst: int, pool_size: int, options: Dict
+) -> Tuple[float, float, Counter, Dict[int, List[int]], DatabaseManager]:
+    """Выполняет волну запросов в одном режиме и возвращает измерения."""
+    queries: Counter = Counter()
+    db = DatabaseManager(
+        db_path,
+        pool_size=pool_size,
+        query_hook=lambda name, _duration, _rows: queries.update([name]),
+        **options,
+    )
+    await db.connect()
+    timings: List[float] = []
+
+    async def read(user_id: int) -> Tuple[int, List[int]]:
+        started = time.perf_counter()
+        tasks = await db.get_user_tasks(user_id)
+        timings.append((time.perf_counter() - started) * 1000)
+        return user_id, [task.get_id() for task in tasks]
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(read(user_id) for _ in range(burst) for user_id in range(1, users + 1))
+    )
+    elapsed = time.perf_counter() - started
+    await db.close()
+    return elapsed, statistics.median(timings), queries, dict(results), db
+
+
+async def run(users: int, tasks: int, burst: int, pool_size: int) -> None:
+    """Заполняет базу и печатает результаты всех режимов."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "tasks.db")
+        db = DatabaseManager(db_path)
+        await db.connect()
+        await db.create_tables()
+        await db.close()
+        _fill_table(db_path, users, tasks)
+
+        print(
+            f"Пользователей: {users}, задач у пользователя: {tasks}, "
+            f"одинаковых запросов подряд: {burst}, соединений для чтения: {pool_size}"
+        )
+        print(f"{'режим':27} {'волна, мс':>10} {'p50, мс':>9} {'запросов':>9} {'объединено':>11}")
+        expected = None
+        for name, options in MODES:
+            elapsed, median, queries, results, db = await _run_mode(
+                db_path, users, burst, pool_size, options
+            )
+            if expected is None:
+                expected = results
+            assert results == expected, f"режим «{name}» вернул другие задачи"
+
+            coalesced = "—"
+            if db._coalescer is not None:  # pylint: disable=protected-access
+                stats = db._coalescer.stats()  # pylint: disable=protected-access
+                coalesced = f"{stats['coalesced'] / stats['requests']:.0%}"
+            print(
+                f"{name:27} {elapsed * 1000:10.1f} {median:9.2f} "
+                f"{sum(queries.values()):9} {coalesced:>11}"
+            )
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--burst", type=int, default=3)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    setup_logger("database.db_manager", "WARNING")
+    setup_logger("database.read_coalescer", "WARNING")
+    asyncio.run(run(args.users, args.tasks, args.burst, args.pool_size))
+
+
+if __name__ == "__main__":
+    main()
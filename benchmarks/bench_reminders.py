@@ -0,0 +1,177 @@
+"""
+Бенчмарк планировщика напоминаний (utils/reminders.py).
+
+В таблице tasks задач со сроками; overdue из них уже наступили (например,
+пропущены за время остановки бота), остальные распределены по будущим дням.
+Проверяется:
+    - план запроса окна напоминаний использует частичный индекс idx_tasks_due;
+    - планировщик отправляет все наступившие напоминания, читая их окнами
+      по window строк, и пиковая память (tracemalloc) не зависит от числа задач;
+    - новый срок, добавленный через add_task, отправляется вовремя без опроса
+      базы: планировщик просыпается по уведомлению, а не по таймеру;
+    - для сравнения — пиковая память и время загрузки всех ожидающих
+      напоминаний одним запросом.
+Запросы к Bot API записываются сессией RecordingSession вместо отправки в сеть.
+
+Запуск:
+    python -m benchmarks.bench_reminders --tasks 1000000 --overdue 5000 --window 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from aiogram import Bot
+
+from benchmarks.fake_telegram import RecordingSession
+from database.db_manager import DatabaseManager, format_created_at
+from utils.logger import setup_logger
+from utils.reminders import ReminderScheduler
+
+USERS = 1000
+BOT_TOKEN = "42:TEST"
+
+
+def _fill_table(db_path: str, tasks: int, overdue: int) -> None:
+    """Заполняет таблицу tasks задачами со сроками: overdue в прошлом, остальные в будущем."""
+    now = datetime.now()
+    created_at = format_created_at(now - timedelta(days=30))
+
+    def rows():
+        for index in range(tasks):
+            if index < overdue:
+                due = now - timedelta(hours=1, seconds=index)
+            else:
+                due = now + timedelta(days=1, seconds=index * 7 % (365 * 86400))
+            yield (f"Задача {index}", index % USERS + 1, created_at, format_created_at(due))
+
+    connection = sqlite3.connect(db_path)
+    connection.executemany(
+        "INSERT INTO tasks (text, user_id, created_at, due_at) VALUES (?, ?, ?, ?);", rows()
+    )
+    connection.commit()
+    connection.close()
+
+
+def _check_query_plan(db_path: str) -> None:
+    """Проверяет, что окно напоминаний читается по частичному индексу без сортировки."""
+    connection = sqlite3.connect(db_path)
+    queries = (
+        ("SELECT due_at, id, user_id FROM tasks WHERE due_at IS NOT NULL AND reminder_sent = 0"
+         " ORDER BY due_at, id LIMIT 1000;", ()),
+        ("SELECT due_at, id, user_id FROM tasks WHERE due_at IS NOT NULL AND reminder_sent = 0"
+         " AND (due_at, id) > (?, ?) ORDER BY due_at, id LIMIT 1000;", ("2024", 1)),
+    )
+    for sql, params in queries:
+        plan = " | ".join(
+            row[3] for row in connection.execute("EXPLAIN QUERY PLAN " + sql, params)
+        )
+        print(f"План запроса окна: {plan}")
+        assert "idx_tasks_due" in plan and "TEMP B-TREE" not in plan, plan
+    connection.close()
+
+
+def _load_all_pending(db_path: str) -> None:
+    """Загружает все ожидающие напоминания одним запросом и печатает время и память."""
+    connection = sqlite3.connect(db_path)
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = connection.execute(
+        "SELECT due_at, id, user_id FROM tasks WHERE due_at IS NOT NULL AND reminder_sent = 0 "
+        "ORDER BY due_at, id;"
+    ).fetchall()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    connection.close()
+    print(
+        f"Загрузка всех ожидающих ({len(rows)}): {elapsed * 1000:10.1f} мс, "
+        f"пик памяти {peak / 2**20:8.1f} МБ"
+    )
+
+
+async def _wait_for(condition, timeout: float) -> None:
+    """Ждет выполнения условия не дольше timeout секунд."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("планировщик не успел отправить напоминания")
+        await asyncio.sleep(0.01)
+
+
+async def run(tasks: int, overdue: int, window: int) -> None:
+    """Заполняет базу, запускает планировщик и печатает результаты."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "tasks.db")
+        db = DatabaseManager(db_path)
+        await db.connect()
+        await db.create_tables()
+
+        started = time.perf_counter()
+        _fill_table(db_path, tasks, overdue)
+        print(f"Задач со сроком: {tasks}, наступивших: {overdue}, окно: {window}")
+        print(f"Заполнение таблицы: {time.perf_counter() - started:.1f} с")
+        _check_query_plan(db_path)
+
+        started = time.perf_counter()
+        window_rows = await db.get_pending_reminders(window)
+        print(f"Чтение одного окна:             {(time.perf_counter() - started) * 1000:10.1f} мс")
+        assert len(window_rows) == min(window, tasks)
+
+        session = RecordingSession(record=False)
+        bot = Bot(token=BOT_TOKEN, session=session)
+        scheduler = ReminderScheduler(db, bot, window_size=window, send_rate=100_000.0)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        scheduler.start()
+        await _wait_for(lambda: scheduler.sent >= overdue, timeout=600)
+        elapsed = time.perf_counter() - started
+
+        # Новый срок через add_task: планировщик должен проснуться по уведомлению
+        due = datetime.now() + timedelta(milliseconds=300)
+        await db.add_task("Новая задача со сроком", 1, due_at=format_created_at(due))
+        await _wait_for(lambda: scheduler.sent >= overdue + 1, timeout=10)
+        delay_ms = (datetime.now() - due).total_seconds() * 1000
+
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        await scheduler.close()
+        await bot.session.close()
+
+        print(
+            f"Отправка наступивших ({scheduler.sent - 1}): {elapsed * 1000:10.1f} мс, "
+            f"пик памяти {peak / 2**20:8.1f} МБ"
+        )
+        print(
+            f"Прочитано из базы: {scheduler.loaded}, максимум в куче: {scheduler.max_pending}, "
+            f"в куче сейчас: {scheduler.pending}, запросов к Bot API: {session.call_count}"
+        )
+        print(f"Опоздание напоминания, добавленного через add_task: {delay_ms:.1f} мс")
+        assert scheduler.max_pending <= 2 * window, "окно планировщика вышло за 2 * window"
+        assert session.call_count == overdue + 1, "отправлены не все напоминания или дубли"
+
+        await db.close()
+        _load_all_pending(db_path)
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--overdue", type=int, default=5000)
+    parser.add_argument("--window", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_logger("database.db_manager", "WARNING")
+    setup_logger("utils.reminders", "WARNING")
+    asyncio.run(run(args.tasks, args.overdue, args.window))
+
+
+if __name__ == "__main__":
+    main()
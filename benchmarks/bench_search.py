@@ -0,0 +1,159 @@
+"""
+Бенчмарк полнотекстового поиска задач (FTS5) на большой таблице.
+
+Таблица tasks заполняется до заданного размера текстами из слов словаря
+с частотами по закону Ципфа; индекс tasks_fts заполняется триггерами
+миграции 4. Доля --heavy-share задач принадлежит одному «тяжелому»
+пользователю, остальные распределены поровну. Для обычных пользователей
+и для тяжелого измеряются p50/p95 задержки
+DatabaseManager.search_user_task_rows и, для сравнения, фильтрации
+подстрокой в Python по результату get_user_tasks (кэш отключен).
+
+Стоимость FTS5 определяется числом совпадений слов запроса (ранжирование
+bm25 читает полный список документов каждого слова), стоимость фильтрации
+в Python — числом задач пользователя.
+
+Запуск:
+    python -m benchmarks.bench_search --tasks 1000000 --users 1000 --heavy-share 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List
+
+from benchmarks.bench_handlers import percentile
+from database.db_manager import DatabaseManager, format_created_at
+from utils.logger import setup_logger
+
+HEAVY_USER_ID = 1
+WORDS = (
+    "купить молоко хлеб отчет встреча позвонить маме написать письмо оплатить счет "
+    "починить кран записаться врач прочитать книгу подготовить презентацию сдать "
+    "проект обновить резюме забрать посылку помыть машину заказать билеты спортзал "
+    "английский ремонт квартира дача подарок день рождения налоги страховка банк"
+).split()
+SYLLABLES = "ба ве го да жи зо ку ла ме но пу ро са ти фу ха цо чу ша эм юн як".split()
+
+
+def _build_vocabulary(size: int) -> List[str]:
+    """
+    Дополняет словарь бытовых слов псевдословами из слогов.
+    Псевдослова не имеют общих длинных префиксов, как и слова реального текста.
+    """
+    rng = random.Random(0)
+    vocabulary = dict.fromkeys(WORDS)
+    while len(vocabulary) < size:
+        vocabulary["".join(rng.choices(SYLLABLES, k=rng.randint(2, 4)))] = None
+    return list(vocabulary)
+
+
+# Словарь с частотами по закону Ципфа: частые бытовые слова и длинный хвост редких
+VOCABULARY = _build_vocabulary(5000)
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+
+def _fill_table(
+    db_path: str, tasks: int, users: int, heavy_share: float, words_per_task: int
+) -> None:
+    """Заполняет таблицу tasks задачами из случайных слов словаря."""
+    rng = random.Random(1)
+    start = datetime(2024, 1, 1)
+    heavy_every = round(1 / heavy_share) if heavy_share > 0 else 0
+
+    def rows():
+        for index in range(tasks):
+            text = " ".join(rng.choices(VOCABULARY, WEIGHTS, k=words_per_task))
+            if heavy_every and index % heavy_every == 0:
+                user_id = HEAVY_USER_ID
+            else:
+                user_id = 2 + index % (users - 1)
+            yield (text, user_id, format_created_at(start + timedelta(seconds=index)))
+
+    connection = sqlite3.connect(db_path)
+    # Крупный кэш страниц ускоряет слияние сегментов FTS5 при заполнении
+    connection.execute("PRAGMA cache_size = -262144;")
+    with connection:
+        connection.executemany(
+            "INSERT INTO tasks (text, user_id, created_at) VALUES (?, ?, ?);", rows()
+        )
+    connection.close()
+
+
+async def _measure(
+    search: Callable[[int, str], Awaitable[int]], user_ids: List[int], queries: int
+) -> List[float]:
+    """Выполняет запросы для случайных пользователей и слов и возвращает задержки в мс."""
+    rng = random.Random(2)
+    timings: List[float] = []
+    for _ in range(queries):
+        user_id = rng.choice(user_ids)
+        query = " ".join(rng.choices(VOCABULARY, WEIGHTS, k=rng.choice((1, 2))))
+        started = time.perf_counter()
+        await search(user_id, query)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Готовит базу, выполняет замеры и печатает результаты."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "search.db")
+        db = DatabaseManager(db_path)
+        await db.create_tables()
+
+        started = time.perf_counter()
+        _fill_table(db_path, args.tasks, args.users, args.heavy_share, args.words_per_task)
+        print(
+            f"Заполнение {args.tasks} задач с индексом FTS5: "
+            f"{time.perf_counter() - started:.1f} с"
+        )
+
+        async def fts_search(user_id: int, query: str) -> int:
+            rows, _ = await db.search_user_task_rows(user_id, query, limit=10)
+            return len(rows)
+
+        async def python_search(user_id: int, query: str) -> int:
+            terms = query.lower().split()
+            found = [
+                task
+                for task in await db.get_user_tasks(user_id)
+                if all(term in task.get_text().lower() for term in terms)
+            ]
+            return len(found[:10])
+
+        groups = [("обычные", list(range(2, args.users + 1)))]
+        if args.heavy_share > 0:
+            groups.append(("тяжелый", [HEAVY_USER_ID]))
+        for group, user_ids in groups:
+            for name, search in (("FTS5", fts_search), ("подстрока в Python", python_search)):
+                timings = await _measure(search, user_ids, args.queries)
+                print(
+                    f"{group:<8} {name:<20} p50: {percentile(timings, 0.50):>8.2f} мс  "
+                    f"p95: {percentile(timings, 0.95):>8.2f} мс"
+                )
+        await db.close()
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--heavy-share", type=float, default=0.1, help="доля задач тяжелого пользователя")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--words-per-task", type=int, default=4)
+    args = parser.parse_args()
+
+    setup_logger("database.db_manager", "WARNING")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
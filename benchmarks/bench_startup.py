@@ -0,0 +1,127 @@
+"""
+Бенчмарк холодного запуска бота.
+
+Каждый замер выполняется в новом процессе интерпретатора:
+1. импорт main (aiogram, обработчики, база данных);
+2. create_bot — подключение к базе с проверкой схемы и запрос getMe;
+3. обработка первого обновления (/start) через Dispatcher.feed_raw_update.
+
+База данных создается заранее, поэтому схема уже актуальна, как при
+перезапуске рабочего процесса. Bot API заменен RecordingSession с задержкой
+--latency-ms. Сравниваются последовательный запуск (getMe после подключения
+к базе, как перед polling) и одновременный (create_bot с prefetch_me=True).
+Печатаются медианы по --runs запускам.
+
+Запуск:
+    python -m benchmarks.bench_startup --runs 5 --latency-ms 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+STAGES = ("import", "create_bot", "first_update", "total")
+
+
+async def _measure_start(db_path: str, latency: float, prefetch_me: bool) -> Dict[str, float]:
+    """Выполняет импорт и запуск бота в текущем процессе и возвращает длительности этапов."""
+    started = time.perf_counter()
+    # pylint: disable-next=import-outside-toplevel
+    from main import create_bot, shutdown_bot
+
+    imported = time.perf_counter()
+
+    # Вспомогательный код бенчмарка не входит в замеры
+    # pylint: disable-next=import-outside-toplevel
+    from benchmarks.fake_telegram import FAKE_BOT_TOKEN, RecordingSession, make_message_update
+    from config import Config  # pylint: disable=import-outside-toplevel
+
+    Config.BOT_TOKEN = FAKE_BOT_TOKEN
+    Config.RATE_LIMIT_ENABLED = False
+    Config.SEND_RATE_LIMIT = False
+    session = RecordingSession(latency=latency)
+    harness = time.perf_counter() - imported
+
+    created_started = time.perf_counter()
+    bot, dispatcher = await create_bot(db_path, session=session, prefetch_me=prefetch_me)
+    # Перед первым getUpdates polling запрашивает getMe (при prefetch_me он уже получен)
+    await bot.me()
+    created = time.perf_counter()
+
+    await dispatcher.feed_raw_update(bot, make_message_update(1, 1, "/start"))
+    finished = time.perf_counter()
+    await shutdown_bot(bot, dispatcher)
+
+    return {
+        "import": imported - started,
+        "create_bot": created - created_started,
+        "first_update": finished - created,
+        "total": finished - started - harness,
+    }
+
+
+def _run_child(db_path: str, latency: float, prefetch_me: bool) -> Dict[str, float]:
+    """Запускает замер в новом процессе интерпретатора."""
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.bench_startup",
+        "--child",
+        db_path,
+        "--latency-ms",
+        str(latency * 1000),
+    ]
+    if prefetch_me:
+        command.append("--prefetch-me")
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run(runs: int, latency: float) -> None:
+    """Подготавливает базу, выполняет замеры обоих режимов и печатает медианы."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "tasks.db")
+        # Первый запуск применяет миграции; его не учитываем
+        _run_child(db_path, latency, False)
+
+        print(f"Задержка Bot API: {latency * 1000:.0f} мс, запусков: {runs}")
+        print(f"{'Режим':<16}" + "".join(f"{stage:>14}" for stage in STAGES))
+        for title, prefetch_me in (("последовательно", False), ("одновременно", True)):
+            samples: List[Dict[str, float]] = [
+                _run_child(db_path, latency, prefetch_me) for _ in range(runs)
+            ]
+            medians = [
+                statistics.median(sample[stage] for sample in samples) * 1000
+                for stage in STAGES
+            ]
+            print(f"{title:<16}" + "".join(f"{value:>11.1f} мс" for value in medians))
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="задержка ответа Bot API")
+    parser.add_argument("--child", metavar="DB_PATH", help=argparse.SUPPRESS)
+    parser.add_argument("--prefetch-me", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        timings = asyncio.run(
+            _measure_start(args.child, args.latency_ms / 1000, args.prefetch_me)
+        )
+        print(json.dumps(timings))
+        return
+
+    run(args.runs, args.latency_ms / 1000)
+
+
+if __name__ == "__main__":
+    main()
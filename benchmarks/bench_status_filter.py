@@ -0,0 +1,106 @@
+"""
+Бенчмарк фильтра списка задач по статусу (/list done).
+
+У одного пользователя tasks задач, из которых done_share выполнены.
+Сравниваются:
+    - get_user_task_rows_page(status="done") — фильтр и LIMIT в SQLite
+      по индексу (user_id, status, created_at, id);
+    - загрузка всех задач пользователя через get_user_tasks и фильтр
+      по статусу в Python (первые 10 выполненных задач).
+Кэш задач отключен, измеряется медианная задержка первой страницы.
+
+Запуск:
+    python -m benchmarks.bench_status_filter --tasks 100000 --done-share 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List
+
+from database.db_manager import DatabaseManager, format_created_at
+from utils.logger import setup_logger
+
+USER_ID = 1
+PAGE_SIZE = 10
+
+
+def _fill_table(db_path: str, tasks: int, done_share: float) -> None:
+    """Заполняет таблицу tasks задачами пользователя со случайными статусами."""
+    generator = random.Random(1)
+    start = datetime(2024, 1, 1)
+
+    def rows():
+        for index in range(tasks):
+            status = "done" if generator.random() < done_share else "work"
+            moment = start + timedelta(seconds=index)
+            yield (f"Задача {index}", USER_ID, format_created_at(moment), status)
+
+    connection = sqlite3.connect(db_path)
+    connection.executemany(
+        "INSERT INTO tasks (text, user_id, created_at, status) VALUES (?, ?, ?, ?);", rows()
+    )
+    connection.commit()
+    connection.close()
+
+
+async def _median_ms(call: Callable[[], Awaitable[object]], repeats: int) -> float:
+    """Возвращает медианную задержку вызова в миллисекундах."""
+    timings: List[float] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+async def run(tasks: int, done_share: float, repeats: int) -> None:
+    """Заполняет базу и печатает задержки обоих способов фильтрации."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, "tasks.db")
+        db = DatabaseManager(db_path)
+        await db.connect()
+        await db.create_tables()
+        _fill_table(db_path, tasks, done_share)
+
+        async def sqlite_filter():
+            rows, _ = await db.get_user_task_rows_page(USER_ID, limit=PAGE_SIZE, status="done")
+            return rows
+
+        async def python_filter():
+            user_tasks = await db.get_user_tasks(USER_ID)
+            return [task for task in user_tasks if task.get_status() == "done"][:PAGE_SIZE]
+
+        assert [row[0] for row in await sqlite_filter()] == [
+            task.get_id() for task in await python_filter()
+        ], "способы фильтрации вернули разные задачи"
+
+        indexed = await _median_ms(sqlite_filter, repeats)
+        in_python = await _median_ms(python_filter, repeats)
+        await db.close()
+
+    print(f"Задач у пользователя: {tasks}, выполненных: {done_share:.0%}")
+    print(f"Фильтр в SQLite по индексу: {indexed:10.3f} мс")
+    print(f"Фильтр в Python:            {in_python:10.3f} мс ({in_python / indexed:.0f}x)")
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--done-share", type=float, default=0.05)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_logger("database.db_manager", "WARNING")
+    asyncio.run(run(args.tasks, args.done_share, args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Бенчмарк хранилищ задач через общий интерфейс TaskStorage (database/storage.py).
+
+Одни и те же операции выполняются для каждой базы из --databases:
+    - add_task по одной задаче и конкурентно (--concurrency запросов сразу);
+    - add_task из нескольких процессов (--processes) в общую базу — здесь
+      SQLite упирается в единственного писателя;
+    - get_user_tasks и первая страница get_user_task_rows_page
+      (медиана и p95 по всем пользователям);
+    - импорт add_tasks_bulk (--import-tasks задач у каждого из --import-users
+      пользователей), поиск search_user_task_rows, get_task_row,
+      set_task_status, выгрузка iter_user_task_rows и
+      delete_user_tasks_by_status — то, что выполняют /import, /search,
+      карточка задачи, /export и очистка выполненных.
+Результаты сверяются: порядок задач и состав страницы должны совпадать
+с порядком добавления, поиск — находить только задачи со словом запроса,
+выгрузка — возвращать все задачи, а удаление — ровно выполненные.
+Кэш задач отключен.
+
+«sqlite» — временный файл SQLite в режиме WAL. Для URL postgresql://
+бенчмарк создает на сервере временную базу taskbot_bench_<pid>
+и удаляет ее в конце (нужно право CREATEDB).
+
+Запуск:
+    python -m benchmarks.bench_storage --databases sqlite postgresql://localhost/postgres
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from database.storage import TaskStorage, create_storage, is_postgres_url
+from utils.logger import setup_logger
+
+PAGE_SIZE = 10
+SEARCH_WORD = "отчет"
+# Каждая SEARCH_EVERY-я импортируемая задача содержит SEARCH_WORD,
+# каждая DONE_EVERY-я импортируется выполненной
+SEARCH_EVERY = 10
+DONE_EVERY = 3
+
+
+@asynccontextmanager
+async def _scratch_database(target: str) -> AsyncIterator[str]:
+    """Выдает путь или URL пустой временной базы для target и удаляет ее после."""
+    if not is_postgres_url(target):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            yield os.path.join(tmp_dir, "tasks.db")
+        return
+
+    import asyncpg  # pylint: disable=import-outside-toplevel
+
+    name = f"taskbot_bench_{os.getpid()}"
+    admin = await asyncpg.connect(target)
+    try:
+        await admin.execute(f"DROP DATABASE IF EXISTS {name};")
+        await admin.execute(f"CREATE DATABASE {name};")
+        yield urlunsplit(urlsplit(target)._replace(path=f"/{name}"))
+    finally:
+        await admin.execute(f"DROP DATABASE IF EXISTS {name} WITH (FORCE);")
+        await admin.close()
+
+
+async def _add_tasks(
+    database: str, user_ids: List[int], per_user: int, concurrency: int
+) -> Tuple[float, float]:
+    """
+    Добавляет задачи пользователей не более concurrency запросов сразу.
+    Возвращает моменты начала и окончания записи (time.time, без подключения).
+    """
+    storage = create_storage(database, pool_size=concurrency)
+    await storage.connect()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def add(user_id: int, index: int) -> None:
+        async with semaphore:
+            await storage.add_task(f"Задача {index} пользователя {user_id}", user_id)
+
+    started = time.time()
+    if concurrency == 1:
+        for index in range(per_user):
+            for user_id in user_ids:
+                await add(user_id, index)
+    else:
+        await asyncio.gather(
+            *(add(user_id, index) for index in range(per_user) for user_id in user_ids)
+        )
+    finished = time.time()
+    await storage.close()
+    return started, finished
+
+
+def _writer_process(
+    database: str,
+    user_ids: List[int],
+    per_user: int,
+    concurrency: int,
+    results: "multiprocessing.Queue",
+) -> None:
+    """Рабочий процесс бенчмарка записи из нескольких процессов."""
+    setup_logger("database.db_manager", "WARNING")
+    setup_logger("database.pg_manager", "WARNING")
+    results.put(asyncio.run(_add_tasks(database, user_ids, per_user, concurrency)))
+
+
+def _add_from_processes(
+    database: str, processes: int, users: int, per_user: int, concurrency: int
+) -> float:
+    """
+    Добавляет задачи из нескольких процессов в общую базу и возвращает время
+    от начала записи в первом процессе до ее окончания в последнем.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    workers = [
+        context.Process(
+            target=_writer_process,
+            args=(
+                database,
+                list(range(10_000 + shard, 10_000 + users, processes)),
+                per_user,
+                concurrency,
+                results,
+            ),
+        )
+        for shard in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        if worker.exitcode != 0:
+            raise RuntimeError(f"процесс записи завершился с кодом {worker.exitcode}")
+    spans = [results.get() for _ in workers]
+    return max(finished for _, finished in spans) - min(started for started, _ in spans)
+
+
+def _import_rows(count: int) -> Iterator[Tuple[str, None, Optional[str], str]]:
+    """Формирует задачи для add_tasks_bulk: (текст, дата, статус, категория)."""
+    for index in range(count):
+        word = SEARCH_WORD if index % SEARCH_EVERY == 0 else "заметка"
+        status = "done" if index % DONE_EVERY == 0 else None
+        yield f"Импорт {index}: {word}", None, status, "бенчмарк"
+
+
+async def _run_import_scenario(
+    storage: TaskStorage, user_ids: List[int], per_user: int
+) -> List[str]:
+    """
+    Выполняет операции импорта, поиска, карточки задачи, выгрузки и очистки
+    выполненных для пользователей user_ids и возвращает строки результатов.
+    """
+    started = time.perf_counter()
+    for user_id in user_ids:
+        added = await storage.add_tasks_bulk(_import_rows(per_user), user_id)
+        assert added == per_user, "add_tasks_bulk добавил не все задачи"
+    imported = time.perf_counter() - started
+
+    matches = len(range(0, per_user, SEARCH_EVERY))
+    for user_id in user_ids[:5]:
+        rows, has_more = await storage.search_user_task_rows(
+            user_id, SEARCH_WORD, limit=PAGE_SIZE
+        )
+        assert len(rows) == min(matches, PAGE_SIZE) and has_more == (matches > PAGE_SIZE)
+        assert all(SEARCH_WORD in row[1] and row[2] == user_id for row in rows)
+    search_median, search_p95 = await _latencies_ms(
+        lambda user_id: storage.search_user_task_rows(user_id, SEARCH_WORD, limit=PAGE_SIZE),
+        user_ids,
+    )
+
+    first_ids = {}
+    for user_id in user_ids:
+        rows, _ = await storage.get_user_task_rows_page(user_id, limit=1)
+        first_ids[user_id] = rows[0][0]
+    row_median, row_p95 = await _latencies_ms(
+        lambda user_id: storage.get_task_row(first_ids[user_id], user_id), user_ids
+    )
+    # Первая задача импортируется выполненной: переводим ее в работу и обратно
+    for user_id in user_ids:
+        assert await storage.set_task_status(first_ids[user_id], user_id, "work")
+    status_median, status_p95 = await _latencies_ms(
+        lambda user_id: storage.set_task_status(first_ids[user_id], user_id, "done"), user_ids
+    )
+
+    started = time.perf_counter()
+    for user_id in user_ids:
+        exported = 0
+        async for chunk in storage.iter_user_task_rows(user_id):
+            exported += len(chunk)
+        assert exported == per_user, "выгрузка вернула не все задачи"
+    export = time.perf_counter() - started
+
+    done = len(range(0, per_user, DONE_EVERY))
+    started = time.perf_counter()
+    for user_id in user_ids:
+        deleted = await storage.delete_user_tasks_by_status(user_id, "done")
+        assert deleted == done, "удалено не ровно число выполненных задач"
+    cleared = time.perf_counter() - started
+
+    total = len(user_ids) * per_user
+    return [
+        f"add_tasks_bulk (импорт):        {total / imported:10.0f} задач/с",
+        f"search_user_task_rows:          p50 {search_median:7.3f} мс, p95 {search_p95:7.3f} мс",
+        f"get_task_row:                   p50 {row_median:7.3f} мс, p95 {row_p95:7.3f} мс",
+        f"set_task_status:                p50 {status_median:7.3f} мс, p95 {status_p95:7.3f} мс",
+        f"iter_user_task_rows (выгрузка): {total / export:10.0f} задач/с",
+        f"delete_user_tasks_by_status:    {len(user_ids) * done / cleared:10.0f} задач/с",
+    ]
+
+
+async def _latencies_ms(
+    call: Callable[[int], Awaitable[object]], user_ids: List[int]
+) -> Tuple[float, float]:
+    """Возвращает медиану и p95 задержки вызова по всем пользователям в миллисекундах."""
+    timings: List[float] = []
+    for user_id in user_ids:
+        started = time.perf_counter()
+        await call(user_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+async def run_target(
+    target: str,
+    users: int,
+    per_user: int,
+    concurrency: int,
+    processes: int,
+    import_users: int,
+    import_tasks: int,
+) -> None:
+    """Выполняет все операции бенчмарка для одной базы и печатает результаты."""
+    async with _scratch_database(target) as database:
+        storage = create_storage(database, pool_size=concurrency)
+        await storage.connect()
+        await storage.create_tables()
+        await storage.close()
+
+        total = users * per_user
+        user_ids = list(range(1, users + 1))
+        started, finished = await _add_tasks(database, user_ids, per_user, 1)
+        sequential = finished - started
+        started, finished = await _add_tasks(
+            database, [user_id + users for user_id in user_ids], per_user, concurrency
+        )
+        concurrent = finished - started
+        multi = await asyncio.get_running_loop().run_in_executor(
+            None, _add_from_processes, database, processes, users, per_user, concurrency
+        )
+
+        storage = create_storage(database, pool_size=concurrency)
+        await storage.connect()
+        for user_id in user_ids[:5]:
+            tasks = await storage.get_user_tasks(user_id)
+            assert [task.get_text() for task in tasks] == [
+                f"Задача {index} пользователя {user_id}" for index in range(per_user)
+            ], "задачи пользователя вернулись не в порядке добавления"
+            rows, has_more = await storage.get_user_task_rows_page(user_id, limit=PAGE_SIZE)
+            assert [row[0] for row in rows] == [task.get_id() for task in tasks[:PAGE_SIZE]]
+            assert has_more == (per_user > PAGE_SIZE)
+
+        tasks_median, tasks_p95 = await _latencies_ms(storage.get_user_tasks, user_ids)
+        page_median, page_p95 = await _latencies_ms(
+            lambda user_id: storage.get_user_task_rows_page(user_id, limit=PAGE_SIZE), user_ids
+        )
+        import_results = await _run_import_scenario(
+            storage, [20_000 + index for index in range(import_users)], import_tasks
+        )
+        await storage.close()
+
+    name = "sqlite" if not is_postgres_url(target) else "postgresql"
+    print(f"\n{name}: пользователей {users}, задач у пользователя {per_user}")
+    print(f"add_task по одной:              {total / sequential:10.0f} задач/с")
+    print(f"add_task, {concurrency:3} одновременно:      {total / concurrent:10.0f} задач/с")
+    print(f"add_task, {processes} процесса x {concurrency:3}:    {total / multi:10.0f} задач/с")
+    print(f"get_user_tasks:                 p50 {tasks_median:7.3f} мс, p95 {tasks_p95:7.3f} мс")
+    print(f"get_user_task_rows_page:        p50 {page_median:7.3f} мс, p95 {page_p95:7.3f} мс")
+    print(f"импорт: пользователей {import_users}, задач у пользователя {import_tasks}")
+    for line in import_results:
+        print(line)
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--databases", nargs="+", default=["sqlite"])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=50, help="задач у каждого пользователя")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--import-users", type=int, default=20)
+    parser.add_argument(
+        "--import-tasks", type=int, default=1000, help="задач в импорте каждого пользователя"
+    )
+    args = parser.parse_args()
+
+    setup_logger("database.db_manager", "WARNING")
+    setup_logger("database.pg_manager", "WARNING")
+    for target in args.databases:
+        asyncio.run(
+            run_target(
+                target,
+                args.users,
+                args.tasks,
+                args.concurrency,
+                args.processes,
+                args.import_users,
+                args.import_tasks,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
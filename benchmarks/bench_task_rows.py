@@ -0,0 +1,129 @@
+"""
+Микробенчмарк представлений задачи: время и память на N задач.
+
+Сравниваются:
+    - прежний класс Task с __dict__, собираемый из sqlite3.Row по именам столбцов;
+    - текущий Task со __slots__, собираемый через Task.from_row из кортежа;
+    - кортежи TaskRow без создания объектов модели.
+
+Запуск:
+    python -m benchmarks.bench_task_rows --tasks 100000
+"""
+
+import argparse
+import gc
+import sqlite3
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from database.db_manager import TASK_COLUMNS, format_created_at
+from database.models import Task
+
+
+class LegacyTask:
+    """Прежнее представление задачи: обычный класс с __dict__ и геттерами."""
+
+    def __init__(self, task_id: int, text: str, user_id: int, created_at: str):
+        self._id = task_id
+        self._text = text
+        self._user_id = user_id
+        self._created_at = created_at
+
+    def get_text(self) -> str:
+        """Возвращает текст задачи."""
+        return self._text
+
+
+def _create_database(tasks: int) -> sqlite3.Connection:
+    """Создает базу в памяти с заданным числом задач одного пользователя."""
+    connection = sqlite3.connect(":memory:")
+    connection.execute(
+        "CREATE TABLE tasks (id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT NOT NULL, "
+        "user_id INTEGER NOT NULL, created_at TEXT NOT NULL, "
+        "status TEXT NOT NULL DEFAULT 'work', category TEXT NOT NULL DEFAULT '');"
+    )
+    created_at = format_created_at()
+    connection.executemany(
+        "INSERT INTO tasks (text, user_id, created_at) VALUES (?, 1, ?);",
+        ((f"Задача номер {index}", created_at) for index in range(tasks)),
+    )
+    return connection
+
+
+def _legacy(connection: sqlite3.Connection) -> list:
+    """Собирает прежние объекты задач из sqlite3.Row по именам столбцов."""
+    connection.row_factory = sqlite3.Row
+    rows = connection.execute(f"SELECT {TASK_COLUMNS} FROM tasks;").fetchall()
+    return [
+        LegacyTask(
+            task_id=row["id"],
+            text=row["text"],
+            user_id=row["user_id"],
+            created_at=row["created_at"],
+        )
+        for row in rows
+    ]
+
+
+def _slotted(connection: sqlite3.Connection) -> list:
+    """Собирает объекты Task со __slots__ из кортежей."""
+    connection.row_factory = None
+    rows = connection.execute(f"SELECT {TASK_COLUMNS} FROM tasks;").fetchall()
+    return [Task.from_row(row) for row in rows]
+
+
+def _raw(connection: sqlite3.Connection) -> list:
+    """Возвращает кортежи TaskRow без объектов модели."""
+    connection.row_factory = None
+    return connection.execute(f"SELECT {TASK_COLUMNS} FROM tasks;").fetchall()
+
+
+def _measure(
+    connection: sqlite3.Connection, build: Callable[[sqlite3.Connection], list], repeats: int
+) -> Tuple[float, int]:
+    """
+    Возвращает лучшее время построения списка (мс) и пиковую память (байт).
+    """
+    timings: List[float] = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        result = build(connection)
+        timings.append((time.perf_counter() - started) * 1000)
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build(connection)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return min(timings), peak
+
+
+def main() -> None:
+    """Точка входа микробенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    connection = _create_database(args.tasks)
+    variants = [
+        ("Task (__dict__, sqlite3.Row)", _legacy),
+        ("Task (__slots__, from_row)", _slotted),
+        ("TaskRow (кортежи)", _raw),
+    ]
+
+    print(f"Задач: {args.tasks}")
+    print(f"{'представление':<30} | {'время, мс':>10} | {'пик памяти, МиБ':>16}")
+    for name, build in variants:
+        elapsed, peak = _measure(connection, build, args.repeats)
+        print(f"{name:<30} | {elapsed:>10.1f} | {peak / 1024 / 1024:>16.1f}")
+
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
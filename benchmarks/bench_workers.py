@@ -0,0 +1,105 @@
+"""
+Генератор нагрузки для режима супервизора: пропускная способность против числа процессов.
+
+Для каждого числа рабочих процессов запускается Supervisor на временной
+базе данных; запросы к Bot API обрабатывает офлайн-сессия RecordingSession
+(с необязательной искусственной задержкой). Супервизору передаются
+синтетические обновления (/add, текст задачи и /list для каждого
+пользователя), и измеряется время до их полной обработки всеми процессами.
+
+Запуск:
+    python -m benchmarks.bench_workers --workers 1 2 4 --users 200 --tasks 10
+    python -m benchmarks.bench_workers --workers 1 2 4 --shard-mode shared
+"""
+
+import argparse
+import functools
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from benchmarks.fake_telegram import FAKE_BOT_TOKEN, RecordingSession, make_message_update
+from utils.logger import setup_logger
+from utils.supervisor import Supervisor
+
+
+def _build_updates(users: int, tasks: int) -> List[Dict[str, Any]]:
+    """
+    Формирует обновления, перемежая пользователей, как в реальном потоке:
+    шаг диалога первого пользователя, затем второго и т. д.
+    """
+    dialogs = []
+    for user_id in range(1, users + 1):
+        texts = []
+        for index in range(tasks):
+            texts += ["/add", f"Задача {index} пользователя {user_id}"]
+        texts.append("/list")
+        dialogs.append((user_id, texts))
+
+    updates: List[Dict[str, Any]] = []
+    update_id = 1
+    for step in range(tasks * 2 + 1):
+        for user_id, texts in dialogs:
+            updates.append(make_message_update(update_id, user_id, texts[step]))
+            update_id += 1
+    return updates
+
+
+def run_once(workers: int, shard_mode: str, updates: List[Dict[str, Any]], latency: float) -> float:
+    """Прогоняет обновления через супервизор и возвращает обновлений в секунду."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        supervisor = Supervisor(
+            workers,
+            shard_mode,
+            database_path=os.path.join(tmp_dir, "bench.db"),
+            session_factory=functools.partial(RecordingSession, latency=latency, record=False),
+        )
+        supervisor.start()
+
+        started = time.perf_counter()
+        for update in updates:
+            supervisor.route(update)
+        processed = supervisor.stop()
+        elapsed = time.perf_counter() - started
+
+    total = sum(processed.values())
+    if total != len(updates):
+        print(f"    внимание: обработано {total} из {len(updates)} обновлений")
+    return len(updates) / elapsed
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=10, help="задач на пользователя")
+    parser.add_argument("--shard-mode", choices=["sharded", "shared"], default="sharded")
+    parser.add_argument(
+        "--latency-ms", type=float, default=0.0, help="задержка ответа Bot API в миллисекундах"
+    )
+    args = parser.parse_args()
+
+    # Рабочие процессы читают конфигурацию из окружения; токен нужен только для валидации
+    os.environ.setdefault("BOT_TOKEN", FAKE_BOT_TOKEN)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    os.environ.setdefault("SEND_RATE_LIMIT", "false")
+    setup_logger("utils.supervisor", "WARNING")
+
+    updates = _build_updates(args.users, args.tasks)
+    print(
+        f"Обновлений: {len(updates)} ({args.users} пользователей), "
+        f"режим базы: {args.shard_mode}, задержка API: {args.latency_ms} мс"
+    )
+
+    baseline = None
+    for workers in args.workers:
+        rate = run_once(workers, args.shard_mode, updates, args.latency_ms / 1000)
+        baseline = baseline or rate
+        print(f"Процессов: {workers:>2}  {rate:>10,.0f} обн./с  (x{rate / baseline:.2f})")
+
+
+if __name__ == "__main__":
+    main()
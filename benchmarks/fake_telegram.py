@@ -0,0 +1,290 @@
+"""
+Офлайн-заменитель Telegram Bot API для бенчмарков и локальных проверок.
+
+RecordingSession подменяет HTTP-сессию бота: вместо обращения к Telegram
+она записывает вызванные методы и возвращает синтетические ответы.
+FloodControlSession дополнительно отвечает 429, как Telegram при превышении
+ограничений на отправку сообщений.
+Функции make_*_update формируют JSON обновлений в формате Telegram,
+которые можно передать в Dispatcher.feed_raw_update или отправить
+POST-запросом на webhook-сервер.
+"""
+
+import asyncio
+import collections
+import datetime
+import itertools
+import time
+from typing import Any, AsyncGenerator, Deque, Dict, List, Mapping, Optional
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetFile, GetMe, SendDocument, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import BufferedInputFile, Chat, Document, File, Message, User
+
+# Токен в формате Telegram; идентификатор бота — число до двоеточия
+FAKE_BOT_TOKEN = "42:FAKE-TOKEN-FOR-OFFLINE-RUNS"
+
+
+class RecordingSession(BaseSession):
+    """
+    Сессия Bot API без сети: записывает вызовы и возвращает синтетические ответы.
+
+    Методы, возвращающие Message (sendMessage, sendDocument, editMessageText
+    и т. п.), получают сообщение в том же чате; getMe — пользователя-бота;
+    getFile — файл, зарегистрированный через add_file; остальные — True.
+    Отправленный документ получает синтетический file_id и регистрируется
+    как файл, поэтому его можно отправить повторно по file_id и скачать.
+    """
+
+    def __init__(self, latency: float = 0.0, record: bool = True):
+        """
+        Конструктор класса RecordingSession.
+
+        Параметры:
+            latency (float): искусственная задержка ответа в секундах.
+            record (bool): сохранять ли вызванные методы в calls.
+        """
+        super().__init__()
+        self.calls: List[TelegramMethod[Any]] = []
+        self.call_count = 0
+        self._latency = latency
+        self._record = record
+        self._message_ids = itertools.count(1)
+        self._file_ids = itertools.count(1)
+        self._files: Dict[str, bytes] = {}
+
+    def add_file(self, file_id: str, content: bytes) -> None:
+        """Регистрирует файл, который вернут getFile и скачивание по file_path."""
+        self._files[file_id] = content
+
+    async def close(self) -> None:
+        """Сетевых ресурсов нет — закрывать нечего."""
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        """Записывает вызов и возвращает синтетический результат метода."""
+        self.call_count += 1
+        if self._record:
+            self.calls.append(method)
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        return self._build_result(bot, method)
+
+    async def stream_content(
+        self,
+        url: str,
+        headers: Optional[Dict[str, Any]] = None,
+        timeout: int = 30,
+        chunk_size: int = 65536,
+        raise_for_status: bool = True,
+    ) -> AsyncGenerator[bytes, None]:
+        """Отдает содержимое зарегистрированного файла по его file_path в URL."""
+        for file_id, content in self._files.items():
+            if url.endswith(f"/{file_id}"):
+                for start in range(0, len(content), chunk_size):
+                    yield content[start:start + chunk_size]
+                return
+        yield b""
+
+    def _build_result(self, bot: Bot, method: TelegramMethod[Any]) -> Any:
+        """Формирует ответ Bot API в зависимости от типа результата метода."""
+        if isinstance(method, GetMe):
+            return User(id=bot.id, is_bot=True, first_name="TaskBot", username="taskbot_offline")
+        if isinstance(method, GetFile):
+            content = self._files.get(method.file_id, b"")
+            return File(
+                file_id=method.file_id,
+                file_unique_id=method.file_id,
+                file_size=len(content),
+                file_path=method.file_id,
+            )
+
+        returning = str(getattr(method, "__returning__", ""))
+        if "Message" in returning and "MessageId" not in returning:
+            chat_id = getattr(method, "chat_id", None) or 0
+            message = Message(
+                message_id=getattr(method, "message_id", None) or next(self._message_ids),
+                date=datetime.datetime.now(datetime.timezone.utc),
+                chat=Chat(id=int(chat_id), type="private"),
+                from_user=User(id=bot.id, is_bot=True, first_name="TaskBot"),
+                text=getattr(method, "text", None),
+                document=self._build_document(method) if isinstance(method, SendDocument) else None,
+            )
+            return message.as_(bot)
+        return True
+
+    def _build_document(self, method: SendDocument) -> Document:
+        """Возвращает документ отправленного файла, регистрируя новый файл по file_id."""
+        if isinstance(method.document, str):
+            content = self._files.get(method.document, b"")
+            return Document(
+                file_id=method.document, file_unique_id=method.document, file_size=len(content)
+            )
+
+        file_id = f"document-{next(self._file_ids)}"
+        content = method.document.data if isinstance(method.document, BufferedInputFile) else b""
+        self._files[file_id] = content
+        return Document(
+            file_id=file_id,
+            file_unique_id=file_id,
+            file_name=method.document.filename,
+            file_size=len(content),
+        )
+
+    def calls_by_method(self) -> Mapping[str, int]:
+        """Возвращает число записанных вызовов по именам методов Bot API."""
+        counts: Dict[str, int] = {}
+        for method in self.calls:
+            name = method.__api_method__
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+
+class FloodControlSession(RecordingSession):
+    """
+    RecordingSession, которая, как Telegram, отвечает 429 (TelegramRetryAfter)
+    на запросы к чатам сверх ограничений: больше chat_limit запросов в один
+    чат или больше global_limit запросов всего за последнюю секунду.
+    Отклоненные запросы не записываются в calls, их число — в rejected.
+    """
+
+    def __init__(
+        self,
+        chat_limit: int = 4,
+        global_limit: int = 30,
+        retry_after: int = 1,
+        latency: float = 0.0,
+    ):
+        """
+        Конструктор класса FloodControlSession.
+
+        Параметры:
+            chat_limit (int): запросов в один чат за секунду.
+            global_limit (int): запросов ко всем чатам за секунду.
+            retry_after (int): значение retry_after в ответе 429.
+            latency (float): искусственная задержка ответа в секундах.
+        """
+        super().__init__(latency=latency)
+        self._chat_limit = chat_limit
+        self._global_limit = global_limit
+        self._retry_after = retry_after
+        self._chat_sent: Dict[Any, Deque[float]] = collections.defaultdict(collections.deque)
+        self._global_sent: Deque[float] = collections.deque()
+        self.rejected = 0
+
+    @staticmethod
+    def _window(sent: Deque[float], now: float) -> Deque[float]:
+        """Удаляет из окна запросы старше одной секунды."""
+        while sent and now - sent[0] >= 1.0:
+            sent.popleft()
+        return sent
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        """Отвечает 429 при превышении ограничений, иначе как RecordingSession."""
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is not None:
+            now = time.monotonic()
+            chat_sent = self._window(self._chat_sent[chat_id], now)
+            global_sent = self._window(self._global_sent, now)
+            if len(chat_sent) >= self._chat_limit or len(global_sent) >= self._global_limit:
+                self.rejected += 1
+                raise TelegramRetryAfter(
+                    method=method,
+                    message=f"Too Many Requests: retry after {self._retry_after}",
+                    retry_after=self._retry_after,
+                )
+            chat_sent.append(now)
+            global_sent.append(now)
+        return await super().make_request(bot, method, timeout)
+
+
+def create_offline_bot(session: Optional[RecordingSession] = None) -> Bot:
+    """Создает бота, все запросы которого обрабатывает RecordingSession."""
+    return Bot(token=FAKE_BOT_TOKEN, session=session or RecordingSession())
+
+
+def _user_payload(user_id: int) -> Dict[str, Any]:
+    """Формирует JSON пользователя Telegram."""
+    return {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"}
+
+
+def make_message_update(
+    update_id: int,
+    user_id: int,
+    text: Optional[str] = None,
+    document: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Формирует JSON обновления с сообщением пользователя в личном чате.
+
+    Параметры:
+        update_id (int): идентификатор обновления.
+        user_id (int): идентификатор пользователя (совпадает с chat_id).
+        text (Optional[str]): текст сообщения, в том числе команда.
+        document (Optional[Dict[str, Any]]): JSON вложенного документа.
+
+    Возвращает:
+        Dict[str, Any]: обновление в формате Bot API.
+    """
+    message: Dict[str, Any] = {
+        "message_id": update_id,
+        "date": int(datetime.datetime.now().timestamp()),
+        "chat": {"id": user_id, "type": "private"},
+        "from": _user_payload(user_id),
+    }
+    if text is not None:
+        message["text"] = text
+        if text.startswith("/"):
+            command_length = len(text.split(maxsplit=1)[0])
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": command_length}]
+    if document is not None:
+        message["document"] = document
+    return {"update_id": update_id, "message": message}
+
+
+def make_callback_update(
+    update_id: int,
+    user_id: int,
+    data: str,
+    message_id: int = 1,
+) -> Dict[str, Any]:
+    """
+    Формирует JSON обновления с нажатием inline-кнопки под сообщением бота.
+
+    Параметры:
+        update_id (int): идентификатор обновления.
+        user_id (int): идентификатор пользователя.
+        data (str): callback_data нажатой кнопки.
+        message_id (int): идентификатор сообщения с клавиатурой.
+
+    Возвращает:
+        Dict[str, Any]: обновление в формате Bot API.
+    """
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": _user_payload(user_id),
+            "chat_instance": str(user_id),
+            "data": data,
+            "message": {
+                "message_id": message_id,
+                "date": int(datetime.datetime.now().timestamp()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": 42, "is_bot": True, "first_name": "TaskBot"},
+                "text": "Ваши задачи",
+            },
+        },
+    }
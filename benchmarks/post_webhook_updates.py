@@ -0,0 +1,128 @@
+"""
+Локальная проверка webhook-режима без Telegram API.
+
+Скрипт поднимает webhook-сервер с настоящим диспетчером и роутерами бота
+на временной базе данных, а запросы бота к Bot API перехватывает
+RecordingSession. Затем он отправляет на сервер синтетические обновления
+(/start, /add, текст задачи, /list) POST-запросами с секретным заголовком,
+проверяет, что запрос с неверным секретом отклоняется, и печатает
+число обработанных обновлений, задержку ответа и вызовы Bot API.
+
+Запуск:
+    python -m benchmarks.post_webhook_updates --users 50 --tasks 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from aiohttp import ClientSession, web
+
+from benchmarks.fake_telegram import (
+    RecordingSession,
+    create_offline_bot,
+    make_message_update,
+)
+from database.db_manager import DatabaseManager
+from database.fsm_storage import SQLiteStorage
+from main import create_dispatcher
+from utils.export_executor import ExportExecutor
+from utils.logger import setup_logger
+from utils.webhook import build_webhook_app
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+WEBHOOK_PATH = "/webhook"
+
+
+def _build_updates(users: int, tasks: int) -> List[Dict[str, Any]]:
+    """Формирует последовательность обновлений для всех пользователей."""
+    updates: List[Dict[str, Any]] = []
+    update_id = 1
+    for user_id in range(1, users + 1):
+        texts = ["/start"]
+        for index in range(tasks):
+            texts += ["/add", f"Задача {index} пользователя {user_id}"]
+        texts.append("/list")
+        for text in texts:
+            updates.append(make_message_update(update_id, user_id, text))
+            update_id += 1
+    return updates
+
+
+async def run(users: int, tasks: int, port: int, secret: str) -> None:
+    """Запускает сервер, отправляет обновления и печатает результаты."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_manager = DatabaseManager(os.path.join(tmp_dir, "webhook.db"))
+        await db_manager.connect()
+        await db_manager.create_tables()
+        export_executor = ExportExecutor()
+
+        session = RecordingSession()
+        bot = create_offline_bot(session)
+        setattr(bot, "db_manager", db_manager)
+        setattr(bot, "export_executor", export_executor)
+        dispatcher = create_dispatcher(SQLiteStorage(db_manager))
+        for name in ("database.db_manager", "database.fsm_storage", "handlers.start_handler",
+                     "handlers.task_handler", "utils.webhook"):
+            setup_logger(name, "WARNING")
+
+        # Отвечаем после обработки, чтобы измерять полное время обновления
+        app = build_webhook_app(
+            dispatcher, bot, path=WEBHOOK_PATH, secret_token=secret, handle_in_background=False
+        )
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, host="127.0.0.1", port=port)
+        await site.start()
+        url = f"http://127.0.0.1:{port}{WEBHOOK_PATH}"
+
+        updates = _build_updates(users, tasks)
+        latencies: List[float] = []
+        try:
+            async with ClientSession() as client:
+                async with client.post(
+                    url, json=updates[0], headers={SECRET_HEADER: "wrong-secret"}
+                ) as response:
+                    rejected_status = response.status
+
+                started = time.perf_counter()
+                for update in updates:
+                    request_started = time.perf_counter()
+                    async with client.post(url, json=update, headers={SECRET_HEADER: secret}) as response:
+                        response.raise_for_status()
+                        await response.read()
+                    latencies.append((time.perf_counter() - request_started) * 1000)
+                elapsed = time.perf_counter() - started
+        finally:
+            await runner.cleanup()
+            await db_manager.close()
+            export_executor.shutdown()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+    print(f"Запрос с неверным секретом: HTTP {rejected_status}")
+    print(f"Отправлено обновлений: {len(updates)} за {elapsed:.2f} с ({len(updates) / elapsed:,.0f} обн./с)")
+    print(f"Задержка ответа: p50 {statistics.median(latencies):.2f} мс, p95 {p95:.2f} мс")
+    print("Вызовы Bot API:")
+    for name, count in sorted(session.calls_by_method().items()):
+        print(f"    {name}: {count}")
+
+
+def main() -> None:
+    """Точка входа скрипта."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=5, help="задач на пользователя")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--secret", default="local-secret")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.users, args.tasks, args.port, args.secret))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,60 @@ from typing import List
 from dotenv import load_dotenv, find_dotenv
 
 
+def _get_bool_env(name: str, default: bool) -> bool:
+    """
+    Считывает логический параметр из переменных окружения.
+
+    Параметры:
+        name (str): имя переменной окружения.
+        default (bool): значение по умолчанию, если переменная не задана.
+    """
+    value = (os.getenv(name) or "").strip().lower()
+    if not value:
+        return default
+    return value in ("1", "true", "yes", "on")
+
+
+def _get_int_env(name: str, default: int) -> int:
+    """
+    Считывает целочисленный параметр из переменных окружения.
+
+    Параметры:
+        name (str): имя переменной окружения.
+        default (int): значение по умолчанию, если переменная не задана.
+
+    Исключения:
+        ValueError: если значение не является целым числом.
+    """
+    value = (os.getenv(name) or "").strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError as error:
+        raise ValueError(f"Параметр {name} должен быть целым числом: {value!r}") from error
+
+
+def _get_float_env(name: str, default: float) -> float:
+    """
+    Считывает дробный параметр из переменных окружения.
+
+    Параметры:
+        name (str): имя переменной окружения.
+        default (float): значение по умолчанию, если переменная не задана.
+
+    Исключения:
+        ValueError: если значение не является числом.
+    """
+    value = (os.getenv(name) or "").strip()
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError as error:
+        raise ValueError(f"Параметр {name} должен быть числом: {value!r}") from error
+
+
 class Config:
     """
     Класс для управления конфигурацией приложения.
@@ -15,6 +69,91 @@ class Config:
     DATABASE_PATH: str = "./tasks.db"
     LOG_LEVEL: str = "INFO"
 
+    # Вывод логов: через очередь в фоновом потоке, формат text или json,
+    # прореживание повторяющихся записей INFO (доля и максимум в секунду)
+    LOG_QUEUE: bool = True
+    LOG_FORMAT: str = "text"
+    LOG_SAMPLE_RATE: float = 1.0
+    LOG_RATE_LIMIT: float = 0.0
+
+    # Пакетная запись задач (group commit)
+    DB_BATCH_WRITES: bool = False
+    DB_BATCH_SIZE: int = 64
+    DB_BATCH_DELAY_MS: int = 10
+
+    # Объединение одинаковых конкурентных чтений задач пользователя и окно
+    # пакетного чтения get_user_tasks разных пользователей (0 — без пакетов)
+    DB_COALESCE_READS: bool = False
+    DB_READ_BATCH_SIZE: int = 64
+    DB_READ_BATCH_DELAY_MS: float = 0.0
+    DB_READ_STATS_INTERVAL: int = 300
+
+    # Пул соединений WAL и настройки PRAGMA (DB_POOL_SIZE=0 — одно соединение)
+    DB_POOL_SIZE: int = 0
+    DB_SYNCHRONOUS: str = "NORMAL"
+    DB_CACHE_SIZE: int = -16000
+    DB_MMAP_SIZE: int = 268435456
+    DB_BUSY_TIMEOUT_MS: int = 5000
+
+    # Возврат файлу места после удаления задач: интервал incremental_vacuum
+    # в секундах (0 — отключен) и максимум страниц за один запуск (0 — все)
+    DB_VACUUM_INTERVAL: int = 3600
+    DB_VACUUM_PAGES: int = 1000
+
+    # Кэш задач пользователей (TASK_CACHE_USERS=0 — кэш отключен)
+    TASK_CACHE_USERS: int = 1024
+    TASK_CACHE_TTL: int = 300
+    TASK_CACHE_STATS_INTERVAL: int = 300
+
+    # Хранилище состояний FSM: sqlite (в базе данных) или memory
+    FSM_STORAGE: str = "sqlite"
+    FSM_FLUSH_INTERVAL_MS: int = 200
+
+    # Выгрузки: лимит одновременных выгрузок и число потоков кодирования
+    EXPORT_MAX_CONCURRENT: int = 2
+    EXPORT_WORKERS: int = 2
+
+    # Импорт задач: количество строк в одной транзакции
+    IMPORT_CHUNK_SIZE: int = 1000
+
+    # Ограничение частоты входящих событий: общая корзина пользователя
+    # (событий в секунду и подряд) и корзина тяжелых операций (выгрузки, импорт)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_USER_RATE: float = 1.0
+    RATE_LIMIT_USER_BURST: int = 10
+    RATE_LIMIT_HEAVY_BURST: int = 2
+    RATE_LIMIT_HEAVY_INTERVAL: float = 30.0
+
+    # Планировщик исходящих запросов к Bot API с учетом ограничений Telegram
+    SEND_RATE_LIMIT: bool = True
+    SEND_GLOBAL_RATE: float = 25.0
+    SEND_CHAT_RATE: float = 1.0
+    SEND_MAX_RETRIES: int = 3
+
+    # Напоминания о сроках задач: число ближайших сроков в памяти
+    # и напоминаний в секунду (меньше SEND_GLOBAL_RATE, чтобы оставить место ответам)
+    REMINDERS_ENABLED: bool = True
+    REMINDER_WINDOW: int = 1000
+    REMINDER_SEND_RATE: float = 20.0
+
+    # Режим запуска: polling (long polling) или webhook (aiohttp-сервер)
+    RUN_MODE: str = "polling"
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_SECRET: str = ""
+    WEBHOOK_BASE_URL: str = ""
+
+    # Супервизор: число рабочих процессов (0 — один процесс без супервизора)
+    # и режим базы данных: sharded (файл на процесс) или shared (общая база в WAL)
+    WORKERS: int = 0
+    SHARD_MODE: str = "sharded"
+    WORKER_MAX_IN_FLIGHT: int = 256
+
+    # Метрики Prometheus: порт HTTP-сервера /metrics (0 — метрики отключены)
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int = 0
+
     @classmethod
     def load_env(cls, env_file: str = ".env") -> None:
         """
@@ -43,6 +182,67 @@ class Config:
         cls.BOT_TOKEN = (os.getenv("BOT_TOKEN") or "").strip()
         cls.DATABASE_PATH = (os.getenv("DATABASE_PATH") or "./tasks.db").strip()
         cls.LOG_LEVEL = (os.getenv("LOG_LEVEL") or "INFO").strip().upper()
+        cls.LOG_QUEUE = _get_bool_env("LOG_QUEUE", True)
+        cls.LOG_FORMAT = (os.getenv("LOG_FORMAT") or "text").strip().lower()
+        cls.LOG_SAMPLE_RATE = _get_float_env("LOG_SAMPLE_RATE", 1.0)
+        cls.LOG_RATE_LIMIT = _get_float_env("LOG_RATE_LIMIT", 0.0)
+
+        cls.DB_BATCH_WRITES = _get_bool_env("DB_BATCH_WRITES", False)
+        cls.DB_BATCH_SIZE = _get_int_env("DB_BATCH_SIZE", 64)
+        cls.DB_BATCH_DELAY_MS = _get_int_env("DB_BATCH_DELAY_MS", 10)
+        cls.DB_COALESCE_READS = _get_bool_env("DB_COALESCE_READS", False)
+        cls.DB_READ_BATCH_SIZE = _get_int_env("DB_READ_BATCH_SIZE", 64)
+        cls.DB_READ_BATCH_DELAY_MS = _get_float_env("DB_READ_BATCH_DELAY_MS", 0.0)
+        cls.DB_READ_STATS_INTERVAL = _get_int_env("DB_READ_STATS_INTERVAL", 300)
+
+        cls.DB_POOL_SIZE = _get_int_env("DB_POOL_SIZE", 0)
+        cls.DB_SYNCHRONOUS = (os.getenv("DB_SYNCHRONOUS") or "NORMAL").strip().upper()
+        cls.DB_CACHE_SIZE = _get_int_env("DB_CACHE_SIZE", -16000)
+        cls.DB_MMAP_SIZE = _get_int_env("DB_MMAP_SIZE", 268435456)
+        cls.DB_BUSY_TIMEOUT_MS = _get_int_env("DB_BUSY_TIMEOUT_MS", 5000)
+        cls.DB_VACUUM_INTERVAL = _get_int_env("DB_VACUUM_INTERVAL", 3600)
+        cls.DB_VACUUM_PAGES = _get_int_env("DB_VACUUM_PAGES", 1000)
+
+        cls.TASK_CACHE_USERS = _get_int_env("TASK_CACHE_USERS", 1024)
+        cls.TASK_CACHE_TTL = _get_int_env("TASK_CACHE_TTL", 300)
+        cls.TASK_CACHE_STATS_INTERVAL = _get_int_env("TASK_CACHE_STATS_INTERVAL", 300)
+
+        cls.FSM_STORAGE = (os.getenv("FSM_STORAGE") or "sqlite").strip().lower()
+        cls.FSM_FLUSH_INTERVAL_MS = _get_int_env("FSM_FLUSH_INTERVAL_MS", 200)
+
+        cls.EXPORT_MAX_CONCURRENT = _get_int_env("EXPORT_MAX_CONCURRENT", 2)
+        cls.EXPORT_WORKERS = _get_int_env("EXPORT_WORKERS", 2)
+
+        cls.IMPORT_CHUNK_SIZE = _get_int_env("IMPORT_CHUNK_SIZE", 1000)
+
+        cls.RATE_LIMIT_ENABLED = _get_bool_env("RATE_LIMIT_ENABLED", True)
+        cls.RATE_LIMIT_USER_RATE = _get_float_env("RATE_LIMIT_USER_RATE", 1.0)
+        cls.RATE_LIMIT_USER_BURST = _get_int_env("RATE_LIMIT_USER_BURST", 10)
+        cls.RATE_LIMIT_HEAVY_BURST = _get_int_env("RATE_LIMIT_HEAVY_BURST", 2)
+        cls.RATE_LIMIT_HEAVY_INTERVAL = _get_float_env("RATE_LIMIT_HEAVY_INTERVAL", 30.0)
+
+        cls.SEND_RATE_LIMIT = _get_bool_env("SEND_RATE_LIMIT", True)
+        cls.SEND_GLOBAL_RATE = _get_float_env("SEND_GLOBAL_RATE", 25.0)
+        cls.SEND_CHAT_RATE = _get_float_env("SEND_CHAT_RATE", 1.0)
+        cls.SEND_MAX_RETRIES = _get_int_env("SEND_MAX_RETRIES", 3)
+
+        cls.REMINDERS_ENABLED = _get_bool_env("REMINDERS_ENABLED", True)
+        cls.REMINDER_WINDOW = _get_int_env("REMINDER_WINDOW", 1000)
+        cls.REMINDER_SEND_RATE = _get_float_env("REMINDER_SEND_RATE", 20.0)
+
+        cls.RUN_MODE = (os.getenv("RUN_MODE") or "polling").strip().lower()
+        cls.WEBHOOK_HOST = (os.getenv("WEBHOOK_HOST") or "0.0.0.0").strip()
+        cls.WEBHOOK_PORT = _get_int_env("WEBHOOK_PORT", 8080)
+        cls.WEBHOOK_PATH = (os.getenv("WEBHOOK_PATH") or "/webhook").strip()
+        cls.WEBHOOK_SECRET = (os.getenv("WEBHOOK_SECRET") or "").strip()
+        cls.WEBHOOK_BASE_URL = (os.getenv("WEBHOOK_BASE_URL") or "").strip()
+
+        cls.WORKERS = _get_int_env("WORKERS", 0)
+        cls.SHARD_MODE = (os.getenv("SHARD_MODE") or "sharded").strip().lower()
+        cls.WORKER_MAX_IN_FLIGHT = _get_int_env("WORKER_MAX_IN_FLIGHT", 256)
+
+        cls.METRICS_HOST = (os.getenv("METRICS_HOST") or "127.0.0.1").strip()
+        cls.METRICS_PORT = _get_int_env("METRICS_PORT", 0)
 
         # Валидация обязательных параметров конфигурации
         cls.validate()
@@ -68,3 +268,53 @@ class Config:
                 f"Отсутствуют обязательные параметры конфигурации: {', '.join(missing)}"
             )
 
+        if cls.FSM_STORAGE not in ("sqlite", "memory"):
+            raise ValueError(
+                f"Недопустимое значение FSM_STORAGE: {cls.FSM_STORAGE}. "
+                "Допустимые значения: sqlite, memory"
+            )
+
+        if cls.RUN_MODE not in ("polling", "webhook"):
+            raise ValueError(
+                f"Недопустимое значение RUN_MODE: {cls.RUN_MODE}. "
+                "Допустимые значения: polling, webhook"
+            )
+
+        if not cls.WEBHOOK_PATH.startswith("/"):
+            raise ValueError(f"WEBHOOK_PATH должен начинаться с '/': {cls.WEBHOOK_PATH}")
+
+        if cls.SHARD_MODE not in ("sharded", "shared"):
+            raise ValueError(
+                f"Недопустимое значение SHARD_MODE: {cls.SHARD_MODE}. "
+                "Допустимые значения: sharded, shared"
+            )
+
+        if cls.REMINDER_WINDOW < 1:
+            raise ValueError(f"REMINDER_WINDOW должен быть положительным: {cls.REMINDER_WINDOW}")
+
+        if cls.IMPORT_CHUNK_SIZE < 1:
+            raise ValueError(
+                f"IMPORT_CHUNK_SIZE должен быть положительным: {cls.IMPORT_CHUNK_SIZE}"
+            )
+
+        positive = (
+            "RATE_LIMIT_USER_RATE",
+            "RATE_LIMIT_HEAVY_INTERVAL",
+            "SEND_GLOBAL_RATE",
+            "SEND_CHAT_RATE",
+            "REMINDER_SEND_RATE",
+        )
+        for name in positive:
+            if getattr(cls, name) <= 0:
+                raise ValueError(f"{name} должен быть положительным: {getattr(cls, name)}")
+
+        if cls.LOG_FORMAT not in ("text", "json"):
+            raise ValueError(
+                f"Недопустимое значение LOG_FORMAT: {cls.LOG_FORMAT}. "
+                "Допустимые значения: text, json"
+            )
+
+        if not 0 < cls.LOG_SAMPLE_RATE <= 1:
+            raise ValueError(
+                f"LOG_SAMPLE_RATE должен быть в диапазоне (0, 1]: {cls.LOG_SAMPLE_RATE}"
+            )
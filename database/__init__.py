@@ -3,7 +3,31 @@
 """
 
 from .db_manager import DatabaseManager
-from .models import Task, User
-
-__all__ = ["DatabaseManager", "Task", "User"]
+from .fsm_storage import SQLiteStorage
+from .models import (
+    TASK_STATUSES,
+    CsvExportRow,
+    ReminderRow,
+    Task,
+    TaskRow,
+    User,
+    parse_task_status,
+)
+from .storage import TaskStorage, create_storage, is_postgres_url
+from .task_cache import TaskCache
 
+__all__ = [
+    "CsvExportRow",
+    "DatabaseManager",
+    "ReminderRow",
+    "SQLiteStorage",
+    "TASK_STATUSES",
+    "Task",
+    "TaskCache",
+    "TaskRow",
+    "TaskStorage",
+    "User",
+    "create_storage",
+    "is_postgres_url",
+    "parse_task_status",
+]
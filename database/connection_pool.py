@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+import aiosqlite
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+
+class ConnectionPool:
+    """
+    Пул соединений SQLite в режиме WAL: одно соединение для записи
+    и несколько соединений только для чтения.
+
+    Каждое соединение aiosqlite обслуживается собственным потоком, поэтому
+    чтения выполняются параллельно и не ждут завершения записи.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = 4,
+        synchronous: str = "NORMAL",
+        cache_size: int = -16000,
+        mmap_size: int = 268435456,
+        busy_timeout_ms: int = 5000,
+    ):
+        """
+        Конструктор класса ConnectionPool.
+
+        Параметры:
+            db_path (str): путь к файлу базы данных.
+            readers (int): количество соединений для чтения.
+            synchronous (str): значение PRAGMA synchronous (OFF, NORMAL, FULL, EXTRA).
+            cache_size (int): значение PRAGMA cache_size (отрицательное — в КиБ).
+            mmap_size (int): значение PRAGMA mmap_size в байтах.
+            busy_timeout_ms (int): значение PRAGMA busy_timeout в миллисекундах.
+
+        Исключения:
+            ValueError: если параметры пула некорректны.
+        """
+        if readers < 1:
+            raise ValueError("Пул должен содержать хотя бы одно соединение для чтения")
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(
+                f"Недопустимое значение synchronous: {synchronous}. "
+                f"Допустимые значения: {', '.join(SYNCHRONOUS_MODES)}"
+            )
+
+        self._db_path = db_path
+        self._readers_count = readers
+        self._synchronous = synchronous
+        self._cache_size = cache_size
+        self._mmap_size = mmap_size
+        self._busy_timeout_ms = busy_timeout_ms
+        self._journal_mode = ""
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+
+    @property
+    def writer(self) -> aiosqlite.Connection:
+        """
+        Возвращает соединение для записи.
+
+        Исключения:
+            RuntimeError: если пул не открыт.
+        """
+        if self._writer is None:
+            raise RuntimeError("Пул соединений не открыт")
+        return self._writer
+
+    async def open(self) -> None:
+        """
+        Открывает соединение для записи, переводит базу в режим WAL
+        и открывает соединения для чтения.
+        """
+        if self._writer is not None:
+            return
+
+        self._writer = await self._open_connection()
+        # auto_vacuum действует только для новой базы и задается до перехода
+        # в WAL: переключение журнала уже записывает заголовок файла
+        await self._writer.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+        cursor = await self._writer.execute("PRAGMA journal_mode = WAL;")
+        row = await cursor.fetchone()
+        await cursor.close()
+        self._journal_mode = str(row[0]) if row else ""
+
+        # Каждое соединение aiosqlite работает в своем потоке,
+        # поэтому соединения для чтения открываются одновременно
+        self._idle_readers = asyncio.Queue()
+        readers = await asyncio.gather(
+            *(self._open_reader() for _ in range(self._readers_count))
+        )
+        for reader in readers:
+            self._readers.append(reader)
+            self._idle_readers.put_nowait(reader)
+
+    async def _open_reader(self) -> aiosqlite.Connection:
+        """Открывает соединение только для чтения."""
+        reader = await self._open_connection()
+        await reader.execute("PRAGMA query_only = ON;")
+        return reader
+
+    async def _open_connection(self) -> aiosqlite.Connection:
+        """Открывает соединение и применяет к нему настройки PRAGMA."""
+        connection = await aiosqlite.connect(self._db_path)
+        connection.row_factory = aiosqlite.Row
+        await connection.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)};")
+        await connection.execute(f"PRAGMA synchronous = {self._synchronous};")
+        await connection.execute(f"PRAGMA cache_size = {int(self._cache_size)};")
+        await connection.execute(f"PRAGMA mmap_size = {int(self._mmap_size)};")
+        await connection.execute("PRAGMA foreign_keys = ON;")
+        await connection.commit()
+        return connection
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Выдает свободное соединение для чтения на время блока async with.
+        Если все соединения заняты, ожидает освобождения одного из них.
+        """
+        if self._idle_readers is None:
+            raise RuntimeError("Пул соединений не открыт")
+
+        connection = await self._idle_readers.get()
+        try:
+            yield connection
+        finally:
+            self._idle_readers.put_nowait(connection)
+
+    def describe(self) -> str:
+        """Возвращает описание размера пула и настроек PRAGMA для логирования."""
+        return (
+            f"1 писатель + {self._readers_count} читателей, "
+            f"journal_mode={self._journal_mode or 'wal'}, "
+            f"synchronous={self._synchronous}, cache_size={self._cache_size}, "
+            f"mmap_size={self._mmap_size}, busy_timeout={self._busy_timeout_ms} мс"
+        )
+
+    async def close(self) -> None:
+        """Закрывает все соединения пула."""
+        for reader in self._readers:
+            await reader.close()
+        self._readers = []
+        self._idle_readers = None
+
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
@@ -1,88 +1,409 @@
 from __future__ import annotations
 
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 
 import aiosqlite
 
-from database.models import Task
+from database.connection_pool import ConnectionPool
+from database.migrations import MIGRATIONS, SCHEMA_VERSION
+from database.models import (
+    DEFAULT_TASK_STATUS,
+    TASK_STATUSES,
+    CsvExportRow,
+    ReminderRow,
+    Task,
+    TaskRow,
+)
+from database.read_coalescer import ReadBatcher, ReadCoalescer
+from database.task_cache import TaskCache
+from database.write_batcher import WriteBatcher
 from utils.logger import setup_logger
 
 
+# Столбцы задачи в порядке, соответствующем TaskRow
+TASK_COLUMNS = "id, text, user_id, created_at, status, category"
+
+# Обработчик измерений запроса: имя операции, длительность в секундах, число строк
+QueryHook = Callable[[str, float, int], None]
+
+# Обработчик изменения срока задачи: ID задачи, ID пользователя, новый срок или None
+DueHook = Callable[[int, int, Optional[str]], None]
+
+# Максимальное число слов поискового запроса, передаваемых в FTS5
+SEARCH_MAX_TERMS = 8
+
+# Задержка повторного incremental_vacuum в секундах, если запуск отложен
+# из-за открытого курсора чтения на общем соединении
+VACUUM_RETRY_DELAY = 30.0
+
+
+def format_created_at(moment: Optional[datetime] = None) -> str:
+    """
+    Возвращает дату создания задачи в нормализованном формате ISO 8601.
+
+    Строка всегда содержит микросекунды и имеет фиксированную ширину,
+    поэтому значения сортируются лексикографически без вызова datetime().
+
+    Параметры:
+        moment (Optional[datetime]): момент времени (по умолчанию текущий).
+    """
+    return (moment or datetime.now()).isoformat(timespec="microseconds")
+
+
+def search_terms(query: str) -> List[str]:
+    """
+    Возвращает слова поискового запроса (буквы и цифры) с заменой «ё» на «е»,
+    не больше SEARCH_MAX_TERMS. Операторы поиска во вводе пользователя
+    отбрасываются вместе с остальными символами.
+
+    Параметры:
+        query (str): текст поискового запроса.
+    """
+    normalized = query.replace("ё", "е").replace("Ё", "Е")
+    return re.findall(r"\w+", normalized)[:SEARCH_MAX_TERMS]
+
+
+def build_search_query(query: str) -> Optional[str]:
+    """
+    Преобразует пользовательский запрос в выражение MATCH для tasks_fts.
+
+    Каждое слово запроса ищется как префикс, поэтому «задач» находит
+    «задача» и «задачи». Слова объединяются через AND.
+
+    Параметры:
+        query (str): текст поискового запроса.
+
+    Возвращает:
+        Optional[str]: выражение для столбца text или None, если слов нет.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return None
+    return "text : (" + " AND ".join(f'"{term}"*' for term in terms) + ")"
+
+
 class DatabaseManager:
     """
     Менеджер для работы с базой данных SQLite.
     Отвечает за подключение, создание таблиц и выполнение CRUD операций.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        batch_writes: bool = False,
+        batch_size: int = 64,
+        batch_delay_ms: int = 10,
+        pool_size: int = 0,
+        synchronous: str = "NORMAL",
+        cache_size: int = -16000,
+        mmap_size: int = 268435456,
+        busy_timeout_ms: int = 5000,
+        cache: Optional[TaskCache] = None,
+        query_hook: Optional[QueryHook] = None,
+        vacuum_interval: float = 0.0,
+        vacuum_pages: int = 0,
+        coalesce_reads: bool = False,
+        read_batch_size: int = 64,
+        read_batch_delay_ms: float = 0.0,
+        read_stats_interval: float = 300.0,
+    ):
         """
         Конструктор класса DatabaseManager.
 
         Параметры:
             db_path (str): путь к файлу базы данных.
+            batch_writes (bool): объединять ли конкурентные add_task в одну транзакцию.
+            batch_size (int): максимальное число строк в пакете записи.
+            batch_delay_ms (int): максимальное время ожидания пакета в миллисекундах.
+            pool_size (int): число соединений для чтения в режиме пула WAL
+                (0 — одно общее соединение, как раньше).
+            synchronous (str): PRAGMA synchronous для соединений пула.
+            cache_size (int): PRAGMA cache_size для соединений пула.
+            mmap_size (int): PRAGMA mmap_size для соединений пула.
+            busy_timeout_ms (int): PRAGMA busy_timeout для соединений пула.
+            cache (Optional[TaskCache]): кэш задач пользователей; изменения
+                данных пользователя сбрасывают его записи.
+            query_hook (Optional[QueryHook]): вызывается после каждого запроса
+                к базе с именем операции, длительностью и числом строк.
+            vacuum_interval (float): интервал фонового incremental_vacuum в секундах
+                (0 — не запускать).
+            vacuum_pages (int): максимум страниц, возвращаемых файлу за один запуск
+                (0 — все свободные страницы).
+            coalesce_reads (bool): объединять одинаковые конкурентные чтения
+                задач пользователя в один запрос.
+            read_batch_size (int): максимальное число пользователей в одном
+                запросе get_user_tasks при пакетном чтении.
+            read_batch_delay_ms (float): окно пакетного чтения get_user_tasks
+                разных пользователей в миллисекундах (0 — без пакетов).
+            read_stats_interval (float): период логирования доли объединенных
+                чтений в секундах.
         """
         self._db_path = db_path
         self._connection: Optional[aiosqlite.Connection] = None
+        self._pool: Optional[ConnectionPool] = None
+        if pool_size > 0:
+            self._pool = ConnectionPool(
+                db_path,
+                readers=pool_size,
+                synchronous=synchronous,
+                cache_size=cache_size,
+                mmap_size=mmap_size,
+                busy_timeout_ms=busy_timeout_ms,
+            )
+        self._batch_writes = batch_writes
+        self._batch_size = batch_size
+        self._batch_delay_ms = batch_delay_ms
+        self._write_batcher: Optional[WriteBatcher] = None
+        # Сериализует транзакции записи на общем соединении
+        self._write_lock = asyncio.Lock()
+        self._cache = cache
+        self._query_hook = query_hook
+        self._vacuum_interval = vacuum_interval
+        self._vacuum_pages = vacuum_pages
+        self._vacuum_task: Optional[asyncio.Task] = None
+        # Число открытых чтений на общем соединении (без пула): SQLite не выполняет
+        # incremental_vacuum, пока на соединении есть незавершенный SELECT
+        self._open_readers = 0
+        self._due_hook: Optional[DueHook] = None
+        self._coalescer: Optional[ReadCoalescer] = None
+        self._read_batcher: Optional[ReadBatcher] = None
+        if coalesce_reads:
+            self._coalescer = ReadCoalescer(stats_interval=read_stats_interval)
+            if read_batch_delay_ms > 0:
+                self._read_batcher = ReadBatcher(
+                    self._load_users_tasks,
+                    max_batch_size=read_batch_size,
+                    max_delay=read_batch_delay_ms / 1000,
+                )
         self._logger = setup_logger(__name__)
 
+    @property
+    def cache(self) -> Optional[TaskCache]:
+        """Возвращает кэш задач пользователей или None, если кэш отключен."""
+        return self._cache
+
+    def _invalidate_user(self, user_id: int) -> None:
+        """
+        Сбрасывает кэшированные данные пользователя.
+        Вызывается после каждой операции, изменяющей задачи пользователя.
+        """
+        if self._cache is not None:
+            self._cache.invalidate(user_id)
+        if self._coalescer is not None:
+            self._coalescer.invalidate(user_id)
+
+    def set_due_hook(self, hook: Optional[DueHook]) -> None:
+        """
+        Задает обработчик, который вызывается после добавления задачи со сроком
+        и после изменения срока задачи (например, планировщик напоминаний).
+
+        Параметры:
+            hook (Optional[DueHook]): обработчик или None, чтобы отключить его.
+        """
+        self._due_hook = hook
+
+    def _observe_query(self, name: str, started: float, rows: int) -> None:
+        """Передает длительность и число строк запроса в query_hook, если он задан."""
+        if self._query_hook is not None:
+            self._query_hook(name, time.perf_counter() - started, rows)
+
     async def connect(self) -> None:
         """
         Устанавливает соединение с базой данных.
-        Логирует успешное подключение на уровне INFO.
+        В режиме пула открывает соединение для записи и соединения для чтения.
+        Логирует успешное подключение и настройки пула на уровне INFO.
         """
         if self._connection is not None:
             return
 
-        # Создаем асинхронное соединение с базой данных
-        self._connection = await aiosqlite.connect(self._db_path)
-        self._connection.row_factory = aiosqlite.Row
-        await self._connection.execute("PRAGMA foreign_keys = ON;")
-        await self._connection.commit()
+        if self._pool is not None:
+            # Соединение пула для записи используется для всех изменений и миграций
+            await self._pool.open()
+            self._connection = self._pool.writer
+            self._logger.info("Пул соединений: %s", self._pool.describe())
+        else:
+            # Создаем асинхронное соединение с базой данных
+            self._connection = await aiosqlite.connect(self._db_path)
+            self._connection.row_factory = aiosqlite.Row
+            # Действует только для новой базы; существующая переводится
+            # в этот режим в create_tables
+            await self._connection.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+            await self._connection.execute("PRAGMA foreign_keys = ON;")
+            await self._connection.commit()
+
+        if self._batch_writes:
+            self._write_batcher = WriteBatcher(
+                self._connection,
+                max_batch_size=self._batch_size,
+                max_delay=self._batch_delay_ms / 1000,
+                write_lock=self._write_lock,
+            )
+            self._logger.info(
+                "Включена пакетная запись: до %s строк или %s мс",
+                self._batch_size,
+                self._batch_delay_ms,
+            )
+
+        if self._vacuum_interval > 0:
+            self._vacuum_task = asyncio.create_task(self._vacuum_periodically())
 
         self._logger.info("Установлено соединение с базой данных %s", self._db_path)
 
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Выдает соединение для чтения: свободное соединение пула
+        или общее соединение, если пул не используется.
+        """
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        if self._pool is None:
+            self._open_readers += 1
+            try:
+                yield self._connection
+            finally:
+                self._open_readers -= 1
+            return
+
+        async with self._pool.reader() as connection:
+            yield connection
+
     async def create_tables(self) -> None:
         """
-        Создает таблицу tasks, если она не существует.
+        Создает таблицы и применяет недостающие миграции схемы.
 
-        Структура таблицы:
+        Структура таблицы tasks:
             - id: INTEGER PRIMARY KEY AUTOINCREMENT
             - text: TEXT NOT NULL
             - user_id: INTEGER NOT NULL
-            - created_at: TEXT NOT NULL (дата в формате ISO 8601)
+            - created_at: TEXT NOT NULL (нормализованная дата ISO 8601)
+            - status: TEXT NOT NULL (код статуса из TASK_STATUSES, по умолчанию 'work')
+            - category: TEXT NOT NULL (категория, по умолчанию пустая строка)
+
+        Полнотекстовый индекс tasks_fts (FTS5) обновляется триггерами таблицы tasks.
 
-        Логирует создание таблицы на уровне INFO.
+        Если включен фоновый incremental_vacuum, база, созданная без auto_vacuum,
+        здесь же один раз переводится в режим INCREMENTAL полным VACUUM — до начала
+        работы бота, а не во время обработки запросов.
+
+        Логирует версию схемы на уровне INFO.
+        """
+        await self.migrate()
+        if self._vacuum_interval > 0:
+            await self.enable_incremental_vacuum()
+
+    async def enable_incremental_vacuum(self) -> bool:
+        """
+        Переводит базу данных в режим auto_vacuum = INCREMENTAL.
+
+        Для базы, созданной без auto_vacuum, режим меняется только полным VACUUM:
+        файл переписывается целиком, и на это время запросы к базе ждут.
+        Поэтому метод вызывается при запуске (create_tables), а не из фоновой задачи.
+
+        Возвращает:
+            bool: True, если база была переведена в режим INCREMENTAL этим вызовом.
+
+        Логирует начало и окончание перевода на уровне INFO.
         """
         if self._connection is None:
             await self.connect()
         assert self._connection is not None
 
-        await self._connection.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                text TEXT NOT NULL,
-                user_id INTEGER NOT NULL,
-                created_at TEXT NOT NULL
-            );
-            """
+        async with self._write_lock:
+            if await self._read_pragma("auto_vacuum") == 2:
+                return False
+
+            self._logger.info("Перевод базы данных в режим auto_vacuum = INCREMENTAL (VACUUM)")
+            started = time.perf_counter()
+            await self._connection.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+            await self._connection.execute("VACUUM;")
+            self._observe_query("vacuum", started, 0)
+        self._logger.info(
+            "База данных переведена в режим auto_vacuum = INCREMENTAL за %.1f с",
+            time.perf_counter() - started,
         )
-        await self._connection.commit()
+        return True
+
+    async def get_schema_version(self) -> int:
+        """
+        Возвращает текущую версию схемы из PRAGMA user_version.
+
+        Возвращает:
+            int: номер последней примененной миграции (0 для новой базы).
+        """
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        cursor = await self._connection.execute("PRAGMA user_version;")
+        row = await cursor.fetchone()
+        await cursor.close()
+        return int(row[0]) if row else 0
+
+    async def migrate(self) -> None:
+        """
+        Применяет миграции из database.migrations, номер которых больше
+        текущей версии схемы. Существующий файл базы обновляется на месте.
+
+        Каждая миграция выполняется в отдельной транзакции вместе
+        с обновлением PRAGMA user_version. Если схема уже актуальна,
+        проверка ограничивается чтением PRAGMA user_version.
+
+        Логирует каждую примененную миграцию на уровне INFO.
+        """
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        current_version = await self.get_schema_version()
+        if current_version >= SCHEMA_VERSION:
+            self._logger.info("Схема базы данных актуальна (версия %s)", current_version)
+            return
 
-        self._logger.info("Таблица tasks проверена/создана")
+        for version, description, statements in MIGRATIONS:
+            if version <= current_version:
+                continue
 
-    async def add_task(self, text: str, user_id: int) -> int:
+            # DDL-инструкции не открывают транзакцию неявно, поэтому начинаем ее явно
+            await self._connection.execute("BEGIN;")
+            try:
+                for statement in statements:
+                    await self._connection.execute(statement)
+                await self._connection.execute(f"PRAGMA user_version = {version};")
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
+
+            current_version = version
+            self._logger.info("Применена миграция %s: %s", version, description)
+
+        self._logger.info("Схема базы данных актуальна (версия %s)", SCHEMA_VERSION)
+
+    async def add_task(self, text: str, user_id: int, due_at: Optional[str] = None) -> int:
         """
         Добавляет новую задачу в базу данных.
 
         Параметры:
             text (str): текст задачи.
             user_id (int): ID пользователя Telegram.
+            due_at (Optional[str]): срок задачи в формате format_created_at
+                (None — без срока и напоминания).
 
         Возвращает:
             int: ID добавленной задачи.
 
+        В режиме пакетной записи запрос объединяется с конкурентными
+        вызовами в одну транзакцию; ID задачи возвращается каждому вызывающему.
+
         Логирует добавление задачи на уровне INFO.
         """
         if self._connection is None:
@@ -94,22 +415,113 @@ class DatabaseManager:
             raise ValueError("Текст задачи не может быть пустым")
 
         clean_text = text.strip()
-        created_at = datetime.now().isoformat()
+        created_at = format_created_at()
 
-        cursor = await self._connection.execute(
-            "INSERT INTO tasks (text, user_id, created_at) VALUES (?, ?, ?);",
-            (clean_text, user_id, created_at),
-        )
-        await self._connection.commit()
+        sql = "INSERT INTO tasks (text, user_id, created_at, due_at) VALUES (?, ?, ?, ?);"
+        params = (clean_text, user_id, created_at, due_at)
 
-        task_id = cursor.lastrowid
-        await cursor.close()
+        started = time.perf_counter()
+        if self._write_batcher is not None:
+            task_id = await self._write_batcher.submit(sql, params)
+        else:
+            async with self._write_lock:
+                cursor = await self._connection.execute(sql, params)
+                await self._connection.commit()
 
+                task_id = cursor.lastrowid
+                await cursor.close()
+        self._observe_query("add_task", started, 1)
+
+        self._invalidate_user(user_id)
+        if due_at is not None and self._due_hook is not None:
+            self._due_hook(task_id, user_id, due_at)
         self._logger.info(
             "Задача ID %s добавлена для пользователя %s", task_id, user_id
         )
         return task_id
 
+    async def add_tasks_bulk(
+        self,
+        tasks: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]],
+        user_id: int,
+        chunk_size: int = 1000,
+        progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> int:
+        """
+        Добавляет задачи пользователя порциями: каждая порция вставляется
+        одним executemany в отдельной транзакции.
+
+        Источник задач читается лениво, поэтому в памяти одновременно
+        находится не более chunk_size строк. Между порциями блокировка
+        записи освобождается, и конкурентные add_task не ждут окончания
+        всего импорта. Задачи с пустым текстом пропускаются.
+
+        Параметры:
+            tasks (Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]]):
+                задачи (текст, дата создания, статус, категория); дата None заменяется
+                текущим временем, статус None или неизвестный — статусом по умолчанию,
+                категория None — пустой строкой.
+            user_id (int): ID пользователя Telegram.
+            chunk_size (int): количество строк в одной транзакции.
+            progress (Optional[Callable[[int], Awaitable[None]]]): вызывается после
+                каждой порции с общим числом добавленных задач.
+
+        Возвращает:
+            int: количество добавленных задач.
+
+        Исключения:
+            ValueError: если chunk_size меньше 1.
+
+        Логирует итог импорта на уровне INFO.
+        """
+        if chunk_size < 1:
+            raise ValueError("Размер порции должен быть положительным")
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        total = 0
+        iterator = iter(tasks)
+        while True:
+            created_at = format_created_at()
+            chunk = []
+            for text, task_created_at, status, category in iterator:
+                clean_text = text.strip()
+                if clean_text:
+                    if status not in TASK_STATUSES:
+                        status = DEFAULT_TASK_STATUS
+                    chunk.append(
+                        (clean_text, user_id, task_created_at or created_at, status, category or "")
+                    )
+                    if len(chunk) >= chunk_size:
+                        break
+            if not chunk:
+                break
+
+            started = time.perf_counter()
+            async with self._write_lock:
+                try:
+                    await self._connection.executemany(
+                        "INSERT INTO tasks (text, user_id, created_at, status, category) "
+                        "VALUES (?, ?, ?, ?, ?);",
+                        chunk,
+                    )
+                    await self._connection.commit()
+                except Exception:
+                    await self._connection.rollback()
+                    raise
+            self._observe_query("add_tasks_bulk", started, len(chunk))
+
+            total += len(chunk)
+            self._invalidate_user(user_id)
+            if progress is not None:
+                await progress(total)
+
+        self._logger.info(
+            "Импортировано %s задач для пользователя %s", total, user_id
+        )
+        return total
+
     async def get_user_tasks(self, user_id: int) -> List[Task]:
         """
         Получает все задачи пользователя из базы данных.
@@ -118,46 +530,967 @@ class DatabaseManager:
             user_id (int): ID пользователя Telegram.
 
         Возвращает:
-            list[Task]: Список объектов Task.
+            list[Task]: Список объектов Task. Каждый вызов получает свой список,
+            но сами объекты Task общие с кэшем и объединенными чтениями,
+            поэтому их нельзя изменять.
+
+        При включенном кэше повторный запрос не обращается к базе данных.
+        При объединении чтений конкурентные вызовы для одного пользователя
+        выполняют один запрос, а при пакетном чтении запросы разных
+        пользователей объединяются в один WHERE user_id IN (...).
+
+        Логирует количество найденных задач на уровне INFO.
+        """
+        cache_key = ("tasks",)
+        if self._cache is not None:
+            cached = self._cache.get(user_id, cache_key)
+            if cached is not None:
+                return list(cached)
+            snapshot = self._cache.snapshot(user_id)
+
+        if self._coalescer is not None:
+            tasks = await self._coalescer.load(
+                user_id, cache_key, lambda: self._load_user_tasks(user_id)
+            )
+        else:
+            tasks = await self._load_user_tasks(user_id)
+
+        if self._cache is not None:
+            self._cache.set(user_id, cache_key, tasks, snapshot)
+
+        self._logger.info(
+            "Получено %s задач для пользователя %s", len(tasks), user_id
+        )
+        # Список из кэша или общего чтения отдается вызывающему копией
+        return list(tasks)
+
+    async def _load_user_tasks(self, user_id: int) -> List[Task]:
+        """Читает все задачи пользователя одним запросом или в составе пакета."""
+        if self._read_batcher is not None:
+            return await self._read_batcher.submit(user_id)
+
+        started = time.perf_counter()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks "
+                "WHERE user_id = ? ORDER BY created_at ASC, id ASC;",
+                (user_id,),
+            )
+            # Кортежи вместо aiosqlite.Row: столбцы читаются по позиции
+            cursor.row_factory = None
+            rows = await cursor.fetchall()
+            await cursor.close()
+        self._observe_query("get_user_tasks", started, len(rows))
+        return [Task.from_row(row) for row in rows]
+
+    async def _load_users_tasks(self, user_ids: List[int]) -> Dict[int, List[Task]]:
+        """
+        Читает задачи нескольких пользователей одним запросом WHERE user_id IN (...)
+        по индексу (user_id, created_at, id) и раскладывает их по пользователям.
+        """
+        placeholders = ", ".join("?" * len(user_ids))
+        started = time.perf_counter()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE user_id IN ({placeholders}) "
+                "ORDER BY user_id, created_at ASC, id ASC;",
+                user_ids,
+            )
+            cursor.row_factory = None
+            rows = await cursor.fetchall()
+            await cursor.close()
+        self._observe_query("get_user_tasks_batch", started, len(rows))
+
+        tasks: Dict[int, List[Task]] = {user_id: [] for user_id in user_ids}
+        for row in rows:
+            tasks[row[2]].append(Task.from_row(row))
+        return tasks
+
+    async def _fetch_task_rows(self, name: str, query: str, params: tuple) -> List[TaskRow]:
+        """Выполняет запрос чтения задач и возвращает строки TaskRow."""
+        started = time.perf_counter()
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            cursor.row_factory = None
+            rows = await cursor.fetchall()
+            await cursor.close()
+        self._observe_query(name, started, len(rows))
+        return rows
+
+    async def get_user_task_rows_page(
+        self,
+        user_id: int,
+        limit: int = 10,
+        after: Optional[Tuple[str, int]] = None,
+        before: Optional[Tuple[str, int]] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[TaskRow], bool]:
+        """
+        Получает страницу задач пользователя в виде кортежей TaskRow
+        с keyset-пагинацией, не создавая объекты Task.
+
+        Страница выбирается по индексу (user_id, created_at, id) относительно
+        ключа (created_at, id) соседней страницы, поэтому стоимость запроса
+        не зависит от номера страницы. Фильтр по статусу использует индекс
+        (user_id, status, created_at, id) и тоже выполняется в SQLite.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            limit (int): максимальное количество задач на странице.
+            after (Optional[Tuple[str, int]]): ключ задачи, после которой начинается страница.
+            before (Optional[Tuple[str, int]]): ключ задачи, перед которой заканчивается страница.
+            status (Optional[str]): код статуса для фильтрации или None для всех задач.
+
+        Возвращает:
+            Tuple[list[TaskRow], bool]: строки страницы в порядке создания и признак
+            наличия задач дальше в направлении чтения.
+
+        При включенном кэше повторный запрос страницы не обращается к базе данных,
+        а при объединении чтений конкурентные запросы одной страницы выполняют
+        один запрос.
+
+        Логирует количество задач на странице на уровне INFO.
+        """
+        cache_key = ("page", limit, after, before, status)
+        if self._cache is not None:
+            cached = self._cache.get(user_id, cache_key)
+            if cached is not None:
+                return cached
+            snapshot = self._cache.snapshot(user_id)
+
+        owner = "user_id = ?"
+        owner_params: tuple = (user_id,)
+        if status is not None:
+            owner = "user_id = ? AND status = ?"
+            owner_params = (user_id, status)
+
+        params: tuple
+        if before is not None:
+            query = (
+                f"SELECT {TASK_COLUMNS} FROM tasks "
+                f"WHERE {owner} AND (created_at, id) < (?, ?) "
+                "ORDER BY created_at DESC, id DESC LIMIT ?;"
+            )
+            params = (*owner_params, before[0], before[1], limit + 1)
+        elif after is not None:
+            query = (
+                f"SELECT {TASK_COLUMNS} FROM tasks "
+                f"WHERE {owner} AND (created_at, id) > (?, ?) "
+                "ORDER BY created_at ASC, id ASC LIMIT ?;"
+            )
+            params = (*owner_params, after[0], after[1], limit + 1)
+        else:
+            query = (
+                f"SELECT {TASK_COLUMNS} FROM tasks "
+                f"WHERE {owner} ORDER BY created_at ASC, id ASC LIMIT ?;"
+            )
+            params = (*owner_params, limit + 1)
+
+        if self._coalescer is not None:
+            rows = await self._coalescer.load(
+                user_id,
+                cache_key,
+                lambda: self._fetch_task_rows("get_user_task_rows_page", query, params),
+            )
+        else:
+            rows = await self._fetch_task_rows("get_user_task_rows_page", query, params)
+
+        # Лишняя строка показывает, есть ли задачи за пределами страницы
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if before is not None:
+            rows.reverse()
+
+        if self._cache is not None:
+            self._cache.set(user_id, cache_key, (rows, has_more), snapshot)
+
+        self._logger.info(
+            "Получена страница из %s задач для пользователя %s", len(rows), user_id
+        )
+        return rows, has_more
+
+    async def get_user_tasks_page(
+        self,
+        user_id: int,
+        limit: int = 10,
+        after: Optional[Tuple[str, int]] = None,
+        before: Optional[Tuple[str, int]] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[Task], bool]:
+        """
+        Получает страницу задач пользователя в виде объектов Task.
+        Параметры и порядок задач совпадают с get_user_task_rows_page.
+
+        Возвращает:
+            Tuple[list[Task], bool]: задачи страницы и признак наличия задач
+            дальше в направлении чтения.
+        """
+        rows, has_more = await self.get_user_task_rows_page(
+            user_id, limit=limit, after=after, before=before, status=status
+        )
+        return [Task.from_row(row) for row in rows], has_more
+
+    async def search_user_task_rows(
+        self,
+        user_id: int,
+        query: str,
+        limit: int = 10,
+        offset: int = 0,
+    ) -> Tuple[List[TaskRow], bool]:
+        """
+        Ищет задачи пользователя по словам запроса в полнотекстовом индексе
+        tasks_fts и возвращает страницу результатов, упорядоченных по
+        релевантности (bm25), при равной релевантности — сначала новые.
+
+        Поиск ограничен задачами пользователя внутри индекса (токен owner),
+        поэтому его стоимость зависит от числа совпадений, а не от размера
+        таблицы tasks.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            query (str): текст поискового запроса.
+            limit (int): максимальное количество задач на странице.
+            offset (int): количество пропускаемых результатов.
+
+        Возвращает:
+            Tuple[list[TaskRow], bool]: строки страницы и признак наличия
+            следующих результатов. Если в запросе нет слов, возвращается пустая страница.
+
+        При включенном кэше повторный запрос страницы не обращается к базе данных.
 
         Логирует количество найденных задач на уровне INFO.
         """
+        match = build_search_query(query)
+        if match is None:
+            return [], False
+
+        cache_key = ("search", match, limit, offset)
+        if self._cache is not None:
+            cached = self._cache.get(user_id, cache_key)
+            if cached is not None:
+                return cached
+            snapshot = self._cache.snapshot(user_id)
+
+        started = time.perf_counter()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT tasks.id, tasks.text, tasks.user_id, tasks.created_at, "
+                "tasks.status, tasks.category "
+                "FROM tasks_fts JOIN tasks ON tasks.id = tasks_fts.rowid "
+                "WHERE tasks_fts MATCH ? "
+                "ORDER BY tasks_fts.rank, tasks.id DESC LIMIT ? OFFSET ?;",
+                (f"owner : u{user_id} AND {match}", limit + 1, offset),
+            )
+            cursor.row_factory = None
+            rows = await cursor.fetchall()
+            await cursor.close()
+        self._observe_query("search_user_task_rows", started, len(rows))
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        if self._cache is not None:
+            self._cache.set(user_id, cache_key, (rows, has_more), snapshot)
+
+        self._logger.info(
+            "Поиск для пользователя %s: найдено %s задач на странице", user_id, len(rows)
+        )
+        return rows, has_more
+
+    async def get_task_row(self, task_id: int, user_id: int) -> Optional[TaskRow]:
+        """
+        Получает задачу пользователя по ID.
+
+        Параметры:
+            task_id (int): ID задачи.
+            user_id (int): ID пользователя Telegram; чужие задачи не возвращаются.
+
+        Возвращает:
+            Optional[TaskRow]: строка задачи или None, если задача не найдена.
+        """
+        cache_key = ("task", task_id)
+        if self._cache is not None:
+            cached = self._cache.get(user_id, cache_key)
+            if cached is not None:
+                return cached
+            snapshot = self._cache.snapshot(user_id)
+
+        started = time.perf_counter()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE id = ? AND user_id = ?;",
+                (task_id, user_id),
+            )
+            cursor.row_factory = None
+            row = await cursor.fetchone()
+            await cursor.close()
+        self._observe_query("get_task_row", started, 0 if row is None else 1)
+
+        if row is not None and self._cache is not None:
+            self._cache.set(user_id, cache_key, row, snapshot)
+        return row
+
+    async def set_task_status(self, task_id: int, user_id: int, status: str) -> bool:
+        """
+        Изменяет статус задачи пользователя одним запросом UPDATE.
+
+        Параметры:
+            task_id (int): ID задачи.
+            user_id (int): ID пользователя Telegram; чужие задачи не изменяются.
+            status (str): код статуса из TASK_STATUSES.
+
+        Возвращает:
+            bool: True, если задача найдена и обновлена.
+
+        Исключения:
+            ValueError: если статус неизвестен.
+
+        Логирует изменение статуса на уровне INFO.
+        """
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Неизвестный статус задачи: {status}")
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            cursor = await self._connection.execute(
+                "UPDATE tasks SET status = ? WHERE id = ? AND user_id = ?;",
+                (status, task_id, user_id),
+            )
+            await self._connection.commit()
+            updated = cursor.rowcount > 0
+            await cursor.close()
+        self._observe_query("set_task_status", started, int(updated))
+
+        if updated:
+            self._invalidate_user(user_id)
+            self._logger.info(
+                "Статус задачи ID %s пользователя %s изменен на %s", task_id, user_id, status
+            )
+        return updated
+
+    async def set_task_due_at(self, task_id: int, user_id: int, due_at: Optional[str]) -> bool:
+        """
+        Изменяет срок задачи пользователя одним запросом UPDATE.
+        Напоминание о задаче снова становится ожидающим.
+
+        Параметры:
+            task_id (int): ID задачи.
+            user_id (int): ID пользователя Telegram; чужие задачи не изменяются.
+            due_at (Optional[str]): новый срок в формате format_created_at
+                или None, чтобы убрать срок и напоминание.
+
+        Возвращает:
+            bool: True, если задача найдена и обновлена.
+
+        Логирует изменение срока на уровне INFO.
+        """
         if self._connection is None:
             await self.connect()
         assert self._connection is not None
 
-        cursor = await self._connection.execute(
-            "SELECT id, text, user_id, created_at FROM tasks "
-            "WHERE user_id = ? ORDER BY datetime(created_at) ASC;",
-            (user_id,),
+        started = time.perf_counter()
+        async with self._write_lock:
+            cursor = await self._connection.execute(
+                "UPDATE tasks SET due_at = ?, reminder_sent = 0 WHERE id = ? AND user_id = ?;",
+                (due_at, task_id, user_id),
+            )
+            await self._connection.commit()
+            updated = cursor.rowcount > 0
+            await cursor.close()
+        self._observe_query("set_task_due_at", started, int(updated))
+
+        if updated:
+            self._invalidate_user(user_id)
+            if self._due_hook is not None:
+                self._due_hook(task_id, user_id, due_at)
+            self._logger.info(
+                "Срок задачи ID %s пользователя %s изменен на %s", task_id, user_id, due_at
+            )
+        return updated
+
+    async def get_pending_reminders(
+        self, limit: int, after: Optional[Tuple[str, int]] = None
+    ) -> List[ReminderRow]:
+        """
+        Возвращает ближайшие неотправленные напоминания по частичному индексу idx_tasks_due.
+
+        Параметры:
+            limit (int): максимальное количество напоминаний.
+            after (Optional[Tuple[str, int]]): ключ (due_at, task_id) последнего
+                прочитанного напоминания; чтение продолжается после него.
+
+        Возвращает:
+            List[ReminderRow]: кортежи (due_at, task_id, user_id) в порядке срока.
+        """
+        sql = "SELECT due_at, id, user_id FROM tasks WHERE due_at IS NOT NULL AND reminder_sent = 0"
+        params: Tuple[Any, ...] = (limit,)
+        if after is not None:
+            # Постраничное чтение по ключу вместо OFFSET: окно начинается в индексе сразу
+            sql += " AND (due_at, id) > (?, ?)"
+            params = (after[0], after[1], limit)
+        started = time.perf_counter()
+        async with self._reader() as connection:
+            cursor = await connection.execute(sql + " ORDER BY due_at, id LIMIT ?;", params)
+            cursor.row_factory = None
+            rows = await cursor.fetchall()
+            await cursor.close()
+        self._observe_query("get_pending_reminders", started, len(rows))
+        return rows
+
+    async def claim_reminder(self, task_id: int, due_at: str) -> Optional[Tuple[int, str, str]]:
+        """
+        Отмечает напоминание отправленным, если срок задачи не изменился.
+
+        Отметка выполняется одним запросом UPDATE с условием по сроку, поэтому
+        напоминание о задаче, срок которой изменили или которую удалили,
+        не отправляется, а при общей базе у нескольких процессов его
+        получает только один из них.
+
+        Параметры:
+            task_id (int): ID задачи.
+            due_at (str): срок, с которым напоминание попало в планировщик.
+
+        Возвращает:
+            Optional[Tuple[int, str, str]]: (user_id, текст, статус) задачи
+            или None, если напоминание уже неактуально.
+        """
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            cursor = await self._connection.execute(
+                "UPDATE tasks SET reminder_sent = 1 "
+                "WHERE id = ? AND due_at = ? AND reminder_sent = 0;",
+                (task_id, due_at),
+            )
+            await self._connection.commit()
+            claimed = cursor.rowcount > 0
+            await cursor.close()
+
+            row = None
+            if claimed:
+                cursor = await self._connection.execute(
+                    "SELECT user_id, text, status FROM tasks WHERE id = ?;", (task_id,)
+                )
+                cursor.row_factory = None
+                row = await cursor.fetchone()
+                await cursor.close()
+        self._observe_query("claim_reminder", started, int(claimed))
+        return row
+
+    async def update_task_text(self, task_id: int, user_id: int, text: str) -> bool:
+        """
+        Изменяет текст задачи пользователя одним запросом UPDATE.
+
+        Полнотекстовый индекс обновляется триггером tasks_fts_update,
+        сохраненная выгрузка CSV сбрасывается триггером csv_exports_invalidate.
+
+        Параметры:
+            task_id (int): ID задачи.
+            user_id (int): ID пользователя Telegram; чужие задачи не изменяются.
+            text (str): новый текст задачи.
+
+        Возвращает:
+            bool: True, если задача найдена и обновлена.
+
+        Исключения:
+            ValueError: если новый текст пустой.
+
+        Логирует изменение текста на уровне INFO.
+        """
+        if not text or len(text.strip()) == 0:
+            raise ValueError("Текст задачи не может быть пустым")
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            cursor = await self._connection.execute(
+                "UPDATE tasks SET text = ? WHERE id = ? AND user_id = ?;",
+                (text.strip(), task_id, user_id),
+            )
+            await self._connection.commit()
+            updated = cursor.rowcount > 0
+            await cursor.close()
+        self._observe_query("update_task_text", started, int(updated))
+
+        if updated:
+            self._invalidate_user(user_id)
+            self._logger.info("Текст задачи ID %s пользователя %s изменен", task_id, user_id)
+        return updated
+
+    async def delete_task(self, task_id: int, user_id: int) -> bool:
+        """
+        Удаляет задачу пользователя одним запросом DELETE.
+
+        Параметры:
+            task_id (int): ID задачи.
+            user_id (int): ID пользователя Telegram; чужие задачи не удаляются.
+
+        Возвращает:
+            bool: True, если задача найдена и удалена.
+
+        Логирует удаление задачи на уровне INFO.
+        """
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            cursor = await self._connection.execute(
+                "DELETE FROM tasks WHERE id = ? AND user_id = ?;", (task_id, user_id)
+            )
+            await self._connection.commit()
+            deleted = cursor.rowcount > 0
+            await cursor.close()
+        self._observe_query("delete_task", started, int(deleted))
+
+        if deleted:
+            self._invalidate_user(user_id)
+            self._logger.info("Задача ID %s пользователя %s удалена", task_id, user_id)
+        return deleted
+
+    async def delete_user_tasks_by_status(self, user_id: int, status: str) -> int:
+        """
+        Удаляет все задачи пользователя с указанным статусом одним запросом DELETE.
+        Задачи находятся по индексу (user_id, status, created_at, id).
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            status (str): код статуса из TASK_STATUSES (например, "done").
+
+        Возвращает:
+            int: количество удаленных задач.
+
+        Исключения:
+            ValueError: если статус неизвестен.
+
+        Логирует количество удаленных задач на уровне INFO.
+        """
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Неизвестный статус задачи: {status}")
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            cursor = await self._connection.execute(
+                "DELETE FROM tasks WHERE user_id = ? AND status = ?;", (user_id, status)
+            )
+            await self._connection.commit()
+            deleted = max(cursor.rowcount, 0)
+            await cursor.close()
+        self._observe_query("delete_user_tasks_by_status", started, deleted)
+
+        if deleted:
+            self._invalidate_user(user_id)
+            self._logger.info(
+                "Удалено задач пользователя %s со статусом %s: %s", user_id, status, deleted
+            )
+        return deleted
+
+    async def iter_user_task_rows(
+        self, user_id: int, chunk_size: int = 500, after_id: Optional[int] = None
+    ) -> AsyncIterator[List[TaskRow]]:
+        """
+        Постранично читает задачи пользователя через курсор базы данных
+        в виде кортежей TaskRow, не создавая объекты Task.
+        В памяти одновременно находится не более chunk_size строк.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            chunk_size (int): количество строк в одной порции.
+            after_id (Optional[int]): если задан, читаются только задачи с большим ID
+                (добавленные после выгрузки с этим ID).
+
+        Возвращает:
+            AsyncIterator[list[TaskRow]]: порции строк в порядке создания.
+
+        Логирует общее количество прочитанных задач на уровне INFO.
+        """
+        total = 0
+        # Время включает обработку порций потребителем между чтениями
+        started = time.perf_counter()
+        if after_id is None:
+            query = (
+                f"SELECT {TASK_COLUMNS} FROM tasks "
+                "WHERE user_id = ? ORDER BY created_at ASC, id ASC;"
+            )
+            params: Tuple[int, ...] = (user_id,)
+        else:
+            query = (
+                f"SELECT {TASK_COLUMNS} FROM tasks "
+                "WHERE user_id = ? AND id > ? ORDER BY created_at ASC, id ASC;"
+            )
+            params = (user_id, after_id)
+
+        async with self._reader() as connection:
+            cursor = await connection.execute(query, params)
+            cursor.row_factory = None
+            try:
+                while True:
+                    rows = await cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    total += len(rows)
+                    yield rows
+            finally:
+                await cursor.close()
+                self._observe_query("iter_user_task_rows", started, total)
+
+        self._logger.info(
+            "Потоково прочитано %s задач для пользователя %s", total, user_id
         )
-        rows = await cursor.fetchall()
-        await cursor.close()
 
-        tasks = [
-            Task(
-                task_id=row["id"],
-                text=row["text"],
-                user_id=row["user_id"],
-                created_at=row["created_at"],
+    async def iter_user_tasks(
+        self, user_id: int, chunk_size: int = 500
+    ) -> AsyncIterator[List[Task]]:
+        """
+        Постранично читает задачи пользователя в виде объектов Task.
+        В памяти одновременно находится не более chunk_size задач.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            chunk_size (int): количество задач в одной порции.
+
+        Возвращает:
+            AsyncIterator[list[Task]]: порции задач в порядке создания.
+        """
+        async for rows in self.iter_user_task_rows(user_id, chunk_size):
+            yield [Task.from_row(row) for row in rows]
+
+    async def get_csv_export(self, user_id: int) -> Optional[CsvExportRow]:
+        """
+        Получает запись о последней выгрузке CSV пользователя.
+
+        Сохраненный file_id сверяется с текущими задачами по количеству
+        и максимальному ID (запрос только по индексу): добавление и удаление
+        задач меняют хотя бы одно из значений, изменение задачи сбрасывает
+        file_id триггером. Проверенная запись кэшируется до следующего
+        изменения задач, поэтому повторная выгрузка без изменений
+        не обращается к базе данных.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+
+        Возвращает:
+            Optional[CsvExportRow]: (file_id, max_task_id, tasks_count, exported_task_id)
+            или None, если пользователь еще не выгружал задачи. Если задачи
+            изменились после выгрузки, file_id равен None.
+        """
+        cache_key = ("csv_export",)
+        if self._cache is not None:
+            cached = self._cache.get(user_id, cache_key)
+            if cached is not None:
+                return cached
+            snapshot = self._cache.snapshot(user_id)
+
+        started = time.perf_counter()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT file_id, max_task_id, tasks_count, exported_task_id, "
+                "(SELECT COUNT(*) FROM tasks WHERE user_id = e.user_id), "
+                "(SELECT COALESCE(MAX(id), 0) FROM tasks WHERE user_id = e.user_id) "
+                "FROM csv_exports AS e WHERE user_id = ?;",
+                (user_id,),
+            )
+            row = await cursor.fetchone()
+            await cursor.close()
+        self._observe_query("get_csv_export", started, 0 if row is None else 1)
+
+        if row is None:
+            return None
+
+        file_id, max_task_id, tasks_count, exported_task_id, current_count, current_max = row
+        if (current_count, current_max) != (tasks_count, max_task_id):
+            file_id = None
+        record: CsvExportRow = (file_id, max_task_id, tasks_count, exported_task_id)
+
+        if self._cache is not None:
+            self._cache.set(user_id, cache_key, record, snapshot)
+        return record
+
+    async def save_csv_export(
+        self,
+        user_id: int,
+        file_id: Optional[str],
+        max_task_id: int,
+        tasks_count: Optional[int] = None,
+    ) -> None:
+        """
+        Сохраняет результат выгрузки CSV пользователя.
+
+        Полная выгрузка (tasks_count задан) запоминает file_id отправленного
+        документа для повторной отправки без формирования файла. Выгрузка
+        новых задач (tasks_count равен None) только сдвигает отметку
+        exported_task_id и не меняет сохраненный файл.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            file_id (Optional[str]): file_id документа в Telegram.
+            max_task_id (int): максимальный ID задачи в выгрузке.
+            tasks_count (Optional[int]): количество задач в полной выгрузке.
+        """
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        if tasks_count is None:
+            query = (
+                "INSERT INTO csv_exports (user_id, exported_task_id, updated_at) "
+                "VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET "
+                "exported_task_id = max(exported_task_id, excluded.exported_task_id), "
+                "updated_at = excluded.updated_at;"
+            )
+            params: tuple = (user_id, max_task_id, format_created_at())
+        else:
+            query = (
+                "INSERT INTO csv_exports "
+                "(user_id, file_id, max_task_id, tasks_count, exported_task_id, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET "
+                "file_id = excluded.file_id, max_task_id = excluded.max_task_id, "
+                "tasks_count = excluded.tasks_count, "
+                "exported_task_id = max(exported_task_id, excluded.exported_task_id), "
+                "updated_at = excluded.updated_at;"
+            )
+            params = (
+                user_id, file_id, max_task_id, tasks_count, max_task_id, format_created_at()
             )
-            for row in rows
-        ]
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            try:
+                await self._connection.execute(query, params)
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
+        self._observe_query("save_csv_export", started, 1)
+
+        # Страницы задач остаются в кэше, сбрасывается только запись о выгрузке
+        if self._cache is not None:
+            self._cache.discard(user_id, ("csv_export",))
 
         self._logger.info(
-            "Получено %s задач для пользователя %s", len(tasks), user_id
+            "Сохранена выгрузка CSV пользователя %s (максимальный ID %s)", user_id, max_task_id
         )
-        return tasks
+
+    async def _read_pragma(self, name: str) -> int:
+        """Возвращает целочисленное значение PRAGMA на соединении для записи."""
+        assert self._connection is not None
+        cursor = await self._connection.execute(f"PRAGMA {name};")
+        row = await cursor.fetchone()
+        await cursor.close()
+        return int(row[0]) if row else 0
+
+    async def incremental_vacuum(self, max_pages: int = 0) -> Optional[int]:
+        """
+        Возвращает файлу базы данных страницы, освободившиеся после удаления задач.
+
+        В режиме auto_vacuum = INCREMENTAL выполняет PRAGMA incremental_vacuum
+        не более чем для max_pages страниц. Полный VACUUM здесь не выполняется:
+        база, созданная без auto_vacuum, пропускается, пока ее не переведет
+        в этот режим enable_incremental_vacuum.
+
+        Параметры:
+            max_pages (int): максимум освобождаемых страниц (0 — все свободные).
+
+        Возвращает:
+            Optional[int]: количество страниц, возвращенных файлу, или None,
+            если запуск отложен: без пула на общем соединении открыт курсор
+            чтения (например, идет выгрузка /list_csv).
+
+        Логирует результат на уровне INFO, если страницы были освобождены.
+        """
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            free_pages = await self._read_pragma("freelist_count")
+            if free_pages == 0:
+                self._observe_query("incremental_vacuum", started, 0)
+                return 0
+
+            if await self._read_pragma("auto_vacuum") != 2:
+                self._logger.warning(
+                    "incremental_vacuum пропущен: база не в режиме auto_vacuum = INCREMENTAL"
+                )
+                self._observe_query("incremental_vacuum", started, 0)
+                return 0
+
+            # Проверка и постановка инструкции в очередь соединения идут без
+            # переключения задач, поэтому новое чтение начнется уже после нее
+            if self._pool is None and self._open_readers:
+                self._observe_query("incremental_vacuum", started, 0)
+                return None
+
+            # Каждый шаг инструкции освобождает одну страницу; execute()
+            # делает только первый шаг, executescript выполняет ее до конца
+            await self._connection.executescript(
+                f"PRAGMA incremental_vacuum({max(int(max_pages), 0)});"
+            )
+            await self._connection.commit()
+            freed = free_pages - await self._read_pragma("freelist_count")
+
+            # В режиме WAL файл базы уменьшается при контрольной точке
+            cursor = await self._connection.execute("PRAGMA wal_checkpoint(PASSIVE);")
+            await cursor.fetchall()
+            await cursor.close()
+        self._observe_query("incremental_vacuum", started, freed)
+
+        if freed:
+            self._logger.info("Файлу базы данных возвращено страниц: %s", freed)
+        return freed
+
+    async def _vacuum_periodically(self) -> None:
+        """
+        Периодически выполняет incremental_vacuum, пока соединение открыто.
+        Отложенный из-за открытого чтения запуск повторяется через VACUUM_RETRY_DELAY.
+        """
+        delay = self._vacuum_interval
+        while True:
+            await asyncio.sleep(delay)
+            delay = self._vacuum_interval
+            try:
+                freed = await self.incremental_vacuum(self._vacuum_pages)
+            except Exception as error:  # pylint: disable=broad-except
+                self._logger.exception("Ошибка incremental_vacuum: %s", error)
+                continue
+            if freed is None:
+                delay = min(VACUUM_RETRY_DELAY, self._vacuum_interval)
+                self._logger.debug(
+                    "incremental_vacuum отложен на %s с: открыт курсор чтения", delay
+                )
+
+    async def get_fsm_record(self, storage_key: str) -> Optional[Tuple[Optional[str], str]]:
+        """
+        Получает сохраненное состояние FSM по ключу хранилища.
+
+        Параметры:
+            storage_key (str): строковый ключ записи FSM.
+
+        Возвращает:
+            Optional[Tuple[Optional[str], str]]: состояние и данные в формате JSON
+            или None, если запись отсутствует.
+        """
+        started = time.perf_counter()
+        async with self._reader() as connection:
+            cursor = await connection.execute(
+                "SELECT state, data FROM fsm_states WHERE storage_key = ?;",
+                (storage_key,),
+            )
+            row = await cursor.fetchone()
+            await cursor.close()
+        self._observe_query("get_fsm_record", started, 0 if row is None else 1)
+
+        if row is None:
+            return None
+        return row[0], row[1]
+
+    async def save_fsm_records(
+        self, records: Iterable[Tuple[str, Optional[str], Optional[str]]]
+    ) -> int:
+        """
+        Сохраняет пакет записей FSM одной транзакцией.
+
+        Параметры:
+            records (Iterable[Tuple[str, Optional[str], Optional[str]]]): тройки
+                (ключ, состояние, данные в JSON). Запись без состояния и данных
+                (данные None) удаляется из таблицы.
+
+        Возвращает:
+            int: количество обработанных записей.
+        """
+        if self._connection is None:
+            await self.connect()
+        assert self._connection is not None
+
+        updated_at = format_created_at()
+        upserts = []
+        deletions = []
+        for storage_key, state, data in records:
+            if state is None and data is None:
+                deletions.append((storage_key,))
+            else:
+                upserts.append((storage_key, state, data or "{}", updated_at))
+
+        if not upserts and not deletions:
+            return 0
+
+        started = time.perf_counter()
+        async with self._write_lock:
+            try:
+                if upserts:
+                    await self._connection.executemany(
+                        "INSERT INTO fsm_states (storage_key, state, data, updated_at) "
+                        "VALUES (?, ?, ?, ?) "
+                        "ON CONFLICT (storage_key) DO UPDATE SET "
+                        "state = excluded.state, data = excluded.data, "
+                        "updated_at = excluded.updated_at;",
+                        upserts,
+                    )
+                if deletions:
+                    await self._connection.executemany(
+                        "DELETE FROM fsm_states WHERE storage_key = ?;", deletions
+                    )
+                await self._connection.commit()
+            except Exception:
+                await self._connection.rollback()
+                raise
+        self._observe_query("save_fsm_records", started, len(upserts) + len(deletions))
+
+        self._logger.debug(
+            "Сохранено записей FSM: %s, удалено: %s", len(upserts), len(deletions)
+        )
+        return len(upserts) + len(deletions)
 
     async def close(self) -> None:
         """
         Закрывает соединение с базой данных.
+        Перед закрытием сбрасывает накопленный пакет записей.
         Логирует закрытие соединения на уровне INFO.
         """
         if self._connection is None:
             return
 
-        await self._connection.close()
+        if self._vacuum_task is not None:
+            self._vacuum_task.cancel()
+            try:
+                await self._vacuum_task
+            except asyncio.CancelledError:
+                pass
+            self._vacuum_task = None
+
+        if self._write_batcher is not None:
+            await self._write_batcher.close()
+            self._write_batcher = None
+
+        if self._read_batcher is not None:
+            await self._read_batcher.close()
+            self._logger.info(
+                "Пакетное чтение: запросов %s, пользователей в них %s",
+                self._read_batcher.batches,
+                self._read_batcher.batched_users,
+            )
+        if self._coalescer is not None:
+            self._coalescer.log_stats()
+
+        if self._pool is not None:
+            await self._pool.close()
+        else:
+            await self._connection.close()
         self._connection = None
         self._logger.info("Соединение с базой данных закрыто")
 
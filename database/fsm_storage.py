@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import (
+    BaseStorage,
+    DefaultKeyBuilder,
+    KeyBuilder,
+    StateType,
+    StorageKey,
+)
+
+from database.storage import TaskStorage
+from utils.logger import setup_logger
+
+
+class _StorageRecord:
+    """Состояние и данные FSM одного ключа в кэше хранилища."""
+
+    __slots__ = ("state", "data")
+
+    def __init__(self, state: Optional[str] = None, data: Optional[Dict[str, Any]] = None):
+        self.state = state
+        self.data = data or {}
+
+
+class SQLiteStorage(BaseStorage):
+    """
+    Хранилище состояний FSM в базе данных бота (SQLite или PostgreSQL)
+    с кэшем отложенной записи.
+
+    Чтение выполняется из кэша в памяти, а при промахе — из таблицы fsm_states.
+    Изменения сразу попадают в кэш и сохраняются в базу пакетами раз
+    в flush_interval секунд одной транзакцией, а также при закрытии хранилища.
+    Состояния переживают перезапуск бота; при нескольких процессах обновления
+    одного пользователя должны обрабатываться одним процессом (маршрутизация
+    по user_id), иначе кэш процесса может содержать устаревшее состояние.
+    """
+
+    def __init__(
+        self,
+        db_manager: TaskStorage,
+        key_builder: Optional[KeyBuilder] = None,
+        flush_interval: float = 0.2,
+        max_cached: int = 10000,
+    ):
+        """
+        Конструктор класса SQLiteStorage.
+
+        Параметры:
+            db_manager (TaskStorage): хранилище задач SQLite или PostgreSQL с таблицей fsm_states.
+            key_builder (Optional[KeyBuilder]): построитель строковых ключей записей.
+            flush_interval (float): период сохранения изменений в базу в секундах.
+            max_cached (int): максимальное число сохраненных записей в кэше.
+        """
+        self._db = db_manager
+        self._key_builder = key_builder or DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        self._flush_interval = flush_interval
+        self._max_cached = max(1, max_cached)
+        self._records: "OrderedDict[str, _StorageRecord]" = OrderedDict()
+        self._dirty: Set[str] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._closed = False
+        self._logger = setup_logger(__name__)
+
+    async def _get_record(self, key: StorageKey) -> _StorageRecord:
+        """Возвращает запись из кэша, при промахе загружая ее из базы данных."""
+        storage_key = self._key_builder.build(key)
+        record = self._records.get(storage_key)
+        if record is not None:
+            self._records.move_to_end(storage_key)
+            return record
+
+        stored = await self._db.get_fsm_record(storage_key)
+        # Пока шел запрос, запись могла появиться в кэше — она новее базы
+        record = self._records.get(storage_key)
+        if record is None:
+            if stored is None:
+                record = _StorageRecord()
+            else:
+                record = _StorageRecord(stored[0], json.loads(stored[1]))
+            self._records[storage_key] = record
+            self._evict()
+        return record
+
+    def _mark_dirty(self, key: StorageKey) -> None:
+        """Помечает запись для сохранения и запускает фоновое сохранение."""
+        self._dirty.add(self._key_builder.build(key))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def _evict(self) -> None:
+        """Вытесняет из кэша самые старые записи, уже сохраненные в базу."""
+        if len(self._records) <= self._max_cached:
+            return
+        for storage_key in list(self._records):
+            if len(self._records) <= self._max_cached:
+                break
+            if storage_key not in self._dirty:
+                del self._records[storage_key]
+
+    async def _flush_later(self) -> None:
+        """Ожидает окончания окна накопления и сохраняет изменения."""
+        await asyncio.sleep(self._flush_interval)
+        try:
+            await self.flush()
+        except Exception as error:  # pylint: disable=broad-except
+            self._logger.exception("Не удалось сохранить состояния FSM: %s", error)
+
+    async def flush(self) -> None:
+        """
+        Сохраняет все измененные записи в базу данных одной транзакцией.
+        Если сохранение не удалось, записи остаются помеченными к сохранению.
+        """
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            dirty, self._dirty = self._dirty, set()
+            batch = []
+            for storage_key in dirty:
+                record = self._records.get(storage_key)
+                if record is None or (record.state is None and not record.data):
+                    batch.append((storage_key, None, None))
+                else:
+                    batch.append(
+                        (storage_key, record.state, json.dumps(record.data, ensure_ascii=False))
+                    )
+
+            try:
+                await self._db.save_fsm_records(batch)
+            except Exception:
+                self._dirty |= dirty
+                raise
+
+            self._evict()
+            self._logger.debug("Сохранено состояний FSM: %s", len(batch))
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        """Устанавливает состояние FSM для ключа."""
+        record = await self._get_record(key)
+        record.state = state.state if isinstance(state, State) else state
+        self._mark_dirty(key)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        """Возвращает текущее состояние FSM для ключа."""
+        record = await self._get_record(key)
+        return record.state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        """Заменяет данные FSM для ключа."""
+        record = await self._get_record(key)
+        record.data = data.copy()
+        self._mark_dirty(key)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        """Возвращает копию данных FSM для ключа."""
+        record = await self._get_record(key)
+        return record.data.copy()
+
+    async def close(self) -> None:
+        """Останавливает фоновое сохранение и сохраняет оставшиеся изменения."""
+        if self._closed:
+            return
+        self._closed = True
+
+        # Дожидаемся запланированного сохранения, не прерывая начатую транзакцию
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        await self.flush()
+        self._logger.info("Хранилище состояний FSM закрыто")
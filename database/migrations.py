@@ -0,0 +1,266 @@
+"""
+Версионированные миграции схемы базы данных TaskBot.
+
+Текущая версия схемы хранится в PRAGMA user_version файла базы данных.
+Каждая миграция — это номер версии, краткое описание и набор SQL-инструкций,
+которые выполняются в одной транзакции вместе с обновлением user_version.
+
+Схема PostgreSQL (PG_MIGRATIONS) ведется отдельно: ее версия хранится
+в таблице schema_version.
+"""
+
+from typing import List, Tuple
+
+Migration = Tuple[int, str, Tuple[str, ...]]
+
+MIGRATIONS: List[Migration] = [
+    (
+        1,
+        "Базовая таблица tasks",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                created_at TEXT NOT NULL
+            );
+            """,
+        ),
+    ),
+    (
+        2,
+        "Нормализация created_at и индекс (user_id, created_at, id)",
+        (
+            # datetime.isoformat() опускает микросекунды, если они равны нулю.
+            # Приводим такие значения к фиксированной ширине, чтобы строки
+            # сортировались лексикографически без вызова datetime().
+            "UPDATE tasks SET created_at = created_at || '.000000' "
+            "WHERE length(created_at) = 19;",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_created "
+            "ON tasks (user_id, created_at, id);",
+        ),
+    ),
+    (
+        3,
+        "Таблица fsm_states для хранилища состояний FSM",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS fsm_states (
+                storage_key TEXT PRIMARY KEY,
+                state TEXT,
+                data TEXT NOT NULL DEFAULT '{}',
+                updated_at TEXT NOT NULL
+            ) WITHOUT ROWID;
+            """,
+        ),
+    ),
+    (
+        4,
+        "Полнотекстовый индекс tasks_fts (FTS5) с триггерами и заполнением",
+        (
+            # Индекс без копии текста (content=''): строки берутся из tasks по rowid.
+            # Столбец owner содержит токен u<user_id>, поэтому поиск пользователя
+            # ограничивается его задачами внутри индекса, а не фильтром после него.
+            # «ё» заменяется на «е»: unicode61 не считает их одной буквой.
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                text,
+                owner,
+                content = '',
+                tokenize = 'unicode61 remove_diacritics 2',
+                prefix = '2 3'
+            );
+            """,
+            # Ранжирование только по тексту задачи
+            "INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('rank', 'bm25(1.0, 0.0)');",
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, text, owner) VALUES (
+                    new.id,
+                    replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е'),
+                    'u' || new.user_id
+                );
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, text, owner) VALUES (
+                    'delete',
+                    old.id,
+                    replace(replace(old.text, 'ё', 'е'), 'Ё', 'Е'),
+                    'u' || old.user_id
+                );
+            END;
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+            AFTER UPDATE OF text, user_id ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, text, owner) VALUES (
+                    'delete',
+                    old.id,
+                    replace(replace(old.text, 'ё', 'е'), 'Ё', 'Е'),
+                    'u' || old.user_id
+                );
+                INSERT INTO tasks_fts (rowid, text, owner) VALUES (
+                    new.id,
+                    replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е'),
+                    'u' || new.user_id
+                );
+            END;
+            """,
+            # Заполнение индекса существующими задачами
+            """
+            INSERT INTO tasks_fts (rowid, text, owner)
+            SELECT id, replace(replace(text, 'ё', 'е'), 'Ё', 'Е'), 'u' || user_id
+            FROM tasks;
+            """,
+        ),
+    ),
+    (
+        5,
+        "Таблица csv_exports с последними выгрузками пользователей",
+        (
+            # file_id — документ последней полной выгрузки в Telegram, описывающий
+            # tasks_count задач с максимальным ID max_task_id; exported_task_id —
+            # максимальный ID задачи, попавшей в любую выгрузку (для режима «новые»)
+            """
+            CREATE TABLE IF NOT EXISTS csv_exports (
+                user_id INTEGER PRIMARY KEY,
+                file_id TEXT,
+                max_task_id INTEGER NOT NULL DEFAULT 0,
+                tasks_count INTEGER NOT NULL DEFAULT 0,
+                exported_task_id INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL
+            );
+            """,
+            # Добавление и удаление задач меняют число задач или максимальный ID;
+            # изменение существующей задачи сбрасывает выгрузку явно
+            """
+            CREATE TRIGGER IF NOT EXISTS csv_exports_invalidate AFTER UPDATE ON tasks BEGIN
+                UPDATE csv_exports SET file_id = NULL
+                WHERE user_id IN (old.user_id, new.user_id) AND file_id IS NOT NULL;
+            END;
+            """,
+        ),
+    ),
+    (
+        6,
+        "Столбцы status и category, индекс (user_id, status, created_at, id)",
+        (
+            # Добавление столбца со значением по умолчанию не переписывает таблицу
+            "ALTER TABLE tasks ADD COLUMN status TEXT NOT NULL DEFAULT 'work';",
+            "ALTER TABLE tasks ADD COLUMN category TEXT NOT NULL DEFAULT '';",
+            # Фильтр /list по статусу читает страницу по индексу в порядке создания
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_status_created "
+            "ON tasks (user_id, status, created_at, id);",
+        ),
+    ),
+    (
+        7,
+        "Срок задачи due_at и частичный индекс неотправленных напоминаний",
+        (
+            # due_at в том же формате, что created_at; NULL — срок не задан
+            "ALTER TABLE tasks ADD COLUMN due_at TEXT;",
+            "ALTER TABLE tasks ADD COLUMN reminder_sent INTEGER NOT NULL DEFAULT 0;",
+            # В индекс попадают только ожидающие напоминания, поэтому
+            # отправленные и задачи без срока не увеличивают его
+            "CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (due_at) "
+            "WHERE due_at IS NOT NULL AND reminder_sent = 0;",
+            # Срок и отметка напоминания не входят в выгрузку: сохраненный
+            # файл сбрасывается только при изменении выгружаемых столбцов
+            "DROP TRIGGER IF EXISTS csv_exports_invalidate;",
+            """
+            CREATE TRIGGER csv_exports_invalidate
+            AFTER UPDATE OF text, user_id, created_at, status, category ON tasks BEGIN
+                UPDATE csv_exports SET file_id = NULL
+                WHERE user_id IN (old.user_id, new.user_id) AND file_id IS NOT NULL;
+            END;
+            """,
+        ),
+    ),
+]
+
+SCHEMA_VERSION: int = MIGRATIONS[-1][0]
+
+# Миграции PostgreSQL (database/pg_manager.py). Столбцы tasks совпадают со схемой
+# SQLite, а даты хранятся в том же текстовом формате с побайтовой сортировкой
+# (COLLATE "C"), поэтому TaskRow и ключи пагинации общие для обеих баз.
+PG_MIGRATIONS: List[Migration] = [
+    (
+        1,
+        "Таблица tasks, индексы (user_id, created_at, id) и (user_id, status, created_at, id)",
+        (
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+                text TEXT NOT NULL,
+                user_id BIGINT NOT NULL,
+                created_at TEXT COLLATE "C" NOT NULL,
+                status TEXT NOT NULL DEFAULT 'work',
+                category TEXT NOT NULL DEFAULT '',
+                due_at TEXT COLLATE "C",
+                reminder_sent BOOLEAN NOT NULL DEFAULT FALSE
+            );
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_created "
+            "ON tasks (user_id, created_at, id);",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_status_created "
+            "ON tasks (user_id, status, created_at, id);",
+        ),
+    ),
+    (
+        2,
+        "Полнотекстовый поиск, напоминания, выгрузки CSV и состояния FSM",
+        (
+            # Вектор поиска хранится в строке и пересчитывается при изменении
+            # текста, поэтому поиск не вычисляет to_tsvector для каждой задачи.
+            # «ё» заменяется на «е», как в tasks_fts SQLite.
+            """
+            ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS (to_tsvector('simple', translate(text, 'ёЁ', 'еЕ'))) STORED;
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_tasks_search ON tasks USING GIN (search_vector);",
+            # В индекс попадают только ожидающие напоминания
+            "CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (due_at, id) "
+            "WHERE due_at IS NOT NULL AND NOT reminder_sent;",
+            """
+            CREATE TABLE IF NOT EXISTS csv_exports (
+                user_id BIGINT PRIMARY KEY,
+                file_id TEXT,
+                max_task_id BIGINT NOT NULL DEFAULT 0,
+                tasks_count BIGINT NOT NULL DEFAULT 0,
+                exported_task_id BIGINT NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL
+            );
+            """,
+            # Изменение выгружаемых столбцов сбрасывает сохраненный файл,
+            # как триггер csv_exports_invalidate в SQLite
+            """
+            CREATE OR REPLACE FUNCTION csv_exports_invalidate() RETURNS trigger AS $$
+            BEGIN
+                UPDATE csv_exports SET file_id = NULL
+                WHERE user_id IN (OLD.user_id, NEW.user_id) AND file_id IS NOT NULL;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """,
+            "DROP TRIGGER IF EXISTS csv_exports_invalidate ON tasks;",
+            """
+            CREATE TRIGGER csv_exports_invalidate
+            AFTER UPDATE OF text, user_id, created_at, status, category ON tasks
+            FOR EACH ROW EXECUTE FUNCTION csv_exports_invalidate();
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS fsm_states (
+                storage_key TEXT PRIMARY KEY,
+                state TEXT,
+                data TEXT NOT NULL DEFAULT '{}',
+                updated_at TEXT NOT NULL
+            );
+            """,
+        ),
+    ),
+]
+
+PG_SCHEMA_VERSION: int = PG_MIGRATIONS[-1][0]
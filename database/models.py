@@ -1,16 +1,68 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional, Sequence, Tuple
+
+# Строка таблицы tasks в порядке столбцов: (id, text, user_id, created_at, status, category)
+TaskRow = Tuple[int, str, int, str, str, str]
+
+# Статусы задач: код, хранимый в базе данных, и название для пользователя
+TASK_STATUSES: Dict[str, str] = {
+    "work": "В работе",
+    "done": "Выполнена",
+    "postponed": "Отложена",
+}
+DEFAULT_TASK_STATUS = "work"
+
+# Запись таблицы csv_exports: (file_id, max_task_id, tasks_count, exported_task_id).
+# file_id равен None, если сохраненный файл не соответствует текущим задачам.
+CsvExportRow = Tuple[Optional[str], int, int, int]
+
+# Ожидающее напоминание: (due_at, task_id, user_id); кортежи сравниваются
+# по сроку, поэтому напрямую подходят для кучи планировщика
+ReminderRow = Tuple[str, int, int]
+
+
+def parse_task_status(value: str) -> Optional[str]:
+    """
+    Возвращает код статуса по коду или названию без учета регистра.
+
+    Параметры:
+        value (str): код («done») или название («Выполнена») статуса.
+
+    Возвращает:
+        Optional[str]: код статуса или None, если статус не распознан.
+    """
+    value = value.strip().lower()
+    if value in TASK_STATUSES:
+        return value
+    for status, label in TASK_STATUSES.items():
+        if label.lower() == value:
+            return status
+    return None
 
 
 class Task:
     """
     Класс для представления задачи.
-    Содержит информацию о тексте задачи, пользователе и времени создания.
+    Содержит информацию о тексте задачи, пользователе, времени создания,
+    статусе и категории.
+
+    Атрибуты хранятся в __slots__, поэтому экземпляры не имеют __dict__
+    и занимают меньше памяти при загрузке больших списков.
     """
 
-    def __init__(self, task_id: int, text: str, user_id: int, created_at: str):
+    __slots__ = ("_id", "_text", "_user_id", "_created_at", "_status", "_category")
+
+    def __init__(
+        self,
+        task_id: int,
+        text: str,
+        user_id: int,
+        created_at: str,
+        status: str = DEFAULT_TASK_STATUS,
+        category: str = "",
+    ):
         """
         Конструктор класса Task.
 
@@ -19,11 +71,25 @@ class Task:
             text (str): текст задачи
             user_id (int): ID пользователя Telegram
             created_at (str): дата и время создания задачи в формате ISO 8601
+            status (str): код статуса задачи из TASK_STATUSES
+            category (str): категория задачи (пустая строка, если не задана)
         """
         self._id = task_id
         self._text = text
         self._user_id = user_id
         self._created_at = created_at
+        self._status = status
+        self._category = category
+
+    @classmethod
+    def from_row(cls, row: Sequence) -> "Task":
+        """
+        Создает задачу из строки таблицы tasks.
+
+        Параметры:
+            row (Sequence): значения столбцов (id, text, user_id, created_at, status, category).
+        """
+        return cls(row[0], row[1], row[2], row[3], row[4], row[5])
 
     def get_id(self) -> int:
         """Возвращает ID задачи."""
@@ -41,6 +107,28 @@ class Task:
         """Возвращает дату создания задачи."""
         return self._created_at
 
+    def get_status(self) -> str:
+        """Возвращает код статуса задачи."""
+        return self._status
+
+    def get_category(self) -> str:
+        """Возвращает категорию задачи."""
+        return self._category
+
+    def set_status(self, status: str) -> None:
+        """
+        Изменяет статус задачи.
+
+        Параметры:
+            status (str): код статуса из TASK_STATUSES.
+
+        Исключения:
+            ValueError: если статус неизвестен.
+        """
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Неизвестный статус задачи: {status}")
+        self._status = status
+
     def set_text(self, new_text: str) -> None:
         """
         Изменяет текст задачи.
@@ -60,7 +148,8 @@ class Task:
         """Возвращает строковое представление задачи."""
         return (
             f"Задача #{self._id}: '{self._text}' "
-            f"(пользователь: {self._user_id}, создана: {self._created_at})"
+            f"(пользователь: {self._user_id}, создана: {self._created_at}, "
+            f"статус: {TASK_STATUSES.get(self._status, self._status)})"
         )
 
 
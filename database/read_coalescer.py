@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from utils.logger import setup_logger
+
+# Загрузчик пакета: список ID пользователей -> результат для каждого из них
+BatchLoader = Callable[[List[int]], Awaitable[Dict[int, Any]]]
+
+
+def _consume_result(task: "asyncio.Task") -> None:
+    """Забирает исключение завершенной задачи, если его никто не ожидал."""
+    if not task.cancelled():
+        task.exception()
+
+
+class ReadCoalescer:
+    """
+    Объединение одинаковых конкурентных чтений (single-flight).
+
+    Пока запрос с ключом (user_id, key) выполняется, повторные вызовы с тем же
+    ключом не обращаются к базе, а ожидают результат уже начатого запроса.
+    Так двойное нажатие «📋 Список задач» или /list сразу после /list_csv
+    выполняют один запрос вместо нескольких.
+
+    Изменение данных пользователя (invalidate) отвязывает его выполняющиеся
+    запросы: чтение, начатое после записи, не получит результат, прочитанный
+    до нее.
+    """
+
+    def __init__(self, stats_interval: float = 300.0):
+        """
+        Конструктор класса ReadCoalescer.
+
+        Параметры:
+            stats_interval (float): период логирования статистики в секундах.
+        """
+        self._in_flight: Dict[int, Dict[Hashable, asyncio.Task]] = {}
+        self._stats_interval = stats_interval
+        self._requests = 0
+        self._coalesced = 0
+        self._last_stats_at = time.monotonic()
+        self._logger = setup_logger(__name__)
+
+    async def load(
+        self, user_id: int, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Возвращает результат loader, объединяя конкурентные вызовы с одним ключом.
+
+        Запрос выполняется в отдельной задаче, поэтому отмена одного
+        из ожидающих не отменяет его для остальных.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            key (Hashable): ключ запроса среди запросов пользователя.
+            loader (Callable[[], Awaitable[Any]]): выполняет запрос к базе.
+
+        Возвращает:
+            Any: результат запроса (общий для всех объединенных вызовов).
+        """
+        self._requests += 1
+        user_flights = self._in_flight.setdefault(user_id, {})
+        task = user_flights.get(key)
+        if task is not None:
+            self._coalesced += 1
+        else:
+            task = asyncio.ensure_future(loader())
+            user_flights[key] = task
+            task.add_done_callback(_consume_result)
+            task.add_done_callback(lambda done: self._forget(user_id, key, done))
+        self._maybe_log_stats()
+        return await asyncio.shield(task)
+
+    def _forget(self, user_id: int, key: Hashable, task: "asyncio.Task") -> None:
+        """Удаляет завершенный запрос, если его еще не заменил более новый."""
+        user_flights = self._in_flight.get(user_id)
+        if user_flights is None or user_flights.get(key) is not task:
+            return
+        del user_flights[key]
+        if not user_flights:
+            del self._in_flight[user_id]
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Отвязывает выполняющиеся запросы пользователя после изменения его данных.
+        Уже ожидающие вызовы получат свой результат, новые начнут новый запрос.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+        """
+        self._in_flight.pop(user_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает число запросов, объединенных запросов и выполняющихся запросов."""
+        return {
+            "requests": self._requests,
+            "coalesced": self._coalesced,
+            "in_flight": sum(len(flights) for flights in self._in_flight.values()),
+        }
+
+    def _maybe_log_stats(self) -> None:
+        """Периодически логирует статистику объединения чтений."""
+        now = time.monotonic()
+        if now - self._last_stats_at < self._stats_interval:
+            return
+        self._last_stats_at = now
+        self.log_stats()
+
+    def log_stats(self) -> None:
+        """Логирует число запросов и долю объединенных чтений на уровне INFO."""
+        hit_rate = self._coalesced / self._requests * 100 if self._requests else 0.0
+        self._logger.info(
+            "Объединение чтений: запросов %s, объединено %s (%.1f%%)",
+            self._requests,
+            self._coalesced,
+            hit_rate,
+        )
+
+
+class ReadBatcher:
+    """
+    Пакетирование чтений разных пользователей в один запрос.
+
+    Вызовы submit(), поступившие в течение окна max_delay секунд (или пока
+    не набралось max_batch_size пользователей), выполняются одним вызовом
+    загрузчика пакета, например запросом WHERE user_id IN (...), и результат
+    раздается каждому вызывающему.
+    """
+
+    def __init__(
+        self,
+        loader: BatchLoader,
+        max_batch_size: int = 64,
+        max_delay: float = 0.002,
+    ):
+        """
+        Конструктор класса ReadBatcher.
+
+        Параметры:
+            loader (BatchLoader): загружает данные сразу для списка пользователей.
+            max_batch_size (int): максимальное число пользователей в одном запросе.
+            max_delay (float): максимальное время ожидания пакета в секундах.
+        """
+        self._loader = loader
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_delay = max(0.0, max_delay)
+        self._pending: Dict[int, List["asyncio.Future[Any]"]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.batched_users = 0
+        self._logger = setup_logger(__name__)
+
+    async def submit(self, user_id: int) -> Any:
+        """
+        Ставит чтение данных пользователя в пакет и ожидает результат.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+
+        Возвращает:
+            Any: данные пользователя из результата загрузчика пакета.
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[Any] = loop.create_future()
+        self._pending.setdefault(user_id, []).append(future)
+
+        # Пакет заполнен — читаем сразу, иначе ждем окончания окна
+        if len(self._pending) >= self._max_batch_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._schedule_flush)
+
+        return await future
+
+    def _schedule_flush(self) -> None:
+        """Запускает чтение накопленного пакета в фоновой задаче."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        task = asyncio.create_task(self._load_batch(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _load_batch(self, batch: Dict[int, List["asyncio.Future[Any]"]]) -> None:
+        """Выполняет загрузчик для пакета и раздает результаты ожидающим."""
+        # Пропускаем пользователей, все вызовы которых уже отменили ожидание
+        user_ids = [
+            user_id
+            for user_id, futures in batch.items()
+            if any(not future.done() for future in futures)
+        ]
+        if not user_ids:
+            return
+
+        try:
+            results = await self._loader(user_ids)
+        except Exception as error:  # pylint: disable=broad-except
+            for user_id in user_ids:
+                for future in batch[user_id]:
+                    if not future.done():
+                        future.set_exception(error)
+            return
+
+        self.batches += 1
+        self.batched_users += len(user_ids)
+        for user_id in user_ids:
+            for future in batch[user_id]:
+                if not future.done():
+                    future.set_result(results[user_id])
+        self._logger.debug("Прочитан пакет из %s пользователей", len(user_ids))
+
+    async def close(self) -> None:
+        """Читает накопленный пакет и дожидается выполняющихся запросов."""
+        if self._pending:
+            self._schedule_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
@@ -0,0 +1,213 @@
+"""
+Интерфейс хранилища задач и выбор реализации по DATABASE_PATH.
+
+Путь к файлу выбирает SQLite (DatabaseManager), URL со схемой postgres://
+или postgresql:// — PostgreSQL (PostgresDatabaseManager, пакет asyncpg).
+"""
+
+from __future__ import annotations
+
+import inspect
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
+from urllib.parse import urlsplit
+
+from database.db_manager import DatabaseManager, DueHook, QueryHook
+from database.models import CsvExportRow, ReminderRow, Task, TaskRow
+from database.task_cache import TaskCache
+from utils.logger import setup_logger
+
+POSTGRES_SCHEMES = ("postgres", "postgresql")
+
+# Параметры DatabaseManager, не требующие предупреждения для PostgreSQL:
+# место после удаления строк там возвращает autovacuum сервера
+PG_EQUIVALENT_OPTIONS = ("vacuum_interval", "vacuum_pages")
+
+logger = setup_logger(__name__)
+
+
+class TaskStorage(Protocol):
+    """
+    Интерфейс хранилища задач, общий для SQLite и PostgreSQL.
+
+    Включает все операции, которые используют обработчики, хранилище
+    состояний FSM и планировщик напоминаний. Описания параметров —
+    в DatabaseManager.
+    """
+
+    @property
+    def cache(self) -> Optional[TaskCache]:
+        """Кэш задач пользователей или None, если кэш отключен."""
+
+    def set_due_hook(self, hook: Optional[DueHook]) -> None:
+        """Задает обработчик изменения срока задачи."""
+
+    async def connect(self) -> None:
+        """Подключается к базе данных."""
+
+    async def create_tables(self) -> None:
+        """Создает таблицы и применяет недостающие миграции схемы."""
+
+    async def add_task(self, text: str, user_id: int, due_at: Optional[str] = None) -> int:
+        """Добавляет задачу и возвращает ее ID."""
+
+    async def add_tasks_bulk(
+        self,
+        tasks: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]],
+        user_id: int,
+        chunk_size: int = 1000,
+        progress: Optional[Callable[[int], Awaitable[None]]] = None,
+    ) -> int:
+        """Добавляет задачи пользователя порциями и возвращает их количество."""
+
+    async def get_user_tasks(self, user_id: int) -> List[Task]:
+        """Возвращает все задачи пользователя в порядке создания."""
+
+    async def get_user_task_rows_page(
+        self,
+        user_id: int,
+        limit: int = 10,
+        after: Optional[Tuple[str, int]] = None,
+        before: Optional[Tuple[str, int]] = None,
+        status: Optional[str] = None,
+    ) -> Tuple[List[TaskRow], bool]:
+        """Возвращает страницу задач и признак наличия задач дальше."""
+
+    async def search_user_task_rows(
+        self, user_id: int, query: str, limit: int = 10, offset: int = 0
+    ) -> Tuple[List[TaskRow], bool]:
+        """Возвращает страницу результатов поиска и признак следующей страницы."""
+
+    async def get_task_row(self, task_id: int, user_id: int) -> Optional[TaskRow]:
+        """Возвращает задачу пользователя по ID или None."""
+
+    async def set_task_status(self, task_id: int, user_id: int, status: str) -> bool:
+        """Изменяет статус задачи."""
+
+    async def set_task_due_at(self, task_id: int, user_id: int, due_at: Optional[str]) -> bool:
+        """Изменяет срок задачи."""
+
+    async def get_pending_reminders(
+        self, limit: int, after: Optional[Tuple[str, int]] = None
+    ) -> List[ReminderRow]:
+        """Возвращает ближайшие неотправленные напоминания."""
+
+    async def claim_reminder(self, task_id: int, due_at: str) -> Optional[Tuple[int, str, str]]:
+        """Отмечает напоминание отправленным, если срок задачи не изменился."""
+
+    async def update_task_text(self, task_id: int, user_id: int, text: str) -> bool:
+        """Изменяет текст задачи."""
+
+    async def delete_task(self, task_id: int, user_id: int) -> bool:
+        """Удаляет задачу."""
+
+    async def delete_user_tasks_by_status(self, user_id: int, status: str) -> int:
+        """Удаляет задачи пользователя с указанным статусом."""
+
+    def iter_user_task_rows(
+        self, user_id: int, chunk_size: int = 500, after_id: Optional[int] = None
+    ) -> AsyncIterator[List[TaskRow]]:
+        """Постранично читает задачи пользователя в порядке создания."""
+
+    async def get_csv_export(self, user_id: int) -> Optional[CsvExportRow]:
+        """Возвращает запись о последней выгрузке CSV пользователя."""
+
+    async def save_csv_export(
+        self,
+        user_id: int,
+        file_id: Optional[str],
+        max_task_id: int,
+        tasks_count: Optional[int] = None,
+    ) -> None:
+        """Сохраняет результат выгрузки CSV пользователя."""
+
+    async def get_fsm_record(self, storage_key: str) -> Optional[Tuple[Optional[str], str]]:
+        """Возвращает состояние и данные FSM по ключу хранилища."""
+
+    async def save_fsm_records(
+        self, records: Iterable[Tuple[str, Optional[str], Optional[str]]]
+    ) -> int:
+        """Сохраняет пакет записей FSM."""
+
+    async def close(self) -> None:
+        """Закрывает соединения с базой данных."""
+
+
+def is_postgres_url(database_path: str) -> bool:
+    """
+    Проверяет, задает ли DATABASE_PATH базу PostgreSQL.
+
+    Параметры:
+        database_path (str): путь к файлу SQLite или URL базы данных.
+    """
+    return urlsplit(database_path).scheme in POSTGRES_SCHEMES
+
+
+def _changed_sqlite_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Возвращает параметры DatabaseManager, заданные не значением по умолчанию,
+    кроме параметров, у которых в PostgreSQL есть собственная замена.
+    """
+    defaults = inspect.signature(DatabaseManager.__init__).parameters
+    return {
+        name: value
+        for name, value in options.items()
+        if name not in PG_EQUIVALENT_OPTIONS
+        and (name not in defaults or value != defaults[name].default)
+    }
+
+
+def create_storage(
+    database_path: str,
+    pool_size: int = 0,
+    cache: Optional[TaskCache] = None,
+    query_hook: Optional[QueryHook] = None,
+    **sqlite_options: Any,
+) -> TaskStorage:
+    """
+    Создает хранилище задач по пути к файлу SQLite или URL PostgreSQL.
+
+    Параметры:
+        database_path (str): путь к файлу SQLite или URL postgresql://.
+        pool_size (int): число соединений для чтения SQLite или размер
+            пула PostgreSQL (0 — значение по умолчанию реализации).
+        cache (Optional[TaskCache]): кэш задач пользователей.
+        query_hook (Optional[QueryHook]): обработчик измерений запросов.
+        **sqlite_options: остальные параметры DatabaseManager (пакетная
+            запись, объединение чтений, PRAGMA, фоновый vacuum); для PostgreSQL
+            не используются.
+
+    Возвращает:
+        TaskStorage: неподключенное хранилище; подключение — connect().
+
+    Для PostgreSQL логирует на уровне WARNING параметры SQLite, значения которых
+    отличаются от значений по умолчанию DatabaseManager и поэтому не действуют.
+    """
+    if is_postgres_url(database_path):
+        ignored = _changed_sqlite_options(sqlite_options)
+        if ignored:
+            logger.warning(
+                "Параметры SQLite не используются с PostgreSQL: %s",
+                ", ".join(f"{name}={value!r}" for name, value in ignored.items()),
+            )
+
+        # asyncpg загружается только для базы PostgreSQL
+        # pylint: disable-next=import-outside-toplevel
+        from database.pg_manager import PostgresDatabaseManager
+
+        return PostgresDatabaseManager(
+            database_path, pool_size=pool_size or None, cache=cache, query_hook=query_hook
+        )
+    return DatabaseManager(
+        database_path, pool_size=pool_size, cache=cache, query_hook=query_hook, **sqlite_options
+    )
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from utils.logger import setup_logger
+
+CacheBucket = Dict[Hashable, Tuple[float, Any]]
+
+
+class TaskCache:
+    """
+    Внутрипроцессный LRU/TTL-кэш данных пользователей.
+
+    Для каждого пользователя хранится набор значений (страницы задач,
+    отрендеренные тексты списка), каждое со своим сроком жизни.
+    При изменении данных пользователя его набор целиком сбрасывается.
+    Число пользователей в кэше ограничено; при переполнении вытесняется
+    пользователь, к которому дольше всего не обращались.
+    """
+
+    def __init__(
+        self,
+        max_users: int = 1024,
+        max_entries_per_user: int = 32,
+        ttl: float = 300.0,
+        stats_interval: float = 300.0,
+    ):
+        """
+        Конструктор класса TaskCache.
+
+        Параметры:
+            max_users (int): максимальное число пользователей в кэше.
+            max_entries_per_user (int): максимальное число значений на пользователя.
+            ttl (float): время жизни значения в секундах.
+            stats_interval (float): период логирования статистики в секундах.
+        """
+        self._max_users = max(1, max_users)
+        self._max_entries_per_user = max(1, max_entries_per_user)
+        self._ttl = ttl
+        self._stats_interval = stats_interval
+        self._buckets: "OrderedDict[int, CacheBucket]" = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._last_stats_at = time.monotonic()
+        self._logger = setup_logger(__name__)
+
+    def get(self, user_id: int, key: Hashable) -> Optional[Any]:
+        """
+        Возвращает значение из кэша или None, если его нет или срок истек.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            key (Hashable): ключ значения в наборе пользователя.
+        """
+        bucket = self._buckets.get(user_id)
+        item = bucket.get(key) if bucket is not None else None
+
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                del bucket[key]
+            self._misses += 1
+            self._maybe_log_stats()
+            return None
+
+        self._buckets.move_to_end(user_id)
+        self._hits += 1
+        self._maybe_log_stats()
+        return item[1]
+
+    def snapshot(self, user_id: int) -> CacheBucket:
+        """
+        Возвращает маркер текущего состояния набора пользователя.
+
+        Маркер передается в set(): если между чтением из базы и записью
+        в кэш данные пользователя были изменены, устаревшее значение
+        не будет сохранено.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+        """
+        bucket = self._buckets.get(user_id)
+        if bucket is None:
+            bucket = {}
+            self._store_bucket(user_id, bucket)
+        return bucket
+
+    def set(
+        self,
+        user_id: int,
+        key: Hashable,
+        value: Any,
+        snapshot: Optional[CacheBucket] = None,
+    ) -> None:
+        """
+        Сохраняет значение в кэше.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            key (Hashable): ключ значения в наборе пользователя.
+            value (Any): сохраняемое значение.
+            snapshot (Optional[CacheBucket]): маркер, полученный из snapshot()
+                до чтения данных; если набор с тех пор сброшен, значение отбрасывается.
+        """
+        bucket = self._buckets.get(user_id)
+        if snapshot is not None and bucket is not snapshot:
+            return
+        if bucket is None:
+            bucket = {}
+            self._store_bucket(user_id, bucket)
+
+        bucket[key] = (time.monotonic() + self._ttl, value)
+        self._buckets.move_to_end(user_id)
+
+        # Ограничиваем число значений одного пользователя (например, страниц списка)
+        while len(bucket) > self._max_entries_per_user:
+            del bucket[next(iter(bucket))]
+
+    def discard(self, user_id: int, key: Hashable) -> None:
+        """
+        Удаляет одно значение пользователя, не затрагивая остальные.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            key (Hashable): ключ значения в наборе пользователя.
+        """
+        bucket = self._buckets.get(user_id)
+        if bucket is not None:
+            bucket.pop(key, None)
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Сбрасывает все значения пользователя после изменения его данных.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+        """
+        if self._buckets.pop(user_id, None) is not None:
+            self._invalidations += 1
+
+    def _store_bucket(self, user_id: int, bucket: CacheBucket) -> None:
+        """Добавляет набор пользователя и вытесняет самые старые наборы."""
+        self._buckets[user_id] = bucket
+        while len(self._buckets) > self._max_users:
+            self._buckets.popitem(last=False)
+            self._evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Возвращает счетчики попаданий, промахов, вытеснений и размер кэша."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+            "users": len(self._buckets),
+        }
+
+    def _maybe_log_stats(self) -> None:
+        """Периодически логирует статистику кэша на уровне INFO."""
+        now = time.monotonic()
+        if now - self._last_stats_at < self._stats_interval:
+            return
+        self._last_stats_at = now
+
+        lookups = self._hits + self._misses
+        hit_rate = self._hits / lookups * 100 if lookups else 0.0
+        self._logger.info(
+            "Кэш задач: попаданий %s, промахов %s (%.1f%%), вытеснений %s, "
+            "сбросов %s, пользователей %s",
+            self._hits,
+            self._misses,
+            hit_rate,
+            self._evictions,
+            self._invalidations,
+            len(self._buckets),
+        )
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from typing import List, Optional, Set, Tuple
+
+import aiosqlite
+
+from utils.logger import setup_logger
+
+PendingWrite = Tuple[str, Tuple, "asyncio.Future[int]"]
+
+
+class WriteBatcher:
+    """
+    Групповая фиксация (group commit) операций INSERT.
+
+    Конкурентные вызовы submit() накапливаются и записываются одной транзакцией,
+    когда набирается max_batch_size запросов или истекает окно max_delay секунд.
+    Каждый вызывающий получает собственный lastrowid, а ошибка отдельной
+    инструкции передается только ее автору.
+    """
+
+    def __init__(
+        self,
+        connection: aiosqlite.Connection,
+        max_batch_size: int = 64,
+        max_delay: float = 0.01,
+        write_lock: Optional[asyncio.Lock] = None,
+    ):
+        """
+        Конструктор класса WriteBatcher.
+
+        Параметры:
+            connection (aiosqlite.Connection): соединение для записи.
+            max_batch_size (int): максимальное число строк в одной транзакции.
+            max_delay (float): максимальное время ожидания пакета в секундах.
+            write_lock (Optional[asyncio.Lock]): общая блокировка записи соединения,
+                чтобы транзакция пакета не пересекалась с другими записями.
+        """
+        self._connection = connection
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_delay = max(0.0, max_delay)
+        self._pending: List[PendingWrite] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_lock = write_lock or asyncio.Lock()
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._closed = False
+        self._logger = setup_logger(__name__)
+
+    async def submit(self, sql: str, params: Tuple) -> int:
+        """
+        Ставит инструкцию INSERT в очередь и ожидает фиксации пакета.
+
+        Параметры:
+            sql (str): текст инструкции INSERT.
+            params (Tuple): параметры инструкции.
+
+        Возвращает:
+            int: lastrowid вставленной строки.
+
+        Исключения:
+            RuntimeError: если пакетная запись уже остановлена.
+            sqlite3.Error: если инструкция или фиксация транзакции завершились ошибкой.
+        """
+        if self._closed:
+            raise RuntimeError("Пакетная запись остановлена")
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[int] = loop.create_future()
+        self._pending.append((sql, params, future))
+
+        # Пакет заполнен — сбрасываем сразу, иначе ждем окончания окна
+        if len(self._pending) >= self._max_batch_size:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._schedule_flush)
+
+        return await future
+
+    def _schedule_flush(self) -> None:
+        """Запускает сброс накопленного пакета в фоновой задаче."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        task = asyncio.create_task(self.flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def flush(self) -> None:
+        """
+        Записывает все накопленные инструкции одной транзакцией.
+        Пакеты сбрасываются строго последовательно.
+        """
+        async with self._flush_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+            batch, self._pending = self._pending, []
+            # Пропускаем запросы, чьи авторы уже отменили ожидание
+            batch = [item for item in batch if not item[2].done()]
+            if batch:
+                await self._write_batch(batch)
+
+    async def _write_batch(self, batch: List[PendingWrite]) -> None:
+        """
+        Выполняет пакет инструкций в одной транзакции и раздает результаты.
+
+        Ошибка отдельной инструкции откатывает только эту инструкцию (SQLite
+        откатывает изменения оператора, но не транзакции), поэтому остальные
+        строки пакета фиксируются. Ошибка фиксации передается всем участникам.
+        """
+        results: List[Tuple[asyncio.Future[int], int]] = []
+
+        try:
+            for sql, params, future in batch:
+                try:
+                    cursor = await self._connection.execute(sql, params)
+                except sqlite3.Error as error:
+                    if not future.done():
+                        future.set_exception(error)
+                    continue
+                results.append((future, cursor.lastrowid))
+                await cursor.close()
+
+            await self._connection.commit()
+        except Exception as error:  # pylint: disable=broad-except
+            self._logger.exception("Не удалось зафиксировать пакет записей: %s", error)
+            try:
+                await self._connection.rollback()
+            except sqlite3.Error:
+                pass
+            for future, _ in results:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for future, row_id in results:
+            if not future.done():
+                future.set_result(row_id)
+
+        self._logger.debug(
+            "Зафиксирован пакет из %s записей (ошибок: %s)",
+            len(results),
+            len(batch) - len(results),
+        )
+
+    async def close(self) -> None:
+        """
+        Останавливает прием новых записей и сбрасывает накопленный пакет.
+        """
+        self._closed = True
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        await self.flush()
@@ -24,8 +24,14 @@ async def cmd_start(message: Message) -> None:
         "Привет! Я бот для хранения задач.\n\n"
         "Доступные команды:\n"
         "/add — добавить новую задачу\n"
-        "/list — показать ваши задачи\n"
-        "/list_csv — получить задачи в формате CSV"
+        "/list — показать ваши задачи (кнопка с номером — статус, изменение, срок, удаление)\n"
+        "/list done, /list work, /list postponed — задачи с нужным статусом\n"
+        "/clear_done — удалить все выполненные задачи\n"
+        "/search — найти задачи по словам\n"
+        "/list_csv — получить задачи в формате CSV\n"
+        "/list_csv new — выгрузить только новые задачи\n"
+        "/export — выгрузить задачи в CSV.GZ, ZIP, XLSX или JSON Lines\n"
+        "/import — импортировать задачи из сообщения или CSV-файла"
     )
     await message.answer(greeting, reply_markup=get_main_keyboard())
 
@@ -1,34 +1,234 @@
 from __future__ import annotations
 
-import os
+import time
+from typing import TYPE_CHECKING, AsyncIterable, AsyncIterator, List, Tuple
 
 from aiogram import F, Router
-from aiogram.filters import Command
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from aiogram.types import FSInputFile, Message
+from aiogram.types import BufferedInputFile, CallbackQuery, InlineKeyboardMarkup, Message
 
-from database.db_manager import DatabaseManager
-from utils.csv_generator import CSVGenerator
+from config import Config
+from database.db_manager import format_created_at
+from database.models import TASK_STATUSES, TaskRow, parse_task_status
+from database.storage import TaskStorage
+from keyboards.inline_keyboards import (
+    STATUS_ICONS,
+    ClearTasksCallback,
+    ExportFormatCallback,
+    SearchPageCallback,
+    TaskDeleteCallback,
+    TaskDueCallback,
+    TaskEditCallback,
+    TaskOpenCallback,
+    TaskPageCallback,
+    TaskStatusCallback,
+    get_clear_tasks_keyboard,
+    get_export_format_keyboard,
+    get_page_anchor,
+    get_search_page_keyboard,
+    get_task_delete_keyboard,
+    get_task_keyboard,
+    get_tasks_page_keyboard,
+)
+from utils.export_executor import ExportExecutor
 from utils.logger import setup_logger
+from utils.reminders import DUE_FORMAT_HINT, format_due_at, parse_due_at
+
+# Код выгрузок и импорта (csv, zipfile, zlib) импортируется при первом
+# использовании, чтобы не замедлять запуск бота
+if TYPE_CHECKING:
+    from utils.exporters import TaskExporter
 
 router = Router()
 logger = setup_logger(__name__)
 
+TASKS_PAGE_SIZE = 10  # Количество задач на одной странице /list
+MESSAGE_MAX_LENGTH = 4096  # Ограничение Telegram на длину текста сообщения
+IMPORT_MAX_FILE_SIZE = 20 * 1024 * 1024  # Ограничение Bot API на скачивание файлов
+IMPORT_PROGRESS_INTERVAL = 2.0  # Минимальный интервал обновления прогресса, секунды
+CSV_NEW_ARGS = ("new", "новые")  # Аргументы /list_csv для выгрузки только новых задач
+DUE_CLEAR_ARGS = ("нет", "-", "no")  # Ответы, убирающие срок задачи
+
 
-def _get_db_manager(message: Message) -> DatabaseManager | None:
+def _get_db_manager(message: Message | CallbackQuery) -> TaskStorage | None:
     """
-    Возвращает экземпляр DatabaseManager из контекста бота.
+    Возвращает хранилище задач (SQLite или PostgreSQL) из контекста бота.
 
     Параметры:
-        message (Message): сообщение, в рамках которого выполняется обработчик.
+        message (Message | CallbackQuery): событие, в рамках которого выполняется обработчик.
 
     Возвращает:
-        Optional[DatabaseManager]: менеджер базы данных или None, если не найден.
+        Optional[TaskStorage]: хранилище задач или None, если не найдено.
     """
     return getattr(message.bot, "db_manager", None)
 
 
+def _get_export_executor(message: Message) -> ExportExecutor | None:
+    """
+    Возвращает исполнитель выгрузок из контекста бота.
+
+    Параметры:
+        message (Message): сообщение, в рамках которого выполняется обработчик.
+
+    Возвращает:
+        Optional[ExportExecutor]: исполнитель выгрузок или None, если не найден.
+    """
+    return getattr(message.bot, "export_executor", None)
+
+
+def _render_task_card(row: TaskRow, number: int) -> str:
+    """
+    Формирует текст карточки задачи со статусом и категорией.
+
+    Параметры:
+        row (TaskRow): строка задачи.
+        number (int): порядковый номер задачи в списке (с единицы).
+
+    Возвращает:
+        str: текст сообщения, не превышающий ограничение Telegram.
+    """
+    _, text, _, created_at, status, category = row
+    lines = [
+        f"Задача {number}: {text}",
+        f"Статус: {STATUS_ICONS.get(status, '')} {TASK_STATUSES.get(status, status)}",
+    ]
+    if category:
+        lines.append(f"Категория: {category}")
+    lines.append(f"Создана: {created_at}")
+    card = "\n".join(lines)
+    if len(card) > MESSAGE_MAX_LENGTH:
+        card = card[: MESSAGE_MAX_LENGTH - 1] + "…"
+    return card
+
+
+def _render_tasks_page(rows: list[TaskRow], offset: int, title: str = "Ваши задачи") -> str:
+    """
+    Формирует текст страницы списка задач напрямую из строк базы данных.
+
+    Параметры:
+        rows (list[TaskRow]): строки задач страницы.
+        offset (int): порядковый номер первой задачи страницы (с нуля).
+        title (str): заголовок страницы.
+
+    Возвращает:
+        str: текст сообщения, не превышающий ограничение Telegram.
+    """
+    lines = [f"{title} ({offset + 1}–{offset + len(rows)}):"]
+    lines.extend(
+        f"{index}. {STATUS_ICONS.get(status, '')} {text} (создана: {created_at})"
+        for index, (_, text, _, created_at, status, _) in enumerate(rows, start=offset + 1)
+    )
+    text = "\n".join(lines)
+
+    # Длинные тексты задач могут превысить лимит даже на одной странице
+    if len(text) > MESSAGE_MAX_LENGTH:
+        text = text[: MESSAGE_MAX_LENGTH - 1] + "…"
+    return text
+
+
+async def _load_tasks_page_view(
+    db: TaskStorage,
+    user_id: int,
+    offset: int = 0,
+    direction: str | None = None,
+    anchor: tuple[str, int] | None = None,
+    status: str | None = None,
+) -> tuple[str, InlineKeyboardMarkup | None] | None:
+    """
+    Загружает страницу задач и формирует текст и клавиатуру для нее.
+    Готовое представление хранится в кэше задач, поэтому повторный
+    запрос той же страницы не обращается к базе данных.
+
+    Параметры:
+        db (TaskStorage): хранилище задач.
+        user_id (int): ID пользователя Telegram.
+        offset (int): порядковый номер первой задачи страницы (с нуля).
+        direction (str | None): направление перехода ("prev", "next") или None для первой страницы.
+        anchor (tuple[str, int] | None): ключ (created_at, id) задачи соседней страницы.
+        status (str | None): код статуса для фильтрации или None для всех задач.
+
+    Возвращает:
+        tuple[str, InlineKeyboardMarkup | None] | None: текст и клавиатура страницы
+        или None, если на странице нет задач.
+    """
+    cache = db.cache
+    view_key = ("list_view", offset, direction, anchor, status)
+    snapshot = None
+    if cache is not None:
+        view = cache.get(user_id, view_key)
+        if view is not None:
+            return view
+        snapshot = cache.snapshot(user_id)
+
+    if direction == "prev":
+        rows, has_prev = await db.get_user_task_rows_page(
+            user_id, limit=TASKS_PAGE_SIZE, before=anchor, status=status
+        )
+        has_next = True
+        # При переходе назад номер страницы уточняем по наличию предыдущих задач
+        if not has_prev:
+            offset = 0
+    else:
+        rows, has_next = await db.get_user_task_rows_page(
+            user_id, limit=TASKS_PAGE_SIZE, after=anchor, status=status
+        )
+        has_prev = offset > 0
+
+    if not rows:
+        return None
+
+    title = "Ваши задачи"
+    if status is not None:
+        title = f"Задачи со статусом «{TASK_STATUSES[status]}»"
+    view = (
+        _render_tasks_page(rows, offset, title=title),
+        get_tasks_page_keyboard(
+            rows,
+            offset,
+            TASKS_PAGE_SIZE,
+            has_prev=has_prev,
+            has_next=has_next,
+            status=status or "",
+        ),
+    )
+    if cache is not None:
+        cache.set(user_id, view_key, view, snapshot)
+    return view
+
+
+async def _load_search_page_view(
+    db: TaskStorage, user_id: int, query: str, offset: int = 0
+) -> tuple[str, InlineKeyboardMarkup | None] | None:
+    """
+    Выполняет поиск задач и формирует текст и клавиатуру страницы результатов.
+
+    Параметры:
+        db (TaskStorage): хранилище задач.
+        user_id (int): ID пользователя Telegram.
+        query (str): текст поискового запроса.
+        offset (int): порядковый номер первого результата страницы (с нуля).
+
+    Возвращает:
+        tuple[str, InlineKeyboardMarkup | None] | None: текст и клавиатура страницы
+        или None, если ничего не найдено.
+    """
+    rows, has_next = await db.search_user_task_rows(
+        user_id, query, limit=TASKS_PAGE_SIZE, offset=offset
+    )
+    if not rows:
+        return None
+
+    return (
+        _render_tasks_page(rows, offset, title=f"Найдено по запросу «{query}»"),
+        get_search_page_keyboard(
+            offset, TASKS_PAGE_SIZE, has_prev=offset > 0, has_next=has_next
+        ),
+    )
+
+
 class TaskStates(StatesGroup):
     """
     Состояния для FSM (Finite State Machine).
@@ -36,6 +236,10 @@ class TaskStates(StatesGroup):
     """
 
     waiting_for_task_text = State()  # Ожидание ввода текста задачи
+    waiting_for_import = State()  # Ожидание списка задач или CSV-файла для импорта
+    waiting_for_search_query = State()  # Ожидание текста поискового запроса
+    waiting_for_new_text = State()  # Ожидание нового текста изменяемой задачи
+    waiting_for_due_at = State()  # Ожидание срока задачи для напоминания
 
 
 @router.message(Command("add"))
@@ -89,12 +293,117 @@ async def process_task_text(message: Message, state: FSMContext) -> None:
     await message.answer("Задача сохранена ✅")
 
 
+class _ImportProgress:
+    """
+    Сообщение о ходе импорта большого файла.
+    Отправляется после порции, завершившейся не раньше чем через
+    IMPORT_PROGRESS_INTERVAL секунд от начала импорта, и затем редактируется
+    не чаще того же интервала, чтобы не упираться в лимиты Bot API. Импорт,
+    уложившийся в интервал, обходится без промежуточных сообщений.
+    """
+
+    def __init__(self, message: Message):
+        self._message = message
+        self._status: Message | None = None
+        self._last_update = time.monotonic()
+
+    async def __call__(self, imported: int) -> None:
+        now = time.monotonic()
+        if now - self._last_update < IMPORT_PROGRESS_INTERVAL:
+            return
+        self._last_update = now
+        text = f"Импортировано задач: {imported}…"
+        if self._status is None:
+            self._status = await self._message.answer(text)
+        else:
+            await self._status.edit_text(text)
+
+
+@router.message(Command("import"))
+@router.message(F.text == "📥 Импорт задач")
+async def cmd_import_tasks(message: Message, state: FSMContext) -> None:
+    """
+    Обработчик команды /import и кнопки "📥 Импорт задач".
+    Запрашивает список задач (по одной на строку) или CSV-файл выгрузки.
+
+    Логирует запуск команды на уровне INFO.
+    """
+    logger.info("Команда /import вызвана пользователем %s", message.from_user.id)
+
+    await state.set_state(TaskStates.waiting_for_import)
+    await message.answer(
+        "Отправьте задачи сообщением, по одной на строку, "
+        "или CSV-файл в формате выгрузки /list_csv."
+    )
+
+
+@router.message(TaskStates.waiting_for_import, F.document, flags={"throttling_key": "heavy"})
+@router.message(TaskStates.waiting_for_import, F.text)
+async def process_import(message: Message, state: FSMContext) -> None:
+    """
+    Обработчик списка задач или CSV-файла для импорта.
+    Задачи разбираются потоково и сохраняются порциями через add_tasks_bulk;
+    о ходе импорта большого файла пользователь получает промежуточные сообщения.
+
+    Логирует результат импорта на уровне INFO.
+    """
+    db = _get_db_manager(message)
+    if db is None:
+        logger.error("DatabaseManager не найден при выполнении /import")
+        await message.answer("Ошибка сервера: база данных недоступна.")
+        await state.clear()
+        return
+
+    user_id = message.from_user.id
+    document = message.document
+    if document is not None and (document.file_size or 0) > IMPORT_MAX_FILE_SIZE:
+        await message.answer("Файл слишком большой: допускается не более 20 МБ.")
+        return
+
+    # pylint: disable-next=import-outside-toplevel
+    from utils.task_import import iter_csv_tasks, iter_message_tasks
+
+    try:
+        if document is None:
+            tasks = iter_message_tasks(message.text)
+        else:
+            content = await message.bot.download(document)
+            tasks = iter_csv_tasks(content)
+        imported = await db.add_tasks_bulk(
+            tasks,
+            user_id,
+            chunk_size=Config.IMPORT_CHUNK_SIZE,
+            progress=_ImportProgress(message),
+        )
+    except ValueError as error:
+        logger.warning("Ошибка разбора файла импорта: %s", error)
+        await message.answer(str(error))
+        return
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Не удалось импортировать задачи: %s", error)
+        await message.answer("Не удалось импортировать задачи. Попробуйте позже.")
+        await state.clear()
+        return
+
+    await state.clear()
+    if imported == 0:
+        await message.answer("Не найдено задач для импорта.")
+        return
+
+    logger.info("Пользователь %s импортировал %s задач", user_id, imported)
+    await message.answer(f"Импортировано задач: {imported} ✅")
+
+
 @router.message(Command("list"))
 @router.message(F.text == "📋 Список задач")
-async def cmd_list_tasks(message: Message) -> None:
+async def cmd_list_tasks(message: Message, command: CommandObject | None = None) -> None:
     """
     Обработчик команды /list и кнопки "📋 Список задач".
-    Выводит все задачи пользователя из базы данных.
+    Выводит первую страницу задач пользователя с кнопками навигации
+    и кнопками с номерами задач для смены статуса.
+
+    Аргумент статуса (/list done, /list work, /list postponed) оставляет
+    в списке только задачи с этим статусом; фильтр выполняется в SQLite.
 
     Если задач нет, выводит соответствующее сообщение.
     Логирует запрос списка задач на уровне INFO.
@@ -105,74 +414,798 @@ async def cmd_list_tasks(message: Message) -> None:
         await message.answer("Ошибка сервера: база данных недоступна.")
         return
 
+    status = None
+    if command is not None and command.args:
+        status = parse_task_status(command.args)
+        if status is None:
+            await message.answer(
+                f"Неизвестный статус «{command.args.strip()}». "
+                f"Доступные статусы: {', '.join(TASK_STATUSES)}."
+            )
+            return
+
     try:
-        tasks = await db.get_user_tasks(message.from_user.id)
+        view = await _load_tasks_page_view(db, message.from_user.id, status=status)
     except Exception as error:  # pylint: disable=broad-except
         logger.exception("Не удалось получить список задач: %s", error)
         await message.answer("Не удалось получить список задач.")
         return
 
-    if not tasks:
-        await message.answer("У вас пока нет задач. Добавьте первую командой /add.")
+    if view is None:
+        if status is not None:
+            await message.answer(f"Нет задач со статусом «{TASK_STATUSES[status]}».")
+        else:
+            await message.answer("У вас пока нет задач. Добавьте первую командой /add.")
         return
 
-    lines = [
-        f"{index}. {task.get_text()} (создана: {task.get_created_at()})"
-        for index, task in enumerate(tasks, start=1)
-    ]
+    logger.info("Пользователь %s запросил список задач", message.from_user.id)
+    text, keyboard = view
+    await message.answer(text, reply_markup=keyboard)
+
+
+@router.callback_query(TaskPageCallback.filter())
+async def cb_tasks_page(callback: CallbackQuery, callback_data: TaskPageCallback) -> None:
+    """
+    Обработчик кнопок навигации по списку задач.
+    Загружает соседнюю страницу по ключу (created_at, id) и обновляет сообщение.
+
+    Логирует переход между страницами на уровне INFO.
+    """
+    db = _get_db_manager(callback)
+    if db is None:
+        logger.error("DatabaseManager не найден при переключении страницы списка")
+        await callback.answer("Ошибка сервера: база данных недоступна.", show_alert=True)
+        return
+
+    try:
+        view = await _load_tasks_page_view(
+            db,
+            callback.from_user.id,
+            offset=callback_data.offset,
+            direction=callback_data.direction,
+            anchor=get_page_anchor(callback_data),
+            status=callback_data.status or None,
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Не удалось получить страницу задач: %s", error)
+        await callback.answer("Не удалось получить список задач.", show_alert=True)
+        return
+
+    if view is None:
+        await callback.answer("Здесь больше нет задач.")
+        return
 
     logger.info(
-        "Пользователь %s запросил список задач (%s шт.)",
-        message.from_user.id,
-        len(tasks),
+        "Пользователь %s открыл страницу списка задач с позиции %s",
+        callback.from_user.id,
+        callback_data.offset + 1,
+    )
+    # Слишком старые сообщения недоступны для редактирования (InaccessibleMessage)
+    if isinstance(callback.message, Message):
+        text, keyboard = view
+        await callback.message.edit_text(text, reply_markup=keyboard)
+    await callback.answer()
+
+
+@router.callback_query(TaskOpenCallback.filter())
+async def cb_task_open(callback: CallbackQuery, callback_data: TaskOpenCallback) -> None:
+    """
+    Обработчик кнопок с номерами задач на странице списка.
+    Отправляет карточку задачи с кнопками смены статуса, изменения и удаления.
+
+    Логирует открытие карточки на уровне INFO.
+    """
+    db = _get_db_manager(callback)
+    if db is None:
+        logger.error("DatabaseManager не найден при открытии задачи")
+        await callback.answer("Ошибка сервера: база данных недоступна.", show_alert=True)
+        return
+
+    try:
+        row = await db.get_task_row(callback_data.task_id, callback.from_user.id)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Не удалось получить задачу: %s", error)
+        await callback.answer("Не удалось получить задачу.", show_alert=True)
+        return
+
+    if row is None:
+        await callback.answer("Задача не найдена.", show_alert=True)
+        return
+
+    logger.info(
+        "Пользователь %s открыл задачу %s", callback.from_user.id, callback_data.task_id
+    )
+    if isinstance(callback.message, Message):
+        await callback.message.answer(
+            _render_task_card(row, callback_data.number),
+            reply_markup=get_task_keyboard(row[0], row[4], callback_data.number),
+        )
+    await callback.answer()
+
+
+@router.callback_query(TaskStatusCallback.filter())
+async def cb_task_status(callback: CallbackQuery, callback_data: TaskStatusCallback) -> None:
+    """
+    Обработчик кнопок смены статуса в карточке задачи.
+    Изменяет статус одним запросом UPDATE и обновляет карточку.
+
+    Логирует изменение статуса на уровне INFO.
+    """
+    db = _get_db_manager(callback)
+    if db is None:
+        logger.error("DatabaseManager не найден при изменении статуса задачи")
+        await callback.answer("Ошибка сервера: база данных недоступна.", show_alert=True)
+        return
+
+    if callback_data.status not in TASK_STATUSES:
+        await callback.answer("Неизвестный статус.", show_alert=True)
+        return
+
+    user_id = callback.from_user.id
+    try:
+        updated = await db.set_task_status(callback_data.task_id, user_id, callback_data.status)
+        row = await db.get_task_row(callback_data.task_id, user_id) if updated else None
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Не удалось изменить статус задачи: %s", error)
+        await callback.answer("Не удалось изменить статус.", show_alert=True)
+        return
+
+    if row is None:
+        await callback.answer("Задача не найдена.", show_alert=True)
+        return
+
+    logger.info(
+        "Пользователь %s изменил статус задачи %s на %s",
+        user_id,
+        callback_data.task_id,
+        callback_data.status,
     )
-    await message.answer("\n".join(lines))
+    if isinstance(callback.message, Message):
+        await callback.message.edit_text(
+            _render_task_card(row, callback_data.number),
+            reply_markup=get_task_keyboard(row[0], row[4], callback_data.number),
+        )
+    await callback.answer(f"Статус: {TASK_STATUSES[callback_data.status]}")
+
 
+@router.callback_query(TaskEditCallback.filter())
+async def cb_task_edit(
+    callback: CallbackQuery, callback_data: TaskEditCallback, state: FSMContext
+) -> None:
+    """
+    Обработчик кнопки "✏️ Изменить" в карточке задачи.
+    Запрашивает новый текст задачи; ID задачи сохраняется в данных FSM.
 
-@router.message(Command("list_csv"))
-@router.message(F.text == "📊 CSV выгрузка")
-async def cmd_list_csv(message: Message) -> None:
+    Логирует запуск изменения на уровне INFO.
     """
-    Обработчик команды /list_csv и кнопки "📊 CSV выгрузка".
-    Генерирует CSV-файл с задачами и отправляет пользователю.
+    logger.info(
+        "Пользователь %s изменяет задачу %s", callback.from_user.id, callback_data.task_id
+    )
+    await state.set_state(TaskStates.waiting_for_new_text)
+    await state.update_data(edit_task_id=callback_data.task_id, edit_number=callback_data.number)
+    if isinstance(callback.message, Message):
+        await callback.message.answer(f"Введите новый текст задачи {callback_data.number}:")
+    await callback.answer()
+
 
-    Логирует генерацию и отправку CSV на уровне INFO.
+@router.message(TaskStates.waiting_for_new_text)
+async def process_new_text(message: Message, state: FSMContext) -> None:
+    """
+    Обработчик ввода нового текста задачи.
+    Изменяет текст одним запросом UPDATE и отправляет обновленную карточку.
+
+    Логирует изменение задачи на уровне INFO.
     """
     db = _get_db_manager(message)
     if db is None:
-        logger.error("DatabaseManager не найден при выполнении /list_csv")
+        logger.error("DatabaseManager не найден при изменении задачи")
         await message.answer("Ошибка сервера: база данных недоступна.")
+        await state.clear()
         return
 
+    data = await state.get_data()
+    task_id = data.get("edit_task_id")
+    number = data.get("edit_number", 1)
+    user_id = message.from_user.id
     try:
-        tasks = await db.get_user_tasks(message.from_user.id)
+        updated = await db.update_task_text(task_id, user_id, message.text)
+        row = await db.get_task_row(task_id, user_id) if updated else None
+    except ValueError as error:
+        logger.warning("Ошибка валидации при изменении задачи: %s", error)
+        await message.answer(str(error))
+        return
     except Exception as error:  # pylint: disable=broad-except
-        logger.exception("Не удалось получить задачи для CSV: %s", error)
-        await message.answer("Не удалось подготовить CSV-файл.")
+        logger.exception("Не удалось изменить задачу: %s", error)
+        await message.answer("Не удалось изменить задачу. Попробуйте позже.")
+        await state.clear()
+        return
+
+    await state.clear()
+    if row is None:
+        await message.answer("Задача не найдена.")
         return
 
-    if not tasks:
-        await message.answer("Нет задач для выгрузки. Добавьте их командой /add.")
+    logger.info("Пользователь %s изменил текст задачи %s", user_id, task_id)
+    await message.answer(
+        _render_task_card(row, number), reply_markup=get_task_keyboard(row[0], row[4], number)
+    )
+
+
+@router.callback_query(TaskDueCallback.filter())
+async def cb_task_due(
+    callback: CallbackQuery, callback_data: TaskDueCallback, state: FSMContext
+) -> None:
+    """
+    Обработчик кнопки "⏰ Срок" в карточке задачи.
+    Запрашивает срок задачи; ID задачи сохраняется в данных FSM.
+
+    Логирует запуск изменения срока на уровне INFO.
+    """
+    logger.info(
+        "Пользователь %s задает срок задачи %s", callback.from_user.id, callback_data.task_id
+    )
+    await state.set_state(TaskStates.waiting_for_due_at)
+    await state.update_data(due_task_id=callback_data.task_id, due_number=callback_data.number)
+    if isinstance(callback.message, Message):
+        await callback.message.answer(
+            f"Когда напомнить о задаче {callback_data.number}?\n{DUE_FORMAT_HINT}"
+        )
+    await callback.answer()
+
+
+@router.message(TaskStates.waiting_for_due_at, F.text)
+async def process_due_at(message: Message, state: FSMContext) -> None:
+    """
+    Обработчик ввода срока задачи.
+    Сохраняет срок одним запросом UPDATE; планировщик напоминаний узнает
+    о нем сразу, без опроса базы.
+
+    Логирует изменение срока на уровне INFO.
+    """
+    db = _get_db_manager(message)
+    if db is None:
+        logger.error("DatabaseManager не найден при изменении срока задачи")
+        await message.answer("Ошибка сервера: база данных недоступна.")
+        await state.clear()
         return
 
+    due_at = None
+    if message.text.strip().lower() not in DUE_CLEAR_ARGS:
+        due = parse_due_at(message.text)
+        if due is None:
+            await message.answer(f"Не удалось распознать срок.\n{DUE_FORMAT_HINT}")
+            return
+        due_at = format_created_at(due)
+        if due_at <= format_created_at():
+            await message.answer("Срок уже прошел. Укажите время в будущем.")
+            return
+
+    data = await state.get_data()
+    task_id = data.get("due_task_id")
+    number = data.get("due_number", 1)
+    user_id = message.from_user.id
     try:
-        file_path = CSVGenerator.generate_tasks_csv(tasks)
+        updated = await db.set_task_due_at(task_id, user_id, due_at)
     except Exception as error:  # pylint: disable=broad-except
-        logger.exception("Ошибка при генерации CSV: %s", error)
-        await message.answer("Не удалось создать CSV-файл.")
+        logger.exception("Не удалось изменить срок задачи: %s", error)
+        await message.answer("Не удалось изменить срок. Попробуйте позже.")
+        await state.clear()
+        return
+
+    await state.clear()
+    if not updated:
+        await message.answer("Задача не найдена.")
+        return
+
+    logger.info("Пользователь %s изменил срок задачи %s", user_id, task_id)
+    if due_at is None:
+        await message.answer(f"Срок задачи {number} убран, напоминания не будет.")
+    else:
+        await message.answer(f"⏰ Напомню о задаче {number} {format_due_at(due_at)}.")
+
+
+@router.callback_query(TaskDeleteCallback.filter())
+async def cb_task_delete(callback: CallbackQuery, callback_data: TaskDeleteCallback) -> None:
+    """
+    Обработчик кнопок удаления в карточке задачи.
+    Первое нажатие запрашивает подтверждение, подтверждение удаляет
+    задачу одним запросом DELETE, отмена возвращает кнопки карточки.
+
+    Логирует удаление задачи на уровне INFO.
+    """
+    if not isinstance(callback.message, Message):
+        await callback.answer()
+        return
+
+    if not callback_data.confirm and not callback_data.cancel:
+        await callback.message.edit_reply_markup(
+            reply_markup=get_task_delete_keyboard(callback_data.task_id, callback_data.number)
+        )
+        await callback.answer("Удалить задачу?")
+        return
+
+    db = _get_db_manager(callback)
+    if db is None:
+        logger.error("DatabaseManager не найден при удалении задачи")
+        await callback.answer("Ошибка сервера: база данных недоступна.", show_alert=True)
+        return
+
+    user_id = callback.from_user.id
+    if callback_data.cancel:
+        # Текст карточки не менялся, поэтому возвращаем только ее кнопки
+        try:
+            row = await db.get_task_row(callback_data.task_id, user_id)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.exception("Не удалось получить задачу: %s", error)
+            await callback.answer("Не удалось получить задачу.", show_alert=True)
+            return
+        if row is None:
+            await callback.answer("Задача не найдена.", show_alert=True)
+            return
+        await callback.message.edit_reply_markup(
+            reply_markup=get_task_keyboard(row[0], row[4], callback_data.number)
+        )
+        await callback.answer()
+        return
+
+    try:
+        deleted = await db.delete_task(callback_data.task_id, user_id)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Не удалось удалить задачу: %s", error)
+        await callback.answer("Не удалось удалить задачу.", show_alert=True)
+        return
+
+    if not deleted:
+        await callback.answer("Задача не найдена.", show_alert=True)
+        return
+
+    logger.info("Пользователь %s удалил задачу %s", user_id, callback_data.task_id)
+    await callback.message.edit_text(f"Задача {callback_data.number} удалена 🗑")
+    await callback.answer()
+
+
+@router.message(Command("clear_done"))
+async def cmd_clear_done(message: Message) -> None:
+    """
+    Обработчик команды /clear_done.
+    Запрашивает подтверждение удаления всех выполненных задач.
+
+    Логирует запуск команды на уровне INFO.
+    """
+    logger.info("Команда /clear_done вызвана пользователем %s", message.from_user.id)
+    await message.answer(
+        "Удалить все выполненные задачи? Это действие нельзя отменить.",
+        reply_markup=get_clear_tasks_keyboard("done"),
+    )
+
+
+@router.callback_query(ClearTasksCallback.filter())
+async def cb_clear_tasks(callback: CallbackQuery, callback_data: ClearTasksCallback) -> None:
+    """
+    Обработчик кнопок удаления всех задач с одним статусом.
+    Кнопка в списке запрашивает подтверждение, подтверждение удаляет
+    задачи одним запросом DELETE по индексу (user_id, status, ...).
+
+    Логирует количество удаленных задач на уровне INFO.
+    """
+    status = callback_data.status
+    if status not in TASK_STATUSES or not isinstance(callback.message, Message):
+        await callback.answer("Неизвестный статус.", show_alert=True)
+        return
+
+    if callback_data.cancel:
+        await callback.message.edit_text("Удаление отменено.")
+        await callback.answer()
+        return
+
+    if not callback_data.confirm:
+        await callback.message.answer(
+            f"Удалить все задачи со статусом «{TASK_STATUSES[status]}»? "
+            "Это действие нельзя отменить.",
+            reply_markup=get_clear_tasks_keyboard(status),
+        )
+        await callback.answer()
+        return
+
+    db = _get_db_manager(callback)
+    if db is None:
+        logger.error("DatabaseManager не найден при удалении задач")
+        await callback.answer("Ошибка сервера: база данных недоступна.", show_alert=True)
+        return
+
+    user_id = callback.from_user.id
+    try:
+        deleted = await db.delete_user_tasks_by_status(user_id, status)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Не удалось удалить задачи: %s", error)
+        await callback.answer("Не удалось удалить задачи.", show_alert=True)
+        return
+
+    logger.info("Пользователь %s удалил задачи со статусом %s: %s", user_id, status, deleted)
+    if deleted:
+        await callback.message.edit_text(f"Удалено задач: {deleted} 🧹")
+    else:
+        await callback.message.edit_text(
+            f"Задач со статусом «{TASK_STATUSES[status]}» нет."
+        )
+    await callback.answer()
+
+
+async def _answer_search(message: Message, state: FSMContext, query: str) -> None:
+    """
+    Выполняет поиск и отправляет первую страницу результатов.
+    Запрос сохраняется в данных FSM для кнопок навигации.
+    """
+    db = _get_db_manager(message)
+    if db is None:
+        logger.error("DatabaseManager не найден при выполнении /search")
+        await message.answer("Ошибка сервера: база данных недоступна.")
+        await state.clear()
+        return
+
+    query = query.strip()
+    await state.set_state(None)
+    await state.update_data(search_query=query)
+
+    try:
+        view = await _load_search_page_view(db, message.from_user.id, query)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Не удалось выполнить поиск задач: %s", error)
+        await message.answer("Не удалось выполнить поиск.")
+        return
+
+    if view is None:
+        await message.answer("Ничего не найдено. Попробуйте другие слова: /search")
+        return
+
+    logger.info("Пользователь %s выполнил поиск задач", message.from_user.id)
+    text, keyboard = view
+    await message.answer(text, reply_markup=keyboard)
+
+
+@router.message(Command("search"))
+@router.message(F.text == "🔍 Поиск")
+async def cmd_search_tasks(
+    message: Message, state: FSMContext, command: CommandObject | None = None
+) -> None:
+    """
+    Обработчик команды /search и кнопки "🔍 Поиск".
+    С аргументом (/search молоко) сразу выполняет поиск,
+    без аргумента запрашивает текст запроса.
+
+    Логирует запуск команды на уровне INFO.
+    """
+    logger.info("Команда /search вызвана пользователем %s", message.from_user.id)
+
+    if command is not None and command.args:
+        await _answer_search(message, state, command.args)
+        return
+
+    await state.set_state(TaskStates.waiting_for_search_query)
+    await message.answer("Введите слова для поиска задач:")
+
+
+@router.message(TaskStates.waiting_for_search_query, F.text)
+async def process_search_query(message: Message, state: FSMContext) -> None:
+    """
+    Обработчик ввода поискового запроса.
+    Выводит первую страницу найденных задач с кнопками навигации.
+    """
+    await _answer_search(message, state, message.text)
+
+
+@router.callback_query(SearchPageCallback.filter())
+async def cb_search_page(
+    callback: CallbackQuery, callback_data: SearchPageCallback, state: FSMContext
+) -> None:
+    """
+    Обработчик кнопок навигации по результатам поиска.
+    Повторяет последний запрос пользователя из данных FSM с новым смещением.
+
+    Логирует переход между страницами на уровне INFO.
+    """
+    db = _get_db_manager(callback)
+    if db is None:
+        logger.error("DatabaseManager не найден при переключении страницы поиска")
+        await callback.answer("Ошибка сервера: база данных недоступна.", show_alert=True)
+        return
+
+    query = (await state.get_data()).get("search_query")
+    if not query:
+        await callback.answer("Поиск устарел, выполните /search снова.", show_alert=True)
+        return
+
+    try:
+        view = await _load_search_page_view(
+            db, callback.from_user.id, query, offset=callback_data.offset
+        )
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Не удалось получить страницу поиска: %s", error)
+        await callback.answer("Не удалось выполнить поиск.", show_alert=True)
+        return
+
+    if view is None:
+        await callback.answer("Здесь больше нет задач.")
         return
 
     logger.info(
-        "Пользователю %s отправляется CSV-файл %s",
-        message.from_user.id,
-        file_path,
+        "Пользователь %s открыл страницу поиска с позиции %s",
+        callback.from_user.id,
+        callback_data.offset + 1,
+    )
+    if isinstance(callback.message, Message):
+        text, keyboard = view
+        await callback.message.edit_text(text, reply_markup=keyboard)
+    await callback.answer()
+
+
+class _ExportedRows:
+    """
+    Пропускает порции строк задач в экспортер и запоминает
+    количество выгруженных задач и их максимальный ID.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.max_id = 0
+
+    async def track(
+        self, row_chunks: AsyncIterable[List[TaskRow]]
+    ) -> AsyncIterator[List[TaskRow]]:
+        """Возвращает те же порции строк, обновляя счетчики."""
+        async for rows in row_chunks:
+            self.count += len(rows)
+            self.max_id = max(self.max_id, max(row[0] for row in rows))
+            yield rows
+
+
+def _parse_export_args(args: str | None) -> Tuple[str | None, bool, str | None]:
+    """
+    Разбирает аргументы команд выгрузки, например «new xlsx».
+
+    Параметры:
+        args (Optional[str]): текст после команды.
+
+    Возвращает:
+        Tuple[Optional[str], bool, Optional[str]]: имя формата (None, если не указан),
+        признак выгрузки только новых задач и нераспознанный аргумент (None, если все понятно).
+    """
+    from utils.exporters import EXPORTERS  # pylint: disable=import-outside-toplevel
+
+    export_format = None
+    only_new = False
+    for token in (args or "").lower().split():
+        if token in CSV_NEW_ARGS:
+            only_new = True
+        elif token in EXPORTERS and export_format is None:
+            export_format = token
+        else:
+            return export_format, only_new, token
+    return export_format, only_new, None
+
+
+async def _build_export(
+    message: Message,
+    db: TaskStorage,
+    user_id: int,
+    task_exporter: TaskExporter,
+    after_id: int | None,
+) -> Tuple[bytes, _ExportedRows]:
+    """
+    Формирует файл выгрузки задач пользователя через ExportExecutor, если он доступен.
+
+    Параметры:
+        message (Message): сообщение, в чат которого отправляется выгрузка.
+        db (TaskStorage): хранилище задач.
+        user_id (int): ID пользователя Telegram.
+        task_exporter (TaskExporter): экспортер выбранного формата.
+        after_id (Optional[int]): выгружать только задачи с большим ID.
+
+    Возвращает:
+        Tuple[bytes, _ExportedRows]: содержимое файла и сведения о выгруженных задачах.
+    """
+    from utils.exporters import build_export  # pylint: disable=import-outside-toplevel
+
+    exported = _ExportedRows()
+    exporter = _get_export_executor(message)
+    if exporter is None:
+        content, _ = await build_export(
+            task_exporter, exported.track(db.iter_user_task_rows(user_id, after_id=after_id))
+        )
+        return content, exported
+
+    if exporter.is_saturated(user_id):
+        await message.answer("Выгрузка поставлена в очередь, файл скоро будет готов ⏳")
+    content, _ = await exporter.submit(
+        user_id,
+        lambda: build_export(
+            task_exporter,
+            exported.track(db.iter_user_task_rows(user_id, after_id=after_id)),
+            executor=exporter.executor,
+        ),
+    )
+    return content, exported
+
+
+async def _send_export(
+    message: Message, db: TaskStorage, user_id: int, export_format: str, only_new: bool
+) -> None:
+    """
+    Формирует выгрузку задач в выбранном формате и отправляет ее в чат сообщения.
+
+    Полная выгрузка CSV без изменений задач с прошлого раза отправляется
+    повторно по сохраненному file_id без чтения задач и формирования файла.
+
+    Параметры:
+        message (Message): сообщение, в чат которого отправляется выгрузка.
+        db (TaskStorage): хранилище задач.
+        user_id (int): ID пользователя Telegram.
+        export_format (str): имя формата из EXPORTERS.
+        only_new (bool): выгружать только задачи, добавленные после прошлой выгрузки.
+    """
+    from utils.exporters import CsvExporter, get_exporter  # pylint: disable=import-outside-toplevel
+
+    task_exporter = get_exporter(export_format)
+    assert task_exporter is not None
+    reusable = export_format == CsvExporter.name and not only_new
+
+    try:
+        record = await db.get_csv_export(user_id)
+    except Exception as error:  # pylint: disable=broad-except
+        # Без сохраненной выгрузки файл просто формируется заново
+        logger.exception("Не удалось получить сведения о прошлой выгрузке: %s", error)
+        record = None
+
+    if reusable and record is not None and record[0] is not None:
+        try:
+            await message.answer_document(record[0], caption="Задачи в формате CSV")
+            logger.info("Пользователю %s повторно отправлен CSV-файл по file_id", user_id)
+            return
+        except TelegramBadRequest as error:
+            # Telegram больше не принимает file_id: формируем файл заново
+            logger.warning("Сохраненный CSV-файл недоступен: %s", error)
+
+    after_id = None
+    if only_new:
+        after_id = record[3] if record is not None else 0
+
+    try:
+        content, exported = await _build_export(message, db, user_id, task_exporter, after_id)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Ошибка при формировании выгрузки %s: %s", export_format, error)
+        await message.answer("Не удалось создать файл выгрузки.")
+        return
+
+    if exported.count == 0:
+        if only_new:
+            await message.answer("Новых задач с прошлой выгрузки нет.")
+        else:
+            await message.answer("Нет задач для выгрузки. Добавьте их командой /add.")
+        return
+
+    logger.info(
+        "Пользователю %s отправляется выгрузка %s (%s задач, %s байт)",
+        user_id,
+        export_format,
+        exported.count,
+        len(content),
     )
 
-    csv_file = FSInputFile(file_path)
-    await message.answer_document(csv_file, caption="Задачи в формате CSV")
+    filename = task_exporter.filename
+    if only_new:
+        stem, _, extension = filename.partition(".")
+        filename = f"{stem}_new.{extension}"
+        caption = f"Новые задачи с прошлой выгрузки: {exported.count}"
+    else:
+        caption = f"Задачи в формате {task_exporter.label}"
+    sent = await message.answer_document(
+        BufferedInputFile(content, filename=filename), caption=caption
+    )
 
+    file_id = sent.document.file_id if sent.document is not None else None
     try:
-        os.remove(file_path)
-    except OSError as error:
-        logger.warning("Не удалось удалить временный CSV-файл: %s", error)
+        if reusable:
+            await db.save_csv_export(user_id, file_id, exported.max_id, exported.count)
+        else:
+            await db.save_csv_export(user_id, None, exported.max_id)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.exception("Не удалось сохранить сведения о выгрузке: %s", error)
+
+
+def _get_export_format_keyboard(only_new: bool) -> InlineKeyboardMarkup:
+    """Возвращает клавиатуру выбора среди всех доступных форматов выгрузки."""
+    from utils.exporters import EXPORTERS  # pylint: disable=import-outside-toplevel
+
+    return get_export_format_keyboard(
+        [(name, exporter.label) for name, exporter in EXPORTERS.items()], only_new
+    )
+
+
+@router.message(Command("list_csv"), flags={"throttling_key": "heavy"})
+@router.message(Command("export", magic=F.args), flags={"throttling_key": "heavy"})
+@router.message(F.text == "📊 CSV выгрузка", flags={"throttling_key": "heavy"})
+async def cmd_list_csv(message: Message, command: CommandObject | None = None) -> None:
+    """
+    Обработчик команд /list_csv, /export с аргументами и кнопки "📊 CSV выгрузка".
+    Потоково формирует файл с задачами в памяти и отправляет пользователю.
+
+    Если задачи не менялись с прошлой выгрузки, CSV повторно отправляется
+    по сохраненному file_id без чтения задач и формирования файла.
+    Аргумент new выгружает только задачи, добавленные после предыдущей
+    выгрузки; аргумент формата (например, /list_csv gzip или /export xlsx)
+    выбирает формат файла. /export без формата предлагает выбрать его кнопками.
+
+    Выгрузка выполняется через ExportExecutor: если все слоты заняты,
+    пользователь получает уведомление о постановке в очередь.
+
+    Логирует генерацию и отправку выгрузки на уровне INFO.
+    """
+    db = _get_db_manager(message)
+    if db is None:
+        logger.error("DatabaseManager не найден при выполнении /list_csv")
+        await message.answer("Ошибка сервера: база данных недоступна.")
+        return
+
+    from utils.exporters import EXPORTERS, CsvExporter  # pylint: disable=import-outside-toplevel
+
+    export_format, only_new, unknown = _parse_export_args(command.args if command else None)
+    if unknown is not None:
+        await message.answer(
+            f"Неизвестный аргумент «{unknown}». Доступные форматы: {', '.join(EXPORTERS)}; "
+            "new — только новые задачи."
+        )
+        return
+
+    if export_format is None and command is not None and command.command == "export":
+        await message.answer(
+            "Выберите формат выгрузки:", reply_markup=_get_export_format_keyboard(only_new)
+        )
+        return
+
+    await _send_export(
+        message, db, message.from_user.id, export_format or CsvExporter.name, only_new
+    )
+
+
+@router.message(Command("export"))
+@router.message(F.text == "📦 Экспорт")
+async def cmd_export(message: Message) -> None:
+    """
+    Обработчик команды /export без аргументов и кнопки "📦 Экспорт".
+    Предлагает выбрать формат выгрузки кнопками.
 
+    Логирует запуск команды на уровне INFO.
+    """
+    logger.info("Команда /export вызвана пользователем %s", message.from_user.id)
+    await message.answer(
+        "Выберите формат выгрузки:", reply_markup=_get_export_format_keyboard(False)
+    )
+
+
+@router.callback_query(ExportFormatCallback.filter(), flags={"throttling_key": "heavy"})
+async def cb_export_format(callback: CallbackQuery, callback_data: ExportFormatCallback) -> None:
+    """
+    Обработчик кнопок выбора формата выгрузки.
+    Отправляет выгрузку в выбранном формате в чат сообщения с кнопками.
+
+    Логирует выбор формата на уровне INFO.
+    """
+    db = _get_db_manager(callback)
+    if db is None:
+        logger.error("DatabaseManager не найден при выборе формата выгрузки")
+        await callback.answer("Ошибка сервера: база данных недоступна.", show_alert=True)
+        return
+
+    from utils.exporters import EXPORTERS  # pylint: disable=import-outside-toplevel
+
+    if callback_data.fmt not in EXPORTERS or not isinstance(callback.message, Message):
+        await callback.answer("Формат выгрузки недоступен.", show_alert=True)
+        return
+
+    logger.info(
+        "Пользователь %s выбрал формат выгрузки %s", callback.from_user.id, callback_data.fmt
+    )
+    await callback.answer()
+    await _send_export(
+        callback.message, db, callback.from_user.id, callback_data.fmt, callback_data.only_new
+    )
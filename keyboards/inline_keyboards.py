@@ -0,0 +1,427 @@
+"""
+Модуль для определения inline-клавиатур бота.
+Содержит фабрики callback-данных, клавиатуры навигации по спискам
+и действия с задачами.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from aiogram.filters.callback_data import CallbackData
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from database.models import TASK_STATUSES, TaskRow
+
+# Значки статусов задач в списке и на кнопках
+STATUS_ICONS = {"work": "🔄", "done": "✅", "postponed": "⏸"}
+TASK_BUTTONS_PER_ROW = 5  # Кнопок с номерами задач в одном ряду
+
+
+class TaskPageCallback(CallbackData, prefix="tasks"):
+    """
+    Callback-данные кнопок навигации по списку задач.
+
+    Атрибуты:
+        direction (str): направление перехода ("prev" или "next").
+        created_at (str): дата создания задачи-ключа в компактном виде (только цифры).
+        task_id (int): ID задачи-ключа.
+        offset (int): порядковый номер первой задачи новой страницы (с нуля).
+        status (str): код статуса фильтра списка или пустая строка для всех задач.
+    """
+
+    direction: str
+    created_at: str
+    task_id: int
+    offset: int
+    status: str = ""
+
+
+class TaskOpenCallback(CallbackData, prefix="task"):
+    """
+    Callback-данные кнопок с номерами задач на странице списка.
+
+    Атрибуты:
+        task_id (int): ID задачи.
+        number (int): порядковый номер задачи в списке (с единицы).
+    """
+
+    task_id: int
+    number: int
+
+
+class TaskStatusCallback(CallbackData, prefix="status"):
+    """
+    Callback-данные кнопок изменения статуса задачи.
+
+    Атрибуты:
+        task_id (int): ID задачи.
+        status (str): код нового статуса из TASK_STATUSES.
+        number (int): порядковый номер задачи в списке (с единицы).
+    """
+
+    task_id: int
+    status: str
+    number: int
+
+
+class TaskEditCallback(CallbackData, prefix="edit"):
+    """
+    Callback-данные кнопки изменения текста задачи.
+
+    Атрибуты:
+        task_id (int): ID задачи.
+        number (int): порядковый номер задачи в списке (с единицы).
+    """
+
+    task_id: int
+    number: int
+
+
+class TaskDueCallback(CallbackData, prefix="due"):
+    """
+    Callback-данные кнопки установки срока задачи и напоминания.
+
+    Атрибуты:
+        task_id (int): ID задачи.
+        number (int): порядковый номер задачи в списке (с единицы).
+    """
+
+    task_id: int
+    number: int
+
+
+class TaskDeleteCallback(CallbackData, prefix="delete"):
+    """
+    Callback-данные кнопок удаления задачи.
+
+    Атрибуты:
+        task_id (int): ID задачи.
+        number (int): порядковый номер задачи в списке (с единицы).
+        confirm (bool): False — запросить подтверждение, True — удалить.
+        cancel (bool): отменить удаление и вернуть карточку задачи.
+    """
+
+    task_id: int
+    number: int
+    confirm: bool = False
+    cancel: bool = False
+
+
+class ClearTasksCallback(CallbackData, prefix="clear"):
+    """
+    Callback-данные кнопок удаления всех задач с одним статусом
+    (например, «Удалить выполненные»).
+
+    Атрибуты:
+        status (str): код статуса удаляемых задач.
+        confirm (bool): False — запросить подтверждение, True — удалить.
+        cancel (bool): отменить удаление.
+    """
+
+    status: str
+    confirm: bool = False
+    cancel: bool = False
+
+
+class SearchPageCallback(CallbackData, prefix="search"):
+    """
+    Callback-данные кнопок навигации по результатам поиска.
+    Сам запрос не помещается в ограничение 64 байта и хранится в данных FSM.
+
+    Атрибуты:
+        offset (int): порядковый номер первого результата новой страницы (с нуля).
+    """
+
+    offset: int
+
+
+class ExportFormatCallback(CallbackData, prefix="export"):
+    """
+    Callback-данные кнопок выбора формата выгрузки.
+
+    Атрибуты:
+        fmt (str): имя формата выгрузки (csv, gzip, zip, xlsx, jsonl).
+        only_new (bool): выгружать ли только задачи, добавленные после прошлой выгрузки.
+    """
+
+    fmt: str
+    only_new: bool
+
+
+def pack_created_at(created_at: str) -> str:
+    """
+    Преобразует дату создания задачи в компактный вид для callback-данных.
+    Символ «:» зарезервирован разделителем callback-данных, поэтому остаются только цифры.
+
+    Параметры:
+        created_at (str): дата в формате YYYY-MM-DDTHH:MM:SS.ffffff.
+    """
+    return "".join(char for char in created_at if char.isdigit())
+
+
+def unpack_created_at(packed: str) -> str:
+    """
+    Восстанавливает дату создания задачи из компактного вида.
+
+    Параметры:
+        packed (str): строка из 20 цифр YYYYMMDDHHMMSSffffff.
+    """
+    return (
+        f"{packed[0:4]}-{packed[4:6]}-{packed[6:8]}T"
+        f"{packed[8:10]}:{packed[10:12]}:{packed[12:14]}.{packed[14:20]}"
+    )
+
+
+def get_page_anchor(callback_data: TaskPageCallback) -> Tuple[str, int]:
+    """
+    Возвращает ключ (created_at, id) задачи, относительно которой строится страница.
+
+    Параметры:
+        callback_data (TaskPageCallback): данные нажатой кнопки.
+    """
+    return unpack_created_at(callback_data.created_at), callback_data.task_id
+
+
+def get_tasks_page_keyboard(
+    rows: Sequence[TaskRow],
+    offset: int,
+    page_size: int,
+    has_prev: bool,
+    has_next: bool,
+    status: str = "",
+) -> Optional[InlineKeyboardMarkup]:
+    """
+    Создает клавиатуру страницы списка задач: кнопки с номерами задач
+    для открытия карточки задачи и кнопки навигации.
+
+    Параметры:
+        rows (Sequence[TaskRow]): строки задач текущей страницы.
+        offset (int): порядковый номер первой задачи страницы (с нуля).
+        page_size (int): размер страницы.
+        has_prev (bool): есть ли предыдущая страница.
+        has_next (bool): есть ли следующая страница.
+        status (str): код статуса фильтра списка или пустая строка для всех задач.
+
+    Возвращает:
+        Optional[InlineKeyboardMarkup]: клавиатура или None, если задач нет.
+    """
+    if not rows:
+        return None
+
+    task_buttons = [
+        InlineKeyboardButton(
+            text=str(number),
+            callback_data=TaskOpenCallback(task_id=row[0], number=number).pack(),
+        )
+        for number, row in enumerate(rows, start=offset + 1)
+    ]
+    keyboard = [
+        task_buttons[start:start + TASK_BUTTONS_PER_ROW]
+        for start in range(0, len(task_buttons), TASK_BUTTONS_PER_ROW)
+    ]
+
+    buttons: List[InlineKeyboardButton] = []
+
+    if has_prev:
+        first_id, first_created_at = rows[0][0], rows[0][3]
+        buttons.append(
+            InlineKeyboardButton(
+                text="⬅️ Назад",
+                callback_data=TaskPageCallback(
+                    direction="prev",
+                    created_at=pack_created_at(first_created_at),
+                    task_id=first_id,
+                    offset=max(0, offset - page_size),
+                    status=status,
+                ).pack(),
+            )
+        )
+
+    if has_next:
+        last_id, last_created_at = rows[-1][0], rows[-1][3]
+        buttons.append(
+            InlineKeyboardButton(
+                text="Вперед ➡️",
+                callback_data=TaskPageCallback(
+                    direction="next",
+                    created_at=pack_created_at(last_created_at),
+                    task_id=last_id,
+                    offset=offset + len(rows),
+                    status=status,
+                ).pack(),
+            )
+        )
+
+    if buttons:
+        keyboard.append(buttons)
+
+    # В списке выполненных задач их можно удалить все сразу
+    if status == "done":
+        keyboard.append(
+            [
+                InlineKeyboardButton(
+                    text="🧹 Удалить выполненные",
+                    callback_data=ClearTasksCallback(status=status).pack(),
+                )
+            ]
+        )
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+def get_task_keyboard(task_id: int, status: str, number: int) -> InlineKeyboardMarkup:
+    """
+    Создает клавиатуру карточки задачи с кнопками смены статуса,
+    изменения текста, срока и удаления.
+
+    Параметры:
+        task_id (int): ID задачи.
+        status (str): текущий код статуса задачи; кнопка для него не выводится.
+        number (int): порядковый номер задачи в списке (с единицы).
+
+    Возвращает:
+        InlineKeyboardMarkup: клавиатура с кнопками остальных статусов и действий.
+    """
+    buttons = [
+        InlineKeyboardButton(
+            text=f"{STATUS_ICONS[code]} {label}",
+            callback_data=TaskStatusCallback(task_id=task_id, status=code, number=number).pack(),
+        )
+        for code, label in TASK_STATUSES.items()
+        if code != status
+    ]
+    actions = [
+        InlineKeyboardButton(
+            text="✏️ Изменить",
+            callback_data=TaskEditCallback(task_id=task_id, number=number).pack(),
+        ),
+        InlineKeyboardButton(
+            text="⏰ Срок",
+            callback_data=TaskDueCallback(task_id=task_id, number=number).pack(),
+        ),
+        InlineKeyboardButton(
+            text="🗑 Удалить",
+            callback_data=TaskDeleteCallback(task_id=task_id, number=number).pack(),
+        ),
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=[buttons, actions])
+
+
+def get_task_delete_keyboard(task_id: int, number: int) -> InlineKeyboardMarkup:
+    """
+    Создает клавиатуру подтверждения удаления задачи.
+
+    Параметры:
+        task_id (int): ID задачи.
+        number (int): порядковый номер задачи в списке (с единицы).
+
+    Возвращает:
+        InlineKeyboardMarkup: кнопки «Удалить» и «Отмена» (возврат к карточке).
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="🗑 Да, удалить",
+                    callback_data=TaskDeleteCallback(
+                        task_id=task_id, number=number, confirm=True
+                    ).pack(),
+                ),
+                InlineKeyboardButton(
+                    text="↩️ Отмена",
+                    callback_data=TaskDeleteCallback(
+                        task_id=task_id, number=number, cancel=True
+                    ).pack(),
+                ),
+            ]
+        ]
+    )
+
+
+def get_clear_tasks_keyboard(status: str) -> InlineKeyboardMarkup:
+    """
+    Создает клавиатуру подтверждения удаления всех задач с указанным статусом.
+
+    Параметры:
+        status (str): код статуса удаляемых задач.
+
+    Возвращает:
+        InlineKeyboardMarkup: кнопки «Удалить» и «Отмена».
+    """
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="🧹 Да, удалить",
+                    callback_data=ClearTasksCallback(status=status, confirm=True).pack(),
+                ),
+                InlineKeyboardButton(
+                    text="↩️ Отмена",
+                    callback_data=ClearTasksCallback(status=status, cancel=True).pack(),
+                ),
+            ]
+        ]
+    )
+
+
+def get_search_page_keyboard(
+    offset: int,
+    page_size: int,
+    has_prev: bool,
+    has_next: bool,
+) -> Optional[InlineKeyboardMarkup]:
+    """
+    Создает клавиатуру навигации для страницы результатов поиска.
+
+    Параметры:
+        offset (int): порядковый номер первого результата страницы (с нуля).
+        page_size (int): размер страницы.
+        has_prev (bool): есть ли предыдущая страница.
+        has_next (bool): есть ли следующая страница.
+
+    Возвращает:
+        Optional[InlineKeyboardMarkup]: клавиатура или None, если переходить некуда.
+    """
+    buttons: List[InlineKeyboardButton] = []
+
+    if has_prev:
+        buttons.append(
+            InlineKeyboardButton(
+                text="⬅️ Назад",
+                callback_data=SearchPageCallback(offset=max(0, offset - page_size)).pack(),
+            )
+        )
+
+    if has_next:
+        buttons.append(
+            InlineKeyboardButton(
+                text="Вперед ➡️",
+                callback_data=SearchPageCallback(offset=offset + page_size).pack(),
+            )
+        )
+
+    if not buttons:
+        return None
+    return InlineKeyboardMarkup(inline_keyboard=[buttons])
+
+
+def get_export_format_keyboard(
+    formats: Sequence[Tuple[str, str]], only_new: bool = False
+) -> InlineKeyboardMarkup:
+    """
+    Создает клавиатуру выбора формата выгрузки задач.
+
+    Параметры:
+        formats (Sequence[Tuple[str, str]]): пары (имя формата, подпись кнопки).
+        only_new (bool): выгружать ли только новые задачи.
+
+    Возвращает:
+        InlineKeyboardMarkup: клавиатура с кнопками форматов, по три в ряд.
+    """
+    buttons = [
+        InlineKeyboardButton(
+            text=label,
+            callback_data=ExportFormatCallback(fmt=name, only_new=only_new).pack(),
+        )
+        for name, label in formats
+    ]
+    rows = [buttons[start:start + 3] for start in range(0, len(buttons), 3)]
+    return InlineKeyboardMarkup(inline_keyboard=rows)
@@ -11,18 +11,22 @@ def get_main_keyboard() -> ReplyKeyboardMarkup:
     Создает основную клавиатуру с кнопками для основных команд бота.
 
     Возвращает:
-        ReplyKeyboardMarkup: клавиатура с кнопками для команд /add, /list, /list_csv
+        ReplyKeyboardMarkup: клавиатура с кнопками для команд /add, /list, /list_csv, /export, /import, /search
     """
     # Создаем кнопки
     button_add = KeyboardButton(text="➕ Добавить задачу")
     button_list = KeyboardButton(text="📋 Список задач")
     button_csv = KeyboardButton(text="📊 CSV выгрузка")
+    button_export = KeyboardButton(text="📦 Экспорт")
+    button_import = KeyboardButton(text="📥 Импорт задач")
+    button_search = KeyboardButton(text="🔍 Поиск")
 
     # Создаем клавиатуру с кнопками
     keyboard = ReplyKeyboardMarkup(
         keyboard=[
-            [button_add],
-            [button_list, button_csv],
+            [button_add, button_import],
+            [button_list, button_search],
+            [button_csv, button_export],
         ],
         resize_keyboard=True,  # Автоматическое изменение размера кнопок
         input_field_placeholder="Выберите действие или введите команду",  # Подсказка в поле ввода
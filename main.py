@@ -1,12 +1,249 @@
 import asyncio
+import logging
+from typing import Optional, Tuple
 
 from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
 
 from config import Config
-from database.db_manager import DatabaseManager
+from database.fsm_storage import SQLiteStorage
+from database.storage import create_storage
+from database.task_cache import TaskCache
 from handlers import start_handler, task_handler
-from utils.logger import setup_logger
+from utils.export_executor import ExportExecutor
+from utils.logger import setup_log_output, setup_logger, shutdown_logging
+from utils.metrics import (
+    REGISTRY,
+    MetricsRegistry,
+    RequestMetricsMiddleware,
+    database_query_hook,
+    export_timing_hook,
+    setup_handler_metrics,
+    start_metrics_server,
+)
+from utils.reminders import ReminderScheduler
+from utils.send_scheduler import SendSchedulerMiddleware
+from utils.throttling import ThrottlingMiddleware, setup_throttling
+
+
+def configure_logging() -> logging.Logger:
+    """
+    Настраивает вывод логов и применяет уровень Config.LOG_LEVEL для модулей.
+
+    Возвращает:
+        logging.Logger: центральный логгер приложения.
+    """
+    setup_log_output(
+        level=Config.LOG_LEVEL,
+        use_queue=Config.LOG_QUEUE,
+        json_format=Config.LOG_FORMAT == "json",
+        sample_rate=Config.LOG_SAMPLE_RATE,
+        rate_limit=Config.LOG_RATE_LIMIT,
+    )
+    main_logger = setup_logger("taskbot", Config.LOG_LEVEL)
+    setup_logger("database.db_manager", Config.LOG_LEVEL)
+    setup_logger("database.pg_manager", Config.LOG_LEVEL)
+    setup_logger("database.read_coalescer", Config.LOG_LEVEL)
+    setup_logger("database.task_cache", Config.LOG_LEVEL)
+    setup_logger("database.fsm_storage", Config.LOG_LEVEL)
+    setup_logger("handlers.start_handler", Config.LOG_LEVEL)
+    setup_logger("handlers.task_handler", Config.LOG_LEVEL)
+    setup_logger("utils.csv_generator", Config.LOG_LEVEL)
+    setup_logger("utils.export_executor", Config.LOG_LEVEL)
+    setup_logger("utils.webhook", Config.LOG_LEVEL)
+    setup_logger("utils.supervisor", Config.LOG_LEVEL)
+    setup_logger("utils.metrics", Config.LOG_LEVEL)
+    setup_logger("utils.throttling", Config.LOG_LEVEL)
+    setup_logger("utils.send_scheduler", Config.LOG_LEVEL)
+    setup_logger("utils.reminders", Config.LOG_LEVEL)
+    return main_logger
+
+
+def create_dispatcher(storage: BaseStorage) -> Dispatcher:
+    """
+    Создает диспетчер и подключает роутеры с обработчиками команд.
+
+    Параметры:
+        storage (BaseStorage): хранилище состояний FSM.
+
+    Возвращает:
+        Dispatcher: диспетчер, готовый к запуску polling или webhook.
+    """
+    dispatcher = Dispatcher(storage=storage)
+    dispatcher.include_router(start_handler.router)
+    dispatcher.include_router(task_handler.router)
+    return dispatcher
+
+
+async def create_bot(
+    database_path: str,
+    pool_size: Optional[int] = None,
+    session: Optional[BaseSession] = None,
+    metrics: Optional[MetricsRegistry] = None,
+    prefetch_me: bool = False,
+    send_share: float = 1.0,
+) -> Tuple[Bot, Dispatcher]:
+    """
+    Подключает базу данных и создает бота и диспетчер с настройками из Config.
+
+    Менеджер базы данных, исполнитель выгрузок и планировщик напоминаний
+    сохраняются в атрибутах бота db_manager, export_executor и
+    reminder_scheduler; освобождаются они в shutdown_bot.
+    Подключение к базе и запрос getMe (prefetch_me) выполняются одновременно.
+
+    Параметры:
+        database_path (str): путь к файлу базы данных SQLite или URL PostgreSQL.
+        pool_size (Optional[int]): число соединений для чтения
+            (по умолчанию Config.DB_POOL_SIZE).
+        session (Optional[BaseSession]): HTTP-сессия бота (по умолчанию aiohttp).
+        metrics (Optional[MetricsRegistry]): реестр метрик; если задан, измеряются
+            обработчики, запросы к базе, выгрузки и запросы к Bot API.
+        prefetch_me (bool): запросить getMe при создании бота; результат
+            кэшируется в боте, и polling не ждет его перед первым getUpdates.
+        send_share (float): доля общих лимитов отправки бота (SEND_GLOBAL_RATE,
+            REMINDER_SEND_RATE), доступная этому процессу; рабочие процессы
+            супервизора делят лимиты поровну.
+
+    Возвращает:
+        Tuple[Bot, Dispatcher]: бот и диспетчер с подключенными роутерами.
+    """
+    # Кэш задач пользователей перед базой данных (отключается TASK_CACHE_USERS=0)
+    task_cache = None
+    if Config.TASK_CACHE_USERS > 0:
+        task_cache = TaskCache(
+            max_users=Config.TASK_CACHE_USERS,
+            ttl=Config.TASK_CACHE_TTL,
+            stats_interval=Config.TASK_CACHE_STATS_INTERVAL,
+        )
+
+    # Инициализируем хранилище (SQLite или PostgreSQL по DATABASE_PATH) и готовим таблицы
+    db_manager = create_storage(
+        database_path,
+        batch_writes=Config.DB_BATCH_WRITES,
+        batch_size=Config.DB_BATCH_SIZE,
+        batch_delay_ms=Config.DB_BATCH_DELAY_MS,
+        pool_size=Config.DB_POOL_SIZE if pool_size is None else pool_size,
+        synchronous=Config.DB_SYNCHRONOUS,
+        cache_size=Config.DB_CACHE_SIZE,
+        mmap_size=Config.DB_MMAP_SIZE,
+        busy_timeout_ms=Config.DB_BUSY_TIMEOUT_MS,
+        cache=task_cache,
+        query_hook=database_query_hook(metrics) if metrics is not None else None,
+        vacuum_interval=Config.DB_VACUUM_INTERVAL,
+        vacuum_pages=Config.DB_VACUUM_PAGES,
+        coalesce_reads=Config.DB_COALESCE_READS,
+        read_batch_size=Config.DB_READ_BATCH_SIZE,
+        read_batch_delay_ms=Config.DB_READ_BATCH_DELAY_MS,
+        read_stats_interval=Config.DB_READ_STATS_INTERVAL,
+    )
+
+    # Создаем экземпляр бота: конструктор не обращается к сети
+    bot = Bot(token=Config.BOT_TOKEN, session=session)
+
+    # Подключение к базе с проверкой схемы и запрос getMe не зависят друг от друга
+    async def prepare_database() -> None:
+        await db_manager.connect()
+        await db_manager.create_tables()
+
+    try:
+        if prefetch_me:
+            # Дожидаемся обеих операций, чтобы при ошибке одной из них
+            # не закрывать базу во время подключения
+            results = await asyncio.gather(prepare_database(), bot.me(), return_exceptions=True)
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        else:
+            await prepare_database()
+    except Exception:
+        # Например, неверный токен: не оставляем открытыми базу и HTTP-сессию
+        await db_manager.close()
+        await bot.session.close()
+        raise
+
+    # Исполнитель выгрузок с ограничением числа одновременных экспортов
+    export_executor = ExportExecutor(
+        max_concurrent=Config.EXPORT_MAX_CONCURRENT,
+        workers=Config.EXPORT_WORKERS,
+        timing_hook=export_timing_hook(metrics) if metrics is not None else None,
+    )
+
+    setattr(bot, "db_manager", db_manager)  # Сохраняем менеджер как атрибут бота
+    setattr(bot, "export_executor", export_executor)
+
+    # Состояния FSM храним в базе данных, чтобы они переживали перезапуск
+    storage: BaseStorage
+    if Config.FSM_STORAGE == "sqlite":
+        storage = SQLiteStorage(
+            db_manager, flush_interval=Config.FSM_FLUSH_INTERVAL_MS / 1000
+        )
+    else:
+        storage = MemoryStorage()
+
+    # Создаем диспетчер и подключаем роутеры с обработчиками команд
+    dispatcher = create_dispatcher(storage)
+
+    # Ограничение частоты запросов пользователей к обработчикам
+    if Config.RATE_LIMIT_ENABLED:
+        setup_throttling(
+            dispatcher,
+            ThrottlingMiddleware(
+                rate=Config.RATE_LIMIT_USER_RATE,
+                burst=Config.RATE_LIMIT_USER_BURST,
+                key_limits={
+                    "heavy": (Config.RATE_LIMIT_HEAVY_BURST, Config.RATE_LIMIT_HEAVY_INTERVAL)
+                },
+            ),
+        )
+
+    # Очередь исходящих запросов регистрируется первой, чтобы метрики
+    # измеряли каждую попытку запроса отдельно от ожидания в очереди
+    if Config.SEND_RATE_LIMIT:
+        bot.session.middleware(
+            SendSchedulerMiddleware(
+                global_rate=Config.SEND_GLOBAL_RATE * send_share,
+                chat_rate=Config.SEND_CHAT_RATE,
+                max_retries=Config.SEND_MAX_RETRIES,
+            )
+        )
+
+    if metrics is not None:
+        setup_handler_metrics(dispatcher, metrics)
+        bot.session.middleware(RequestMetricsMiddleware(metrics))
+
+    # Напоминания о сроках задач; запускается после подключения middleware
+    # сессии, чтобы отправка шла через общую очередь запросов
+    reminder_scheduler = None
+    if Config.REMINDERS_ENABLED:
+        reminder_scheduler = ReminderScheduler(
+            db_manager,
+            bot,
+            window_size=Config.REMINDER_WINDOW,
+            send_rate=Config.REMINDER_SEND_RATE * send_share,
+        )
+        reminder_scheduler.start()
+    setattr(bot, "reminder_scheduler", reminder_scheduler)
+
+    return bot, dispatcher
+
+
+async def shutdown_bot(bot: Bot, dispatcher: Dispatcher) -> None:
+    """
+    Сохраняет состояния FSM и освобождает ресурсы, созданные в create_bot.
+
+    Параметры:
+        bot (Bot): бот, созданный create_bot.
+        dispatcher (Dispatcher): диспетчер бота.
+    """
+    await dispatcher.storage.close()
+    reminder_scheduler = getattr(bot, "reminder_scheduler", None)
+    if reminder_scheduler is not None:
+        await reminder_scheduler.close()
+    await getattr(bot, "db_manager").close()
+    getattr(bot, "export_executor").shutdown()
+    await bot.session.close()
 
 
 async def main() -> None:
@@ -16,10 +253,14 @@ async def main() -> None:
     Выполняет:
         1. Загрузку и валидацию конфигурации.
         2. Инициализацию логгера.
-        3. Подключение к базе данных и создание таблиц.
+        3. Подключение к базе данных с проверкой схемы одновременно
+           с запросом getMe (в режиме polling).
         4. Инициализацию бота и диспетчера.
         5. Регистрацию роутеров.
-        6. Запуск polling.
+        6. Запуск polling или webhook-сервера (Config.RUN_MODE).
+
+    При WORKERS > 0 вместо этого запускает супервизор, который распределяет
+    обновления по рабочим процессам (utils/supervisor.py).
 
     Логирует все основные этапы на уровне INFO.
     """
@@ -27,39 +268,56 @@ async def main() -> None:
     Config.load_env()
 
     # Настраиваем центральный логгер и применяем уровень для модулей
-    main_logger = setup_logger("taskbot", Config.LOG_LEVEL)
-    setup_logger("database.db_manager", Config.LOG_LEVEL)
-    setup_logger("handlers.start_handler", Config.LOG_LEVEL)
-    setup_logger("handlers.task_handler", Config.LOG_LEVEL)
-    setup_logger("utils.csv_generator", Config.LOG_LEVEL)
+    main_logger = configure_logging()
 
     main_logger.info("Запуск бота TaskBot")
 
-    # Инициализируем менеджер базы данных и готовим таблицы
-    db_manager = DatabaseManager(Config.DATABASE_PATH)
-    await db_manager.connect()
-    await db_manager.create_tables()
+    if Config.WORKERS > 0:
+        # Модули супервизора и webhook-сервера загружаются только в своих режимах
+        from utils.supervisor import run_supervisor  # pylint: disable=import-outside-toplevel
 
-    # Создаем экземпляры бота и диспетчера
-    bot = Bot(token=Config.BOT_TOKEN)
-    setattr(bot, "db_manager", db_manager)  # Сохраняем менеджер как атрибут бота
-    dispatcher = Dispatcher(storage=MemoryStorage())
+        main_logger.info("Запуск супервизора с %s рабочими процессами", Config.WORKERS)
+        await run_supervisor(Config.WORKERS, Config.SHARD_MODE)
+        main_logger.info("Бот остановлен корректно")
+        shutdown_logging()
+        return
 
-    # Подключаем роутеры с обработчиками команд
-    dispatcher.include_router(start_handler.router)
-    dispatcher.include_router(task_handler.router)
+    metrics = REGISTRY if Config.METRICS_PORT > 0 else None
+    bot, dispatcher = await create_bot(
+        Config.DATABASE_PATH, metrics=metrics, prefetch_me=Config.RUN_MODE != "webhook"
+    )
+    metrics_server = None
+    if metrics is not None:
+        metrics_server = await start_metrics_server(
+            metrics, Config.METRICS_HOST, Config.METRICS_PORT
+        )
 
     try:
-        main_logger.info("Запуск процесса polling")
-        await dispatcher.start_polling(bot)
+        if Config.RUN_MODE == "webhook":
+            from utils.webhook import run_webhook  # pylint: disable=import-outside-toplevel
+
+            main_logger.info("Запуск webhook-сервера")
+            await run_webhook(
+                dispatcher,
+                bot,
+                host=Config.WEBHOOK_HOST,
+                port=Config.WEBHOOK_PORT,
+                path=Config.WEBHOOK_PATH,
+                secret_token=Config.WEBHOOK_SECRET,
+                base_url=Config.WEBHOOK_BASE_URL,
+            )
+        else:
+            main_logger.info("Запуск процесса polling")
+            await dispatcher.start_polling(bot)
     except (KeyboardInterrupt, SystemExit):
         main_logger.info("Получен сигнал остановки. Завершение работы...")
     finally:
-        await db_manager.close()
-        await bot.session.close()
+        if metrics_server is not None:
+            await metrics_server.cleanup()
+        await shutdown_bot(bot, dispatcher)
         main_logger.info("Бот остановлен корректно")
+        shutdown_logging()
 
 
 if __name__ == "__main__":
     asyncio.run(main())
-
@@ -1,9 +1,70 @@
 """
 Вспомогательные утилиты для проекта TaskBot.
+
+Модули пакета импортируются при первом обращении к экспортируемому имени:
+импорт utils.logger при запуске бота не загружает код выгрузок, CSV
+и HTTP-сервера aiohttp.web.
 """
 
-from .csv_generator import CSVGenerator
-from .logger import setup_logger
+import importlib
+from typing import Any
+
+# Экспортируемое имя -> модуль пакета, в котором оно определено
+_EXPORTS = {
+    "ExportExecutor": "export_executor",
+    "MetricsRegistry": "metrics",
+    "REGISTRY": "metrics",
+    "ReminderScheduler": "reminders",
+    "SendSchedulerMiddleware": "send_scheduler",
+    "Supervisor": "supervisor",
+    "TaskExporter": "exporters",
+    "ThrottlingMiddleware": "throttling",
+    "build_export": "exporters",
+    "build_webhook_app": "webhook",
+    "encode_csv_chunk": "csv_generator",
+    "get_exporter": "exporters",
+    "iter_csv_rows": "csv_generator",
+    "run_supervisor": "supervisor",
+    "run_webhook": "webhook",
+    "setup_logger": "logger",
+}
+
+__all__ = [
+    "ExportExecutor",
+    "MetricsRegistry",
+    "REGISTRY",
+    "ReminderScheduler",
+    "SendSchedulerMiddleware",
+    "TaskExporter",
+    "ThrottlingMiddleware",
+    "build_export",
+    "build_webhook_app",
+    "encode_csv_chunk",
+    "get_exporter",
+    "iter_csv_rows",
+    "run_supervisor",
+    "run_webhook",
+    "setup_logger",
+    "Supervisor",
+]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Импортирует модуль пакета при первом обращении к экспортируемому имени.
+
+    Параметры:
+        name (str): имя атрибута пакета.
 
-__all__ = ["CSVGenerator", "setup_logger"]
+    Возвращает:
+        Any: объект из модуля пакета; сохраняется в пакете для следующих обращений.
 
+    Исключения:
+        AttributeError: если имя не экспортируется пакетом.
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
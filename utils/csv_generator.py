@@ -1,70 +1,45 @@
-import csv
-import os
-from itertools import cycle
-from typing import List
-
-from database.models import Task
-from utils.logger import setup_logger
-
-
-class CSVGenerator:
-    """
-    Класс для генерации CSV-файлов с задачами.
-    """
-
-    _logger = setup_logger(__name__)
-
-    @staticmethod
-    def generate_tasks_csv(tasks: List[Task], filename: str = "tasks.csv") -> str:
-        """
-        Генерирует CSV-файл из списка задач.
+"""
+Формат CSV-выгрузки задач: заголовок, строки и кодирование порций.
 
-        Параметры:
-            tasks (List[Task]): список объектов Task.
-            filename (str): имя выходного файла.
+Используется форматами выгрузки (utils/exporters.py) и импортом задач
+из CSV (utils/task_import.py), чтобы файл выгрузки читался обратно без потерь.
+"""
 
-        Возвращает:
-            str: путь к созданному файлу.
-
-        Структура CSV:
-            | ID | Текст | Пользователь | Дата создания | Статус | Категория |
+import csv
+import io
+from typing import Iterable, Iterator, List
 
-        Логирует создание файла на уровне INFO.
+from database.models import TASK_STATUSES, TaskRow
 
-        Исключения:
-            ValueError: если список задач пуст.
-            OSError: если произошла ошибка при записи файла.
-        """
-        # Проверяем, что передан непустой список задач
-        if not tasks:
-            raise ValueError("Нельзя создать CSV: список задач пуст")
+CSV_HEADER = ["ID", "Текст", "Пользователь", "Дата создания", "Статус", "Категория"]
 
-        # Формируем абсолютный путь к файлу
-        file_path = os.path.abspath(filename)
 
-        # Открываем файл для записи и сохраняем данные в CSV-формате
-        statuses = cycle(["Выполнена", "В работе", "Отложена"])
-        categories = cycle(["Работа", "Личное", "Учеба"])
+def iter_csv_rows(rows: Iterable[TaskRow]) -> Iterator[tuple]:
+    """
+    Формирует строки CSV для переданных строк задач.
+    Код статуса заменяется его названием из TASK_STATUSES.
 
-        # Используем кодировку UTF-8 с BOM, чтобы файл корректно открывался в Excel
-        with open(file_path, mode="w", newline="", encoding="utf-8-sig") as csv_file:
-            writer = csv.writer(csv_file, delimiter=";")
-            writer.writerow(["ID", "Текст", "Пользователь", "Дата создания", "Статус", "Категория"])
+    Параметры:
+        rows (Iterable[TaskRow]): строки задач
+            (id, text, user_id, created_at, status, category).
+    """
+    for task_id, text, user_id, created_at, status, category in rows:
+        yield (
+            task_id, text, user_id, created_at, TASK_STATUSES.get(status, status), category
+        )
 
-            for task in tasks:
-                writer.writerow(
-                    [
-                        task.get_id(),
-                        task.get_text(),
-                        task.get_user_id(),
-                        task.get_created_at(),
-                        next(statuses),
-                        next(categories),
-                    ]
-                )
 
-        CSVGenerator._logger.info(
-            "CSV-файл с %s задачами сохранен по пути %s", len(tasks), file_path
-        )
-        return file_path
+def encode_csv_chunk(rows: List[TaskRow], with_header: bool) -> bytes:
+    """
+    Кодирует порцию строк задач в байты CSV (UTF-8, разделитель «;»).
 
+    Параметры:
+        rows (List[TaskRow]): порция строк задач.
+        with_header (bool): добавить ли строку заголовка перед данными.
+    """
+    text_buffer = io.StringIO()
+    writer = csv.writer(text_buffer, delimiter=";")
+    if with_header:
+        writer.writerow(CSV_HEADER)
+    writer.writerows(iter_csv_rows(rows))
+    return text_buffer.getvalue().encode("utf-8")
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from utils.logger import setup_logger
+
+T = TypeVar("T")
+
+
+class ExportExecutor:
+    """
+    Исполнитель выгрузок задач с ограничением параллелизма.
+
+    Одновременно выполняется не более max_concurrent выгрузок, а выгрузки
+    одного пользователя выстраиваются в очередь и идут строго по одной.
+    Кодирование данных выполняется в пуле потоков, чтобы не блокировать
+    цикл событий и обработку обновлений других пользователей.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        workers: int = 2,
+        timing_hook: Optional[Callable[[float, float], None]] = None,
+    ):
+        """
+        Конструктор класса ExportExecutor.
+
+        Параметры:
+            max_concurrent (int): максимальное число одновременных выгрузок.
+            workers (int): количество потоков для кодирования файлов.
+            timing_hook (Optional[Callable[[float, float], None]]): вызывается
+                после каждой выгрузки со временем ожидания и выполнения в секундах.
+        """
+        self._max_concurrent = max(1, max_concurrent)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="export"
+        )
+        self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        self._user_locks: Dict[int, asyncio.Lock] = {}
+        self._user_pending: Dict[int, int] = {}
+        self._queued = 0
+        self._active = 0
+        self._timing_hook = timing_hook
+        self._logger = setup_logger(__name__)
+
+    @property
+    def executor(self) -> Executor:
+        """Возвращает пул потоков для кодирования файлов выгрузки."""
+        return self._executor
+
+    def queue_depth(self) -> int:
+        """Возвращает количество выгрузок, ожидающих запуска."""
+        return self._queued
+
+    def is_saturated(self, user_id: int) -> bool:
+        """
+        Проверяет, придется ли новой выгрузке пользователя ждать в очереди.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+        """
+        user_lock = self._user_locks.get(user_id)
+        if user_lock is not None and user_lock.locked():
+            return True
+        return self._active + self._queued >= self._max_concurrent
+
+    async def submit(self, user_id: int, job: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполняет выгрузку с учетом общего лимита и очереди пользователя.
+
+        Параметры:
+            user_id (int): ID пользователя Telegram.
+            job (Callable[[], Awaitable[T]]): фабрика корутины выгрузки.
+
+        Возвращает:
+            T: результат выгрузки.
+
+        Логирует глубину очереди и длительность выгрузки на уровне INFO.
+        """
+        user_lock = self._user_locks.setdefault(user_id, asyncio.Lock())
+        self._user_pending[user_id] = self._user_pending.get(user_id, 0) + 1
+        queued_at = time.perf_counter()
+        self._queued += 1
+        is_queued = True
+        self._logger.info(
+            "Выгрузка пользователя %s поставлена в очередь (глубина очереди: %s, активных: %s)",
+            user_id,
+            self._queued,
+            self._active,
+        )
+
+        try:
+            async with user_lock:
+                async with self._semaphore:
+                    self._queued -= 1
+                    is_queued = False
+                    self._active += 1
+                    started_at = time.perf_counter()
+                    try:
+                        return await job()
+                    finally:
+                        self._active -= 1
+                        finished_at = time.perf_counter()
+                        if self._timing_hook is not None:
+                            self._timing_hook(started_at - queued_at, finished_at - started_at)
+                        self._logger.info(
+                            "Выгрузка пользователя %s завершена: ожидание %.1f мс, "
+                            "выполнение %.1f мс (в очереди: %s)",
+                            user_id,
+                            (started_at - queued_at) * 1000,
+                            (finished_at - started_at) * 1000,
+                            self._queued,
+                        )
+        finally:
+            if is_queued:
+                self._queued -= 1
+            # Удаляем блокировку пользователя, если больше никто ее не ждет
+            self._user_pending[user_id] -= 1
+            if self._user_pending[user_id] == 0:
+                del self._user_pending[user_id]
+                del self._user_locks[user_id]
+
+    def shutdown(self) -> None:
+        """Останавливает пул потоков, дожидаясь завершения начатых задач."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import asyncio
+import codecs
+import io
+import json
+import re
+import zipfile
+import zlib
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from typing import AsyncIterable, Dict, Iterator, List, Optional, Tuple, Type
+from xml.sax.saxutils import escape
+
+from database.models import TaskRow
+from utils.csv_generator import CSV_HEADER, encode_csv_chunk, iter_csv_rows
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Ключи записей JSON Lines в порядке столбцов CSV_HEADER
+JSON_KEYS = ("id", "text", "user_id", "created_at", "status", "category")
+
+# Символы, недопустимые в XML 1.0 (управляющие, кроме табуляции и переводов строки)
+_XML_INVALID_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+# Ограничение Excel на длину текста в ячейке
+XLSX_MAX_CELL_LENGTH = 32767
+# Уровень сжатия gzip и ZIP: размер важнее времени для загрузки по мобильной сети
+COMPRESSION_LEVEL = 6
+
+
+class TaskExporter(ABC):
+    """
+    Базовый класс формата выгрузки задач.
+
+    Экземпляр описывает одну выгрузку: write_rows вызывается для каждой
+    порции строк задач по порядку (при необходимости в пуле потоков),
+    finish возвращает содержимое файла. Состояние кодировщика (сжатие,
+    открытый лист книги) хранится между порциями, поэтому ни полный список
+    задач, ни несжатое содержимое файла целиком в памяти не создаются.
+
+    Атрибуты класса:
+        name (str): имя формата в аргументе команды и callback-данных.
+        label (str): подпись кнопки выбора формата.
+        filename (str): имя отправляемого файла.
+    """
+
+    name = ""
+    label = ""
+    filename = ""
+
+    def __init__(self) -> None:
+        """Конструктор класса TaskExporter."""
+        self._output = io.BytesIO()
+        self.count = 0
+
+    def _records(self, rows: List[TaskRow]) -> Iterator[tuple]:
+        """Возвращает строки выгрузки в порядке столбцов CSV_HEADER."""
+        return iter_csv_rows(rows)
+
+    def write_rows(self, rows: List[TaskRow]) -> None:
+        """
+        Кодирует порцию строк задач и дописывает ее в файл.
+
+        Параметры:
+            rows (List[TaskRow]): порция строк задач.
+        """
+        self._write(rows, with_header=self.count == 0)
+        self.count += len(rows)
+
+    @abstractmethod
+    def _write(self, rows: List[TaskRow], with_header: bool) -> None:
+        """Кодирует порцию строк; реализуется в форматах."""
+
+    def finish(self) -> bytes:
+        """
+        Завершает файл и возвращает его содержимое.
+
+        Возвращает:
+            bytes: содержимое файла или пустые байты, если задач не было.
+        """
+        self._close()
+        return self._output.getvalue() if self.count else b""
+
+    def _close(self) -> None:
+        """Дописывает окончание файла; переопределяется в форматах."""
+
+
+class CsvExporter(TaskExporter):
+    """CSV в UTF-8 с BOM и разделителем «;» (формат utils/csv_generator.py)."""
+
+    name = "csv"
+    label = "CSV"
+    filename = "tasks.csv"
+
+    def _encode(self, rows: List[TaskRow], with_header: bool) -> bytes:
+        """Кодирует порцию строк в байты CSV, начиная файл с BOM."""
+        chunk = encode_csv_chunk(rows, with_header)
+        return codecs.BOM_UTF8 + chunk if with_header else chunk
+
+    def _write(self, rows: List[TaskRow], with_header: bool) -> None:
+        self._output.write(self._encode(rows, with_header))
+
+
+class GzipCsvExporter(CsvExporter):
+    """CSV, сжатый gzip по мере кодирования порций."""
+
+    name = "gzip"
+    label = "CSV.GZ"
+    filename = "tasks.csv.gz"
+
+    def __init__(self) -> None:
+        """Конструктор класса GzipCsvExporter."""
+        super().__init__()
+        # wbits=31 — формат gzip с заголовком и контрольной суммой
+        self._compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+
+    def _write(self, rows: List[TaskRow], with_header: bool) -> None:
+        self._output.write(self._compressor.compress(self._encode(rows, with_header)))
+
+    def _close(self) -> None:
+        self._output.write(self._compressor.flush())
+
+
+class ZipCsvExporter(CsvExporter):
+    """ZIP-архив с одним файлом tasks.csv, который записывается потоком."""
+
+    name = "zip"
+    label = "CSV.ZIP"
+    filename = "tasks.zip"
+
+    def __init__(self) -> None:
+        """Конструктор класса ZipCsvExporter."""
+        super().__init__()
+        self._archive = zipfile.ZipFile(
+            self._output, "w", zipfile.ZIP_DEFLATED, compresslevel=COMPRESSION_LEVEL
+        )
+        self._member = self._archive.open("tasks.csv", "w", force_zip64=True)
+
+    def _write(self, rows: List[TaskRow], with_header: bool) -> None:
+        self._member.write(self._encode(rows, with_header))
+
+    def _close(self) -> None:
+        self._member.close()
+        self._archive.close()
+
+
+class XlsxExporter(TaskExporter):
+    """
+    Книга Excel (XLSX) с одним листом без сторонних библиотек.
+
+    Служебные части книги записываются в архив сразу, а XML листа —
+    потоком по мере поступления порций. Текст хранится во встроенных
+    строках ячеек (inlineStr), поэтому таблица общих строк не нужна.
+    """
+
+    name = "xlsx"
+    label = "XLSX"
+    filename = "tasks.xlsx"
+
+    _CONTENT_TYPES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        "</Types>"
+    )
+    _ROOT_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    )
+    _WORKBOOK = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Задачи" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    )
+    _WORKBOOK_RELS = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        "</Relationships>"
+    )
+    _STYLES = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+        '<cellXfs count="1"><xf/></cellXfs>'
+        "</styleSheet>"
+    )
+    _SHEET_START = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        "<sheetData>"
+    )
+    _SHEET_END = "</sheetData></worksheet>"
+
+    def __init__(self) -> None:
+        """Конструктор класса XlsxExporter."""
+        super().__init__()
+        self._archive = zipfile.ZipFile(self._output, "w", zipfile.ZIP_DEFLATED)
+        for part, content in (
+            ("[Content_Types].xml", self._CONTENT_TYPES),
+            ("_rels/.rels", self._ROOT_RELS),
+            ("xl/workbook.xml", self._WORKBOOK),
+            ("xl/_rels/workbook.xml.rels", self._WORKBOOK_RELS),
+            ("xl/styles.xml", self._STYLES),
+        ):
+            self._archive.writestr(part, content)
+        self._sheet = self._archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        self._sheet.write(self._SHEET_START.encode("utf-8"))
+
+    @staticmethod
+    def _text_cell(value: object) -> str:
+        """Возвращает ячейку со встроенной строкой."""
+        text = _XML_INVALID_CHARS.sub("", str(value))[:XLSX_MAX_CELL_LENGTH]
+        return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+    @staticmethod
+    def _row(values: tuple) -> str:
+        """Возвращает строку листа: числа — числовыми ячейками, остальное — текстом."""
+        cells = [
+            f"<c><v>{value}</v></c>" if isinstance(value, int) else XlsxExporter._text_cell(value)
+            for value in values
+        ]
+        return f"<row>{''.join(cells)}</row>"
+
+    def _write(self, rows: List[TaskRow], with_header: bool) -> None:
+        parts = [self._row(tuple(CSV_HEADER))] if with_header else []
+        parts.extend(self._row(record) for record in self._records(rows))
+        self._sheet.write("".join(parts).encode("utf-8"))
+
+    def _close(self) -> None:
+        self._sheet.write(self._SHEET_END.encode("utf-8"))
+        self._sheet.close()
+        self._archive.close()
+
+
+class JsonLinesExporter(TaskExporter):
+    """JSON Lines: одна задача — один компактный JSON-объект на строке."""
+
+    name = "jsonl"
+    label = "JSON Lines"
+    filename = "tasks.jsonl"
+
+    def _write(self, rows: List[TaskRow], with_header: bool) -> None:
+        lines = [
+            json.dumps(dict(zip(JSON_KEYS, record)), ensure_ascii=False, separators=(",", ":"))
+            for record in self._records(rows)
+        ]
+        lines.append("")
+        self._output.write("\n".join(lines).encode("utf-8"))
+
+
+EXPORTERS: Dict[str, Type[TaskExporter]] = {
+    exporter.name: exporter
+    for exporter in (CsvExporter, GzipCsvExporter, ZipCsvExporter, XlsxExporter, JsonLinesExporter)
+}
+
+
+def get_exporter(name: str) -> Optional[TaskExporter]:
+    """
+    Создает экспортер по имени формата.
+
+    Параметры:
+        name (str): имя формата без учета регистра (csv, gzip, zip, xlsx, jsonl).
+
+    Возвращает:
+        Optional[TaskExporter]: новый экспортер или None, если формат неизвестен.
+    """
+    exporter_class = EXPORTERS.get(name.lower())
+    return exporter_class() if exporter_class is not None else None
+
+
+async def build_export(
+    exporter: TaskExporter,
+    row_chunks: AsyncIterable[List[TaskRow]],
+    executor: Optional[Executor] = None,
+) -> Tuple[bytes, int]:
+    """
+    Потоково формирует файл выгрузки из порций строк задач.
+
+    Если передан executor, порции кодируются в нем по очереди,
+    иначе между порциями управление возвращается циклу событий.
+
+    Параметры:
+        exporter (TaskExporter): экспортер нужного формата.
+        row_chunks (AsyncIterable[List[TaskRow]]): порции строк задач, например
+            результат DatabaseManager.iter_user_task_rows.
+        executor (Optional[Executor]): пул для кодирования порций.
+
+    Возвращает:
+        Tuple[bytes, int]: содержимое файла и количество задач.
+        Если задач нет, возвращается пустое содержимое и 0.
+
+    Логирует размер сформированного файла на уровне INFO.
+    """
+    loop = asyncio.get_running_loop()
+    async for rows in row_chunks:
+        if executor is not None:
+            await loop.run_in_executor(executor, exporter.write_rows, rows)
+        else:
+            exporter.write_rows(rows)
+            await asyncio.sleep(0)
+
+    if executor is not None:
+        content = await loop.run_in_executor(executor, exporter.finish)
+    else:
+        content = exporter.finish()
+
+    if exporter.count:
+        logger.info(
+            "Выгрузка %s с %s задачами сформирована в памяти (%s байт)",
+            exporter.name,
+            exporter.count,
+            len(content),
+        )
+    return content, exporter.count
@@ -1,34 +1,242 @@
+import atexit
+import json
 import logging
-from typing import Optional
+import queue
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Set
 
+TEXT_FORMAT = "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s"
 
-def setup_logger(name: str, level: str = "INFO") -> logging.Logger:
+# Общий обработчик, который получают логгеры после setup_log_output
+_shared_handler: Optional[logging.Handler] = None
+_listener: Optional[QueueListener] = None
+# Обработчик, который пишет в stderr (в режиме очереди — из потока QueueListener)
+_output_handler: Optional[logging.Handler] = None
+_default_level = logging.INFO
+# Логгеры, настроенные через setup_logger: им меняется обработчик при смене режима
+_configured: Set[str] = set()
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Форматирует запись лога одной строкой JSON:
+    time, level, logger, message, pid и при наличии exception.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+        }
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class RequestLogFilter(logging.Filter):
+    """
+    Прореживание частых записей уровня INFO и ниже.
+
+    Записи группируются по логгеру и шаблону сообщения (до подстановки
+    аргументов), поэтому строки «Задача ID %s добавлена...» считаются
+    одной группой, а однократные сообщения запуска всегда проходят.
+    WARNING и выше не фильтруются.
+
+    sample_rate — доля пропускаемых записей группы (1.0 — все, 0.1 — каждая
+    десятая); rate_limit — максимум записей группы в секунду (0 — без
+    ограничения). О пропущенных записях сообщает следующая прошедшая запись.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, rate_limit: float = 0.0):
+        super().__init__()
+        self._every = max(1, round(1 / sample_rate)) if 0 < sample_rate < 1 else 1
+        self._rate_limit = max(0.0, rate_limit)
+        # Для каждой группы: [счетчик, токены, время пополнения, пропущено]
+        self._groups: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        if self._every == 1 and not self._rate_limit:
+            return True
+
+        key = (record.name, record.msg)
+        now = time.monotonic()
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None:
+                group = [0, self._rate_limit, now, 0]
+                self._groups[key] = group
+
+            passed = group[0] % self._every == 0
+            group[0] += 1
+            if passed and self._rate_limit:
+                group[1] = min(self._rate_limit, group[1] + (now - group[2]) * self._rate_limit)
+                group[2] = now
+                if group[1] >= 1:
+                    group[1] -= 1
+                else:
+                    passed = False
+
+            if not passed:
+                group[3] += 1
+                return False
+            dropped, group[3] = group[3], 0
+
+        if dropped and isinstance(record.args, tuple):
+            record.msg = f"{record.msg} [пропущено похожих: %s]"
+            record.args = record.args + (dropped,)
+        return True
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler, который не форматирует запись в вызывающем потоке:
+    подстановка аргументов, форматирование и вывод выполняются в потоке
+    QueueListener. Аргументы записей должны быть неизменяемыми значениями
+    (числа, строки), что выполняется для логов проекта.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _build_formatter(json_format: bool) -> logging.Formatter:
+    """Создает форматтер вывода: текстовый или JSON."""
+    if json_format:
+        return JsonFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def setup_log_output(
+    level: str = "INFO",
+    use_queue: bool = True,
+    json_format: bool = False,
+    sample_rate: float = 1.0,
+    rate_limit: float = 0.0,
+) -> None:
+    """
+    Настраивает вывод логов для всех логгеров, созданных через setup_logger.
+
+    В режиме очереди запись лога в обработчике только помещается в очередь,
+    а форматирование и запись в stderr выполняет фоновый поток QueueListener,
+    поэтому медленный вывод не блокирует цикл событий.
+
+    Параметры:
+        level (str): уровень по умолчанию для логгеров без явного уровня.
+        use_queue (bool): выводить логи через очередь в фоновом потоке.
+        json_format (bool): выводить записи в формате JSON (по строке на запись).
+        sample_rate (float): доля пропускаемых повторяющихся записей INFO.
+        rate_limit (float): максимум повторяющихся записей INFO в секунду (0 — без ограничения).
+    """
+    global _shared_handler, _output_handler, _listener, _default_level  # pylint: disable=global-statement
+
+    with _lock:
+        _stop_listener()
+
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(_build_formatter(json_format))
+
+        handler: logging.Handler
+        if use_queue:
+            log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+            handler = _DeferredQueueHandler(log_queue)
+            _listener = QueueListener(log_queue, stream_handler, respect_handler_level=False)
+            _listener.start()
+        else:
+            handler = stream_handler
+        # Фильтр работает до постановки в очередь: отброшенные записи не форматируются
+        log_filter = RequestLogFilter(sample_rate, rate_limit)
+        handler.addFilter(log_filter)
+
+        _output_handler = stream_handler
+        _default_level = getattr(logging, level.upper(), logging.INFO)
+        _switch_handler(handler)
+
+
+def _switch_handler(handler: logging.Handler) -> None:
+    """Заменяет общий обработчик у всех логгеров, настроенных через setup_logger."""
+    global _shared_handler  # pylint: disable=global-statement
+    previous, _shared_handler = _shared_handler, handler
+    for name in _configured:
+        logger = logging.getLogger(name)
+        for existing in list(logger.handlers):
+            if existing is previous or getattr(existing, "_taskbot_default", False):
+                logger.removeHandler(existing)
+        logger.addHandler(handler)
+
+
+def _stop_listener() -> None:
+    """Останавливает фоновый поток вывода, дописав накопленные записи."""
+    global _listener  # pylint: disable=global-statement
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def shutdown_logging() -> None:
+    """
+    Дописывает накопленные в очереди записи и останавливает фоновый поток.
+    Последующие записи выводятся синхронно, чтобы не потерять логи завершения.
+    Вызывается при завершении приложения (и автоматически при выходе).
+    """
+    with _lock:
+        if _listener is None:
+            return
+        _stop_listener()
+        if _output_handler is not None and _shared_handler is not None:
+            # Фильтр прореживания переходит к синхронному обработчику вместе с логгерами
+            for log_filter in _shared_handler.filters:
+                _output_handler.addFilter(log_filter)
+            _switch_handler(_output_handler)
+
+
+atexit.register(shutdown_logging)
+
+
+def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """
     Настраивает и возвращает логгер для модуля.
 
     Параметры:
         name (str): имя логгера (обычно __name__).
-        level (str): уровень логирования (по умолчанию INFO).
+        level (Optional[str]): уровень логирования; если не указан, логгер
+            сохраняет ранее заданный уровень или получает уровень по умолчанию
+            из setup_log_output (INFO, если вывод не настраивался).
 
     Возвращает:
         logging.Logger: настроенный объект Logger.
 
-    Формат логов: [ВРЕМЯ] [УРОВЕНЬ] [МОДУЛЬ] - СООБЩЕНИЕ.
+    Формат логов: [ВРЕМЯ] [УРОВЕНЬ] [МОДУЛЬ] - СООБЩЕНИЕ
+    (или JSON при setup_log_output(json_format=True)).
     """
     logger = logging.getLogger(name)
 
     # Преобразование уровня логирования в объект logging
-    log_level = getattr(logging, level.upper(), logging.INFO)
-    logger.setLevel(log_level)
-
-    # Проверяем, добавлен ли уже обработчик, чтобы избежать дублирования сообщений
-    if not logger.handlers:
-        formatter = logging.Formatter(
-            "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s"
-        )
-        handler = logging.StreamHandler()
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+    if level is not None:
+        logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+    elif logger.level == logging.NOTSET:
+        logger.setLevel(_default_level)
+
+    with _lock:
+        _configured.add(name)
+        # Проверяем, добавлен ли уже обработчик, чтобы избежать дублирования сообщений
+        if not logger.handlers:
+            if _shared_handler is not None:
+                logger.addHandler(_shared_handler)
+            else:
+                handler = logging.StreamHandler()
+                handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+                setattr(handler, "_taskbot_default", True)
+                logger.addHandler(handler)
 
     return logger
 
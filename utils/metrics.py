@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+
+from utils.logger import setup_logger
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = setup_logger(__name__)
+
+# Границы корзин гистограмм в секундах: от долей миллисекунды до секунд
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label(value: str) -> str:
+    """Экранирует значение метки по правилам текстового формата Prometheus."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """Формирует блок меток {name="value",...} или пустую строку."""
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Форматирует число без лишней дробной части."""
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    """Общая часть метрик: имя, описание, метки и блокировка значений."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        # Значения обновляются и из потоков пула выгрузок
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        """Возвращает значения меток в порядке labelnames."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Метрика {self.name} ожидает метки {self.labelnames}, получены {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """Возвращает строки метрики в текстовом формате Prometheus."""
+
+
+class Counter(_Metric):
+    """Монотонно растущий счетчик."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """Увеличивает счетчик с указанными метками на amount."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Возвращает текущее значение счетчика с указанными метками."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        """Возвращает строки метрики в текстовом формате Prometheus."""
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными корзинами, суммой и количеством наблюдений."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # Для каждого набора меток: счетчики корзин (+Inf последней), сумма
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Добавляет наблюдение value с указанными метками."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = ([0] * (len(self.buckets) + 1), [0.0])
+                self._values[key] = state
+            state[0][index] += 1
+            state[1][0] += value
+
+    def count(self, **labels: Any) -> int:
+        """Возвращает количество наблюдений с указанными метками."""
+        state = self._values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def render(self) -> List[str]:
+        """Возвращает строки метрики в текстовом формате Prometheus."""
+        with self._lock:
+            items = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = self._header()
+        bucket_labelnames = self.labelnames + ("le",)
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(bucket_labelnames, key + (le,))} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик приложения с выводом в текстовом формате Prometheus.
+
+    Повторная регистрация метрики с тем же именем возвращает уже созданную,
+    поэтому инструментируемые компоненты могут объявлять метрики независимо.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Метрика {metric.name} уже зарегистрирована с другим типом")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Возвращает счетчик с указанным именем, создавая его при необходимости."""
+        return self._register(Counter(name, documentation, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Возвращает гистограмму с указанным именем, создавая ее при необходимости."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))  # type: ignore[return-value]
+
+    def render(self) -> str:
+        """Возвращает все метрики в текстовом формате Prometheus (версия 0.0.4)."""
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """
+    Внешний middleware обновлений: измеряет полное время обработки
+    (фильтры, middleware и обработчик) и считает обновления по обработчикам.
+
+    Имя сработавшего обработчика сообщает внутренний middleware
+    _HandlerNameMiddleware через общий словарь в данных обновления.
+    """
+
+    def __init__(self, registry: MetricsRegistry):
+        self._duration = registry.histogram(
+            "taskbot_handler_duration_seconds",
+            "Время обработки обновления",
+            ("update_type", "handler"),
+        )
+        self._updates = registry.counter(
+            "taskbot_updates_total",
+            "Обработанные обновления",
+            ("update_type", "handler", "status"),
+        )
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        labels = {"handler": "unhandled"}
+        data["metrics_labels"] = labels
+        update_type = event.event_type if isinstance(event, Update) else type(event).__name__
+        status = "ok"
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            self._duration.observe(
+                time.perf_counter() - started, update_type=update_type, handler=labels["handler"]
+            )
+            self._updates.inc(update_type=update_type, handler=labels["handler"], status=status)
+
+
+class _HandlerNameMiddleware(BaseMiddleware):
+    """Внутренний middleware: записывает имя обработчика для HandlerMetricsMiddleware."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        labels = data.get("metrics_labels")
+        handler_object = data.get("handler")
+        if labels is not None and handler_object is not None:
+            labels["handler"] = getattr(handler_object.callback, "__name__", "handler")
+        return await handler(event, data)
+
+
+def setup_handler_metrics(dispatcher: Dispatcher, registry: MetricsRegistry) -> None:
+    """
+    Подключает измерение времени обработчиков к диспетчеру.
+
+    Параметры:
+        dispatcher (Dispatcher): диспетчер бота.
+        registry (MetricsRegistry): реестр метрик.
+    """
+    dispatcher.update.outer_middleware(HandlerMetricsMiddleware(registry))
+    name_middleware = _HandlerNameMiddleware()
+    # Внутренние middleware диспетчера применяются и к обработчикам дочерних роутеров
+    for event_name, observer in dispatcher.observers.items():
+        if event_name not in ("update", "error"):
+            observer.middleware(name_middleware)
+
+
+class RequestMetricsMiddleware(BaseRequestMiddleware):
+    """Middleware сессии бота: измеряет время запросов к Bot API по методам."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self._duration = registry.histogram(
+            "taskbot_bot_api_request_duration_seconds",
+            "Время запроса к Telegram Bot API",
+            ("method",),
+        )
+        self._requests = registry.counter(
+            "taskbot_bot_api_requests_total",
+            "Запросы к Telegram Bot API",
+            ("method", "status"),
+        )
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        api_method = method.__api_method__
+        status = "ok"
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as error:
+            status = type(error).__name__
+            raise
+        finally:
+            self._duration.observe(time.perf_counter() - started, method=api_method)
+            self._requests.inc(method=api_method, status=status)
+
+
+def database_query_hook(registry: MetricsRegistry) -> Callable[[str, float, int], None]:
+    """
+    Возвращает обработчик для DatabaseManager(query_hook=...), который
+    записывает длительность и число строк каждого запроса.
+
+    Параметры:
+        registry (MetricsRegistry): реестр метрик.
+    """
+    duration = registry.histogram(
+        "taskbot_db_query_duration_seconds", "Время запроса к базе данных", ("query",)
+    )
+    rows = registry.counter(
+        "taskbot_db_query_rows_total", "Строки, прочитанные или измененные запросами", ("query",)
+    )
+
+    def observe(query: str, seconds: float, row_count: int) -> None:
+        duration.observe(seconds, query=query)
+        rows.inc(row_count, query=query)
+
+    return observe
+
+
+def export_timing_hook(registry: MetricsRegistry) -> Callable[[float, float], None]:
+    """
+    Возвращает обработчик для ExportExecutor(timing_hook=...), который
+    записывает время ожидания в очереди и время выполнения выгрузок.
+
+    Параметры:
+        registry (MetricsRegistry): реестр метрик.
+    """
+    wait = registry.histogram(
+        "taskbot_export_wait_seconds", "Время ожидания выгрузки в очереди"
+    )
+    run = registry.histogram(
+        "taskbot_export_run_seconds", "Время формирования файла выгрузки"
+    )
+
+    def observe(wait_seconds: float, run_seconds: float) -> None:
+        wait.observe(wait_seconds)
+        run.observe(run_seconds)
+
+    return observe
+
+
+async def start_metrics_server(
+    registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9100
+) -> web.AppRunner:
+    """
+    Запускает HTTP-сервер, отдающий метрики по пути /metrics.
+
+    Параметры:
+        registry (MetricsRegistry): реестр метрик.
+        host (str): адрес сервера (по умолчанию только локальный).
+        port (int): порт сервера.
+
+    Возвращает:
+        web.AppRunner: запущенный сервер; остановка — runner.cleanup().
+    """
+    # aiohttp.web нужен только серверу метрик, поэтому не загружается при запуске бота
+    from aiohttp import web  # pylint: disable=import-outside-toplevel
+
+    async def handle(_: web.Request) -> web.Response:
+        return web.Response(
+            body=registry.render().encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host=host, port=port).start()
+    logger.info("Метрики доступны по адресу http://%s:%s/metrics", host, port)
+    return runner
+
+
+# Реестр метрик процесса
+REGISTRY = MetricsRegistry()
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import re
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+
+from database.db_manager import format_created_at
+from database.models import ReminderRow
+from database.storage import TaskStorage
+from utils.logger import setup_logger
+from utils.throttling import TokenBucket
+
+logger = setup_logger(__name__)
+
+MESSAGE_MAX_LENGTH = 4096  # Ограничение Telegram на длину текста сообщения
+DEFAULT_REMINDER_TIME = (9, 0)  # Время напоминания, если указана только дата
+MAX_SLEEP = 300.0  # Максимальный сон планировщика, секунды (страховка от перевода часов)
+
+# «через 30 мин», «через 2 часа», «через 3 дня», «через 1 неделю»
+_RELATIVE_RE = re.compile(r"^через\s+(\d{1,4})\s*([a-zа-яё]+)$")
+_DATE_RE = re.compile(r"^(\d{1,2})\.(\d{1,2})(?:\.(\d{4}))?$")
+_TIME_RE = re.compile(r"^(\d{1,2}):(\d{2})$")
+
+DUE_FORMAT_HINT = (
+    "Укажите срок в одном из форматов:\n"
+    "18:30 — сегодня (или завтра, если время прошло)\n"
+    "завтра 9:00, 25.12 18:00, 25.12.2026 18:00, 25.12\n"
+    "через 30 мин, через 2 часа, через 3 дня\n"
+    "«нет» — убрать срок"
+)
+
+
+def parse_due_at(text: str, now: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    Разбирает срок задачи, введенный пользователем.
+
+    Поддерживаются время («18:30» — ближайшее такое время), дата с временем
+    или без него («25.12 18:00», «25.12.2026», «завтра 9:00») и интервал
+    («через 2 часа»). Дата без года — ближайшая такая дата; дата без
+    времени — DEFAULT_REMINDER_TIME.
+
+    Параметры:
+        text (str): текст пользователя.
+        now (Optional[datetime]): текущий момент (по умолчанию datetime.now()).
+
+    Возвращает:
+        Optional[datetime]: срок или None, если текст не распознан.
+    """
+    now = now or datetime.now()
+    value = " ".join(text.lower().split())
+
+    relative = _RELATIVE_RE.match(value)
+    if relative:
+        amount, unit = int(relative.group(1)), relative.group(2)
+        for prefix, step in (
+            ("м", timedelta(minutes=1)),
+            ("ч", timedelta(hours=1)),
+            ("д", timedelta(days=1)),
+            ("н", timedelta(weeks=1)),
+        ):
+            if unit.startswith(prefix):
+                return now + amount * step
+        return None
+
+    day: Optional[datetime] = None
+    clock: Optional[Tuple[int, int]] = None
+    year_given = False
+    for token in value.split():
+        date_match = _DATE_RE.match(token)
+        time_match = _TIME_RE.match(token)
+        if token in ("сегодня", "завтра") and day is None:
+            day = now + timedelta(days=1 if token == "завтра" else 0)
+            year_given = True
+        elif date_match and day is None:
+            year_given = date_match.group(3) is not None
+            year = int(date_match.group(3)) if year_given else now.year
+            try:
+                day = datetime(year, int(date_match.group(2)), int(date_match.group(1)))
+            except ValueError:
+                return None
+        elif time_match and clock is None:
+            clock = (int(time_match.group(1)), int(time_match.group(2)))
+        else:
+            return None
+
+    if day is None and clock is None:
+        return None
+    hour, minute = clock if clock is not None else DEFAULT_REMINDER_TIME
+    if hour > 23 or minute > 59:
+        return None
+
+    base = day if day is not None else now
+    due = base.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if due <= now:
+        # Только время — ближайший следующий день, дата без года — следующий год
+        if day is None:
+            due += timedelta(days=1)
+        elif not year_given:
+            due = due.replace(year=due.year + 1)
+    return due
+
+
+def format_due_at(due_at: str) -> str:
+    """
+    Возвращает срок задачи в виде для пользователя, например «25.12.2026 18:00».
+
+    Параметры:
+        due_at (str): срок в формате format_created_at.
+    """
+    return datetime.fromisoformat(due_at).strftime("%d.%m.%Y %H:%M")
+
+
+class ReminderScheduler:
+    """
+    Планировщик напоминаний о сроках задач в цикле asyncio бота.
+
+    В памяти хранится только окно ближайших напоминаний: до window_size строк
+    из частичного индекса idx_tasks_due в куче по сроку. Планировщик спит до
+    самого раннего срока, а не опрашивает таблицу. Следующее окно читается
+    с ключа (due_at, id) последней загруженной строки, когда текущее
+    закончилось. Новые и измененные сроки попадают в кучу через обработчик
+    set_due_hook хранилища, если они раньше конца окна. Устаревшие записи
+    кучи не удаляются: их отсеивает claim_reminder.
+
+    Наступившие напоминания передаются через ограниченную очередь обработчикам
+    отправки, которые отправляют не более send_rate сообщений в секунду.
+    """
+
+    def __init__(
+        self,
+        db: TaskStorage,
+        bot: Bot,
+        window_size: int = 1000,
+        send_rate: float = 20.0,
+        send_workers: int = 4,
+    ):
+        """
+        Конструктор класса ReminderScheduler.
+
+        Параметры:
+            db (TaskStorage): хранилище задач SQLite или PostgreSQL.
+            bot (Bot): бот, от имени которого отправляются напоминания.
+            window_size (int): число напоминаний, загружаемых в память за раз.
+            send_rate (float): напоминаний в секунду для всего бота.
+            send_workers (int): число одновременно отправляемых напоминаний.
+
+        Исключения:
+            ValueError: если параметры некорректны.
+        """
+        if window_size < 1 or send_rate <= 0 or send_workers < 1:
+            raise ValueError("Некорректные параметры планировщика напоминаний")
+        self._db = db
+        self._bot = bot
+        self._window_size = window_size
+        self._send_workers = send_workers
+        self._bucket = TokenBucket(max(1.0, send_rate), send_rate, time.monotonic())
+
+        self._heap: List[ReminderRow] = []
+        # Ключ последней загруженной строки; None — окно читается с начала индекса
+        self._window_key: Optional[Tuple[str, int]] = None
+        # Срок последней строки окна; None — в памяти все ожидающие напоминания
+        self._window_end: Optional[str] = None
+        self._reload = True
+        self._wakeup = asyncio.Event()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=window_size)
+        self._tasks: List[asyncio.Task] = []
+
+        self.loaded = 0
+        self.sent = 0
+        self.skipped = 0
+        self.max_pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Возвращает число напоминаний в куче."""
+        return len(self._heap)
+
+    def start(self) -> None:
+        """Подключается к изменениям сроков и запускает фоновые задачи планировщика."""
+        if self._tasks:
+            return
+        self._db.set_due_hook(self.notify)
+        self._tasks.append(asyncio.create_task(self._run()))
+        for _ in range(self._send_workers):
+            self._tasks.append(asyncio.create_task(self._send_loop()))
+
+    async def close(self) -> None:
+        """Останавливает планировщик; неотправленные напоминания остаются в базе."""
+        self._db.set_due_hook(None)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        logger.info(
+            "Планировщик напоминаний остановлен: отправлено %s, пропущено %s",
+            self.sent,
+            self.skipped,
+        )
+
+    def notify(self, task_id: int, user_id: int, due_at: Optional[str]) -> None:
+        """
+        Учитывает новый срок задачи (обработчик set_due_hook хранилища).
+
+        Срок позже конца окна не хранится: он будет прочитан со следующим окном.
+
+        Параметры:
+            task_id (int): ID задачи.
+            user_id (int): ID пользователя Telegram.
+            due_at (Optional[str]): новый срок или None, если срок убран.
+        """
+        if due_at is None or (self._window_end is not None and due_at > self._window_end):
+            return
+
+        heapq.heappush(self._heap, (due_at, task_id, user_id))
+        if len(self._heap) > 2 * self._window_size:
+            # Окно разрослось из-за новых сроков: перечитываем его из базы
+            self._heap.clear()
+            self._window_key = None
+            self._window_end = None
+            self._reload = True
+            self._wakeup.set()
+            return
+
+        self.max_pending = max(self.max_pending, len(self._heap))
+        if self._heap[0][1] == task_id:
+            self._wakeup.set()
+
+    async def _load_window(self) -> None:
+        """Читает следующее окно напоминаний из индекса в кучу."""
+        self._reload = False
+        rows = await self._db.get_pending_reminders(self._window_size, after=self._window_key)
+        for row in rows:
+            heapq.heappush(self._heap, tuple(row))
+        self.loaded += len(rows)
+        self.max_pending = max(self.max_pending, len(self._heap))
+
+        if len(rows) < self._window_size:
+            self._window_key = None
+            self._window_end = None
+        else:
+            due_at, task_id, _ = rows[-1]
+            self._window_key = (due_at, task_id)
+            self._window_end = due_at
+        logger.debug("Загружено напоминаний: %s, в куче: %s", len(rows), len(self._heap))
+
+    async def _sleep(self, delay: Optional[float]) -> None:
+        """Спит delay секунд (None — до нового срока) или до пробуждения notify."""
+        self._wakeup.clear()
+        timeout = MAX_SLEEP if delay is None else min(delay, MAX_SLEEP)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        """Основной цикл: ждет ближайший срок и передает наступившие напоминания в очередь."""
+        while True:
+            try:
+                if self._reload:
+                    await self._load_window()
+                if not self._heap:
+                    await self._sleep(None)
+                    continue
+
+                due_at = self._heap[0][0]
+                if due_at > format_created_at():
+                    delay = (datetime.fromisoformat(due_at) - datetime.now()).total_seconds()
+                    await self._sleep(max(delay, 0.0))
+                    continue
+
+                reminder = heapq.heappop(self._heap)
+                # Ограниченная очередь не дает опережать отправку больше чем на окно
+                await self._queue.put(reminder)
+                if not self._heap and self._window_end is not None:
+                    self._reload = True
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:  # pylint: disable=broad-except
+                logger.exception("Ошибка планировщика напоминаний: %s", error)
+                self._reload = True
+                await asyncio.sleep(1.0)
+
+    async def _send_loop(self) -> None:
+        """Обработчик отправки: берет напоминания из очереди и отправляет их."""
+        while True:
+            reminder = await self._queue.get()
+            try:
+                await self._send(reminder)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:  # pylint: disable=broad-except
+                logger.exception("Не удалось обработать напоминание %s: %s", reminder[1], error)
+            finally:
+                self._queue.task_done()
+
+    async def _send(self, reminder: ReminderRow) -> None:
+        """Отмечает напоминание отправленным и отправляет его пользователю."""
+        due_at, task_id, _ = reminder
+        row = await self._db.claim_reminder(task_id, due_at)
+        if row is None or row[2] == "done":
+            # Срок изменили, задачу удалили или уже выполнили
+            self.skipped += 1
+            return
+
+        user_id, text, _ = row
+        wait = self._bucket.reserve(time.monotonic())
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        message = f"⏰ Напоминание (срок {format_due_at(due_at)}):\n{text}"
+        if len(message) > MESSAGE_MAX_LENGTH:
+            message = message[: MESSAGE_MAX_LENGTH - 1] + "…"
+        try:
+            await self._bot.send_message(user_id, message)
+        except TelegramAPIError as error:
+            # Например, пользователь заблокировал бота: напоминание не повторяем
+            logger.warning("Напоминание о задаче %s не доставлено: %s", task_id, error)
+            return
+        self.sent += 1
+        logger.info("Отправлено напоминание о задаче %s пользователю %s", task_id, user_id)
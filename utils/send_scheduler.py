@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from utils.logger import setup_logger
+from utils.throttling import BucketStore, TokenBucket
+
+logger = setup_logger(__name__)
+
+# Ограничение Telegram для групп: 20 сообщений в минуту в один чат
+GROUP_RATE = 20 / 60
+
+
+class SendSchedulerMiddleware(BaseRequestMiddleware):
+    """
+    Middleware сессии бота, который распределяет во времени запросы к Bot API,
+    адресованные чатам (sendMessage, sendDocument, editMessageText и т. п.).
+
+    Каждый такой запрос резервирует токен общей корзины бота и корзины чата
+    и при необходимости ждет своей очереди, не превышая ограничений Telegram:
+    около 30 сообщений в секунду всего, около 1 в секунду в личный чат
+    и 20 в минуту в группу. Запросы без chat_id (getMe, getFile,
+    answerCallbackQuery) выполняются без ожидания.
+
+    Ответ 429 (TelegramRetryAfter) приостанавливает отправку в чат на
+    retry_after секунд, после чего запрос повторяется до max_retries раз.
+    """
+
+    def __init__(
+        self,
+        global_rate: float = 30.0,
+        chat_rate: float = 1.0,
+        chat_burst: int = 3,
+        max_retries: int = 3,
+    ):
+        """
+        Конструктор класса SendSchedulerMiddleware.
+
+        Параметры:
+            global_rate (float): запросов к чатам в секунду для всего бота.
+            chat_rate (float): запросов в секунду в один личный чат.
+            chat_burst (int): запросов подряд в один чат без ожидания.
+            max_retries (int): число повторов запроса после ответа 429.
+        """
+        now = time.monotonic()
+        self._global = TokenBucket(max(1.0, global_rate), global_rate, now)
+        self._chats = BucketStore(chat_burst, chat_rate)
+        self._groups = BucketStore(chat_burst, GROUP_RATE)
+        self._max_retries = max(0, max_retries)
+        self.delayed = 0
+        self.retried = 0
+
+    def _bucket(self, chat_id: int | str, now: float) -> TokenBucket:
+        """Возвращает корзину чата: для групп и каналов действует более строгий лимит."""
+        if isinstance(chat_id, int) and chat_id > 0:
+            return self._chats.get(chat_id, now)
+        return self._groups.get(chat_id, now)
+
+    async def _wait_turn(self, chat_id: int | str) -> None:
+        """Резервирует место в общей очереди и в очереди чата и ждет своей очереди."""
+        now = time.monotonic()
+        wait = max(self._bucket(chat_id, now).reserve(now), self._global.reserve(now))
+        if wait > 0:
+            self.delayed += 1
+            await asyncio.sleep(wait)
+
+    def _pause_chat(self, chat_id: int | str, retry_after: float) -> None:
+        """Запрещает отправку в чат на retry_after секунд."""
+        now = time.monotonic()
+        bucket = self._bucket(chat_id, now)
+        bucket.tokens = min(bucket.tokens, 0.0) - retry_after * bucket.rate
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id: Optional[int | str] = getattr(method, "chat_id", None)
+        if chat_id is None:
+            return await make_request(bot, method)
+
+        attempt = 0
+        while True:
+            await self._wait_turn(chat_id)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as error:
+                if attempt >= self._max_retries:
+                    raise
+                attempt += 1
+                self.retried += 1
+                logger.warning(
+                    "Telegram ограничил отправку в чат %s (%s), повтор %s через %s с",
+                    chat_id,
+                    method.__api_method__,
+                    attempt,
+                    error.retry_after,
+                )
+                self._pause_chat(chat_id, error.retry_after)
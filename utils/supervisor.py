@@ -0,0 +1,515 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiohttp import web
+
+from config import Config
+from utils.logger import setup_logger, shutdown_logging
+from utils.metrics import REGISTRY, start_metrics_server
+from utils.webhook import wait_for_stop_signal
+
+logger = setup_logger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+# Фабрика HTTP-сессии бота в рабочем процессе; должна сериализоваться pickle
+SessionFactory = Callable[[], BaseSession]
+
+
+def shard_for_user(user_id: Optional[int], shards: int) -> int:
+    """
+    Возвращает номер шарда (рабочего процесса) для пользователя.
+
+    Хэш целого числа в Python не зависит от процесса, поэтому все обновления
+    пользователя попадают в один и тот же процесс. Обновления без пользователя
+    обрабатывает шард 0.
+
+    Параметры:
+        user_id (Optional[int]): идентификатор пользователя Telegram.
+        shards (int): число шардов.
+    """
+    if user_id is None:
+        return 0
+    return hash(user_id) % shards
+
+
+def extract_user_id(update: Dict[str, Any]) -> Optional[int]:
+    """
+    Находит идентификатор пользователя (или чата) в JSON обновления Telegram.
+
+    Параметры:
+        update (Dict[str, Any]): обновление в формате Bot API.
+
+    Возвращает:
+        Optional[int]: идентификатор или None, если обновление его не содержит.
+    """
+    for key, payload in update.items():
+        if key == "update_id" or not isinstance(payload, dict):
+            continue
+        user = payload.get("from") or payload.get("user")
+        if isinstance(user, dict) and "id" in user:
+            return int(user["id"])
+        chat = payload.get("chat")
+        if isinstance(chat, dict) and "id" in chat:
+            return int(chat["id"])
+    return None
+
+
+def shard_database_path(db_path: str, shard: int) -> str:
+    """
+    Возвращает путь к файлу базы данных шарда: ./tasks.db -> ./tasks.shard0.db.
+
+    Параметры:
+        db_path (str): путь к основной базе данных из конфигурации.
+        shard (int): номер шарда.
+    """
+    base, extension = os.path.splitext(db_path)
+    return f"{base}.shard{shard}{extension or '.db'}"
+
+
+async def _prepare_shared_database(db_path: str) -> None:
+    """
+    Применяет миграции общей базы до запуска рабочих процессов. Файл SQLite
+    здесь же переводится в режим auto_vacuum = INCREMENTAL, чтобы полный VACUUM
+    выполнил один процесс, а не все рабочие процессы одновременно.
+    """
+    from database.db_manager import DatabaseManager  # pylint: disable=import-outside-toplevel
+    from database.storage import create_storage  # pylint: disable=import-outside-toplevel
+
+    db_manager = create_storage(db_path, pool_size=1)
+    await db_manager.connect()
+    await db_manager.create_tables()
+    if Config.DB_VACUUM_INTERVAL > 0 and isinstance(db_manager, DatabaseManager):
+        await db_manager.enable_incremental_vacuum()
+    await db_manager.close()
+
+
+class _ShardWorker:
+    """
+    Цикл рабочего процесса: читает обновления из очереди и передает их диспетчеру.
+
+    Обновления разных пользователей обрабатываются конкурентно (не более
+    max_in_flight одновременно), а обновления одного пользователя — строго
+    в порядке поступления: каждое ожидает завершения предыдущего.
+    """
+
+    def __init__(self, shard: int, updates: "multiprocessing.Queue", max_in_flight: int):
+        self._shard = shard
+        self._updates = updates
+        self._in_flight = asyncio.Semaphore(max(1, max_in_flight))
+        self._tails: Dict[Optional[int], asyncio.Task] = {}
+        self._tasks: set = set()
+        self.processed = 0
+        self.failed = 0
+
+    async def run(self, bot: Bot, dispatcher: Any) -> None:
+        """Обрабатывает обновления до получения маркера остановки None."""
+        loop = asyncio.get_running_loop()
+        parent = multiprocessing.parent_process()
+        while True:
+            try:
+                raw_update = await loop.run_in_executor(None, self._updates.get, True, 1.0)
+            except queue.Empty:
+                # Супервизор завершился аварийно — маркера остановки не будет
+                if parent is not None and not parent.is_alive():
+                    logger.warning("Шард %s: супервизор завершился, остановка", self._shard)
+                    break
+                continue
+            if raw_update is None:
+                break
+            await self._in_flight.acquire()
+            self._schedule(bot, dispatcher, raw_update)
+
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _schedule(self, bot: Bot, dispatcher: Any, raw_update: Dict[str, Any]) -> None:
+        """Запускает обработку обновления после предыдущего обновления того же пользователя."""
+        user_id = extract_user_id(raw_update)
+        previous = self._tails.get(user_id)
+        task = asyncio.create_task(self._handle(bot, dispatcher, raw_update, previous))
+        self._tails[user_id] = task
+        self._tasks.add(task)
+
+        def _done(finished: asyncio.Task) -> None:
+            self._tasks.discard(finished)
+            self._in_flight.release()
+            if self._tails.get(user_id) is finished:
+                del self._tails[user_id]
+
+        task.add_done_callback(_done)
+
+    async def _handle(
+        self,
+        bot: Bot,
+        dispatcher: Any,
+        raw_update: Dict[str, Any],
+        previous: Optional[asyncio.Task],
+    ) -> None:
+        """Передает обновление диспетчеру, сохраняя порядок обновлений пользователя."""
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            await dispatcher.feed_raw_update(bot, raw_update)
+            self.processed += 1
+        except Exception as error:  # pylint: disable=broad-except
+            self.failed += 1
+            logger.exception(
+                "Шард %s: ошибка обработки обновления %s: %s",
+                self._shard,
+                raw_update.get("update_id"),
+                error,
+            )
+
+
+async def _run_worker(
+    shard: int,
+    workers: int,
+    database_path: str,
+    pool_size: Optional[int],
+    updates: "multiprocessing.Queue",
+    ready: Any,
+    results: "multiprocessing.Queue",
+    session_factory: Optional[SessionFactory],
+) -> None:
+    """Создает бота рабочего процесса и обрабатывает обновления шарда."""
+    # Импорт здесь: main импортирует этот модуль для запуска супервизора
+    from main import configure_logging, create_bot, shutdown_bot  # pylint: disable=import-outside-toplevel
+
+    session = session_factory() if session_factory is not None else None
+    metrics = REGISTRY if Config.METRICS_PORT > 0 else None
+    # Лимиты Telegram действуют на бота целиком, поэтому процессы делят их поровну
+    bot, dispatcher = await create_bot(
+        database_path,
+        pool_size=pool_size,
+        session=session,
+        metrics=metrics,
+        send_share=1 / workers,
+    )
+    metrics_server = None
+    if metrics is not None:
+        # У каждого процесса свой реестр, поэтому и свой порт
+        metrics_server = await start_metrics_server(
+            metrics, Config.METRICS_HOST, Config.METRICS_PORT + shard
+        )
+    # Уровни применяем после создания бота: конструкторы модулей настраивают свои логгеры
+    configure_logging()
+    worker = _ShardWorker(shard, updates, Config.WORKER_MAX_IN_FLIGHT)
+    logger.info("Шард %s запущен (pid %s, база %s)", shard, os.getpid(), database_path)
+    ready.set()
+
+    try:
+        await worker.run(bot, dispatcher)
+    finally:
+        if metrics_server is not None:
+            await metrics_server.cleanup()
+        await shutdown_bot(bot, dispatcher)
+        results.put((shard, worker.processed, worker.failed))
+        logger.info(
+            "Шард %s остановлен: обработано %s обновлений, ошибок %s",
+            shard,
+            worker.processed,
+            worker.failed,
+        )
+
+
+def _worker_main(
+    shard: int,
+    workers: int,
+    database_path: str,
+    pool_size: Optional[int],
+    updates: "multiprocessing.Queue",
+    ready: Any,
+    results: "multiprocessing.Queue",
+    session_factory: Optional[SessionFactory],
+) -> None:
+    """Точка входа рабочего процесса."""
+    # Остановкой управляет супервизор: сигналы получает вся группа процессов,
+    # а рабочий процесс должен сначала обработать уже полученные обновления
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    Config.load_env()
+    try:
+        asyncio.run(
+            _run_worker(
+                shard, workers, database_path, pool_size, updates, ready, results, session_factory
+            )
+        )
+    finally:
+        shutdown_logging()
+
+
+class Supervisor:
+    """
+    Супервизор рабочих процессов бота.
+
+    Каждый рабочий процесс запускает собственный цикл событий, диспетчер
+    и DatabaseManager. Обновления распределяются по процессам по user_id,
+    поэтому порядок обработки, состояния FSM и кэш задач пользователя
+    остаются в одном процессе.
+
+    Режимы базы данных:
+        sharded — у каждого процесса свой файл (tasks.shardN.db);
+        shared  — общая база в режиме WAL, миграции применяются один раз
+                  супервизором до запуска процессов.
+    База PostgreSQL (URL в DATABASE_PATH) всегда общая.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        shard_mode: str = "sharded",
+        database_path: Optional[str] = None,
+        session_factory: Optional[SessionFactory] = None,
+    ):
+        """
+        Конструктор класса Supervisor.
+
+        Параметры:
+            workers (int): число рабочих процессов.
+            shard_mode (str): режим базы данных: sharded или shared.
+            database_path (Optional[str]): путь к базе (по умолчанию Config.DATABASE_PATH).
+            session_factory (Optional[SessionFactory]): фабрика HTTP-сессии бота
+                в рабочих процессах (например, офлайн-сессия для бенчмарков).
+
+        Исключения:
+            ValueError: если число процессов меньше 1 или режим неизвестен.
+        """
+        if workers < 1:
+            raise ValueError("Число рабочих процессов должно быть положительным")
+        if shard_mode not in ("sharded", "shared"):
+            raise ValueError(f"Неизвестный режим базы данных: {shard_mode}")
+
+        self._workers = workers
+        self._shard_mode = shard_mode
+        self._database_path = database_path or Config.DATABASE_PATH
+        from database.storage import is_postgres_url  # pylint: disable=import-outside-toplevel
+
+        if shard_mode == "sharded" and is_postgres_url(self._database_path):
+            # Сервер PostgreSQL принимает запись от всех процессов одновременно
+            logger.info("База PostgreSQL используется всеми процессами (режим shared)")
+            self._shard_mode = "shared"
+        self._session_factory = session_factory
+        # spawn: рабочий процесс не наследует цикл событий и соединения родителя
+        self._context = multiprocessing.get_context("spawn")
+        self._queues: List["multiprocessing.Queue"] = []
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        self._results: "multiprocessing.Queue" = self._context.Queue()
+        self.routed = 0
+
+    @property
+    def workers(self) -> int:
+        """Возвращает число рабочих процессов."""
+        return self._workers
+
+    def start(self, timeout: float = 60.0) -> None:
+        """
+        Запускает рабочие процессы и ожидает их готовности.
+        Блокирующий вызов: из цикла событий вызывайте через run_in_executor.
+
+        Исключения:
+            RuntimeError: если процесс не успел запуститься за timeout секунд.
+        """
+        pool_size: Optional[int] = None
+        if self._shard_mode == "shared":
+            asyncio.run(_prepare_shared_database(self._database_path))
+            # Общая база требует WAL, который включает пул соединений
+            pool_size = max(1, Config.DB_POOL_SIZE)
+
+        ready_events = []
+        for shard in range(self._workers):
+            if self._shard_mode == "sharded":
+                database_path = shard_database_path(self._database_path, shard)
+            else:
+                database_path = self._database_path
+            updates = self._context.Queue()
+            ready = self._context.Event()
+            process = self._context.Process(
+                target=_worker_main,
+                args=(
+                    shard,
+                    self._workers,
+                    database_path,
+                    pool_size,
+                    updates,
+                    ready,
+                    self._results,
+                    self._session_factory,
+                ),
+                name=f"taskbot-shard-{shard}",
+                daemon=True,
+            )
+            process.start()
+            self._queues.append(updates)
+            self._processes.append(process)
+            ready_events.append(ready)
+
+        deadline = time.monotonic() + timeout
+        for shard, ready in enumerate(ready_events):
+            # Завершившийся с ошибкой процесс обнаруживаем сразу, не дожидаясь timeout
+            while not ready.wait(0.1):
+                if not self._processes[shard].is_alive() or time.monotonic() > deadline:
+                    self.stop(timeout=1.0)
+                    raise RuntimeError(f"Рабочий процесс шарда {shard} не запустился")
+
+        logger.info(
+            "Запущено рабочих процессов: %s (режим базы: %s)", self._workers, self._shard_mode
+        )
+
+    def route(self, update: Dict[str, Any]) -> int:
+        """
+        Передает обновление рабочему процессу пользователя.
+
+        Параметры:
+            update (Dict[str, Any]): обновление в формате Bot API.
+
+        Возвращает:
+            int: номер шарда, получившего обновление.
+        """
+        shard = shard_for_user(extract_user_id(update), self._workers)
+        self._queues[shard].put(update)
+        self.routed += 1
+        return shard
+
+    def stop(self, timeout: float = 30.0) -> Dict[int, int]:
+        """
+        Останавливает рабочие процессы после обработки уже переданных обновлений.
+        Блокирующий вызов: из цикла событий вызывайте через run_in_executor.
+
+        Параметры:
+            timeout (float): время ожидания завершения каждого процесса в секундах.
+
+        Возвращает:
+            Dict[int, int]: число обработанных обновлений по номерам шардов.
+        """
+        for updates in self._queues:
+            updates.put(None)
+
+        processed: Dict[int, int] = {}
+        for _ in range(sum(1 for process in self._processes if process.is_alive())):
+            try:
+                shard, done, _ = self._results.get(timeout=timeout)
+            except queue.Empty:
+                break
+            processed[shard] = done
+
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                logger.warning("Рабочий процесс %s не завершился, принудительная остановка", process.name)
+                process.terminate()
+
+        self._queues.clear()
+        self._processes.clear()
+        logger.info("Рабочие процессы остановлены, обработано: %s", sum(processed.values()))
+        return processed
+
+
+async def _poll_updates(bot: Bot, supervisor: Supervisor, allowed_updates: List[str]) -> None:
+    """Получает обновления через getUpdates и распределяет их по рабочим процессам."""
+    offset: Optional[int] = None
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset, timeout=30, allowed_updates=allowed_updates
+            )
+        except Exception as error:  # pylint: disable=broad-except
+            logger.error("Ошибка получения обновлений: %s", error)
+            await asyncio.sleep(5)
+            continue
+
+        for update in updates:
+            supervisor.route(update.model_dump(mode="json", by_alias=True, exclude_none=True))
+            offset = update.update_id + 1
+
+
+def _build_routing_app(supervisor: Supervisor, path: str, secret_token: str) -> web.Application:
+    """Создает webhook-приложение, которое только распределяет обновления по процессам."""
+
+    async def handle(request: web.Request) -> web.Response:
+        if secret_token and request.headers.get(SECRET_HEADER) != secret_token:
+            return web.Response(status=401, text="Unauthorized")
+        supervisor.route(await request.json())
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post(path, handle)
+    return app
+
+
+async def run_supervisor(
+    workers: int,
+    shard_mode: str = "sharded",
+    session_factory: Optional[SessionFactory] = None,
+) -> None:
+    """
+    Запускает рабочие процессы и распределяет между ними обновления Telegram.
+
+    Обновления супервизор получает так же, как и обычный запуск: через
+    long polling или webhook (Config.RUN_MODE), но вместо обработки
+    передает их рабочему процессу пользователя. Работает до SIGINT/SIGTERM,
+    после чего дожидается обработки уже полученных обновлений.
+
+    Параметры:
+        workers (int): число рабочих процессов.
+        shard_mode (str): режим базы данных: sharded или shared.
+        session_factory (Optional[SessionFactory]): фабрика HTTP-сессии бота.
+    """
+    # Импорт здесь: main импортирует этот модуль для запуска супервизора
+    from aiogram.fsm.storage.memory import MemoryStorage  # pylint: disable=import-outside-toplevel
+    from main import create_dispatcher  # pylint: disable=import-outside-toplevel
+
+    loop = asyncio.get_running_loop()
+    supervisor = Supervisor(workers, shard_mode, session_factory=session_factory)
+    await loop.run_in_executor(None, supervisor.start)
+
+    bot = Bot(token=Config.BOT_TOKEN, session=session_factory() if session_factory else None)
+    allowed_updates = create_dispatcher(MemoryStorage()).resolve_used_update_types()
+    runner: Optional[web.AppRunner] = None
+    polling: Optional[asyncio.Task] = None
+
+    try:
+        if Config.RUN_MODE == "webhook":
+            if Config.WEBHOOK_BASE_URL:
+                webhook_url = Config.WEBHOOK_BASE_URL.rstrip("/") + Config.WEBHOOK_PATH
+                await bot.set_webhook(
+                    webhook_url,
+                    secret_token=Config.WEBHOOK_SECRET or None,
+                    allowed_updates=allowed_updates,
+                )
+                logger.info("Webhook зарегистрирован: %s", webhook_url)
+            runner = web.AppRunner(
+                _build_routing_app(supervisor, Config.WEBHOOK_PATH, Config.WEBHOOK_SECRET)
+            )
+            await runner.setup()
+            await web.TCPSite(runner, host=Config.WEBHOOK_HOST, port=Config.WEBHOOK_PORT).start()
+            logger.info(
+                "Webhook-сервер супервизора слушает %s:%s%s",
+                Config.WEBHOOK_HOST,
+                Config.WEBHOOK_PORT,
+                Config.WEBHOOK_PATH,
+            )
+        else:
+            await bot.delete_webhook()
+            polling = asyncio.create_task(_poll_updates(bot, supervisor, allowed_updates))
+            logger.info("Супервизор получает обновления через polling")
+
+        await wait_for_stop_signal()
+        logger.info("Получен сигнал остановки супервизора")
+    finally:
+        if polling is not None:
+            polling.cancel()
+            await asyncio.gather(polling, return_exceptions=True)
+        if runner is not None:
+            await runner.cleanup()
+        await bot.session.close()
+        await loop.run_in_executor(None, supervisor.stop)
@@ -0,0 +1,126 @@
+"""
+Разбор задач для массового импорта: многострочные сообщения и CSV-файлы
+в формате выгрузки /list_csv (utils/csv_generator.py).
+
+Функции возвращают генераторы задач (текст, дата создания, статус, категория),
+поэтому входные данные разбираются потоково и передаются
+в DatabaseManager.add_tasks_bulk порциями, без построения полного списка
+задач в памяти.
+"""
+
+import csv
+import io
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from database.db_manager import format_created_at
+from database.models import parse_task_status
+from utils.csv_generator import CSV_HEADER
+
+# Задача для импорта: текст, дата создания (None — текущее время),
+# код статуса (None — статус по умолчанию) и категория (None — без категории)
+ImportedTask = Tuple[str, Optional[str], Optional[str], Optional[str]]
+
+TEXT_COLUMN = CSV_HEADER[1]
+CREATED_AT_COLUMN = CSV_HEADER[3]
+STATUS_COLUMN = CSV_HEADER[4]
+CATEGORY_COLUMN = CSV_HEADER[5]
+
+
+def _normalize_created_at(value: str) -> Optional[str]:
+    """
+    Приводит дату создания из файла к формату format_created_at.
+
+    Параметры:
+        value (str): дата в формате ISO 8601.
+
+    Возвращает:
+        Optional[str]: нормализованная дата или None, если значение не распознано.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return format_created_at(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def _column_index(header: List[str], column: str) -> Optional[int]:
+    """Возвращает номер столбца в заголовке или None, если столбца нет."""
+    return header.index(column) if column in header else None
+
+
+def _cell(row: List[str], index: Optional[int]) -> str:
+    """Возвращает значение ячейки или пустую строку, если столбца нет в строке."""
+    if index is None or index >= len(row):
+        return ""
+    return row[index]
+
+
+def iter_message_tasks(text: str) -> Iterator[ImportedTask]:
+    """
+    Разбирает многострочное сообщение: каждая непустая строка — отдельная задача.
+
+    Параметры:
+        text (str): текст сообщения.
+
+    Возвращает:
+        Iterator[ImportedTask]: задачи с текущей датой создания и статусом по умолчанию.
+    """
+    for line in io.StringIO(text):
+        line = line.strip()
+        if line:
+            yield line, None, None, None
+
+
+def iter_csv_tasks(stream: BinaryIO) -> Iterator[ImportedTask]:
+    """
+    Потоково разбирает CSV-файл в формате выгрузки /list_csv.
+
+    Файл читается построчно (UTF-8, допускается BOM, разделитель «;»).
+    Столбцы определяются по заголовку: обязателен «Текст»; «Дата создания»
+    и «Статус» сохраняются, если распознаны, «Категория» — как есть.
+    Остальные столбцы (ID, пользователь) игнорируются — задачи
+    импортируются для текущего пользователя.
+    Строки с пустым текстом пропускаются.
+
+    Параметры:
+        stream (BinaryIO): содержимое файла.
+
+    Возвращает:
+        Iterator[ImportedTask]: задачи в порядке следования в файле.
+
+    Исключения:
+        ValueError: если в файле нет заголовка со столбцом «Текст»
+            или файл не в кодировке UTF-8.
+    """
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    reader = csv.reader(text_stream, delimiter=";")
+    try:
+        header = [column.strip() for column in next(reader, [])]
+        if TEXT_COLUMN not in header:
+            raise ValueError(
+                f"В файле нет заголовка со столбцом «{TEXT_COLUMN}». "
+                "Ожидается CSV в формате выгрузки /list_csv."
+            )
+        text_index = header.index(TEXT_COLUMN)
+        created_at_index = _column_index(header, CREATED_AT_COLUMN)
+        status_index = _column_index(header, STATUS_COLUMN)
+        category_index = _column_index(header, CATEGORY_COLUMN)
+
+        for row in reader:
+            if len(row) <= text_index:
+                continue
+            text = row[text_index].strip()
+            if not text:
+                continue
+            created_at = _normalize_created_at(_cell(row, created_at_index))
+            status = parse_task_status(_cell(row, status_index))
+            category = _cell(row, category_index).strip() or None
+            yield text, created_at, status, category
+    except UnicodeDecodeError as error:
+        raise ValueError("Файл должен быть в кодировке UTF-8") from error
+    finally:
+        # Поток принадлежит вызывающему: отсоединяем обертку, не закрывая его
+        text_stream.detach()
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Флаг обработчика с ключом дополнительного лимита, например flags={"throttling_key": "heavy"}
+THROTTLING_FLAG = "throttling_key"
+
+
+class TokenBucket:
+    """
+    Корзина токенов: до capacity событий подряд, затем rate событий в секунду.
+    Время передается явно, чтобы корзины можно было проверять без задержек.
+    """
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float, now: float):
+        """
+        Конструктор класса TokenBucket.
+
+        Параметры:
+            capacity (float): максимальное число накопленных токенов (размер всплеска).
+            rate (float): скорость пополнения в токенах в секунду.
+            now (float): текущее время time.monotonic().
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        """Начисляет токены за время, прошедшее с последнего обращения."""
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def consume(self, now: float) -> float:
+        """
+        Забирает токен, если он есть.
+
+        Возвращает:
+            float: 0, если токен получен, иначе время в секундах до появления токена.
+        """
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def reserve(self, now: float) -> float:
+        """
+        Забирает токен в счет будущего пополнения (баланс может стать отрицательным).
+
+        Возвращает:
+            float: время в секундах, через которое зарезервированный токен
+            станет доступен (0 — сразу).
+        """
+        self._refill(now)
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def is_full(self, now: float) -> bool:
+        """Возвращает True, если корзина полностью пополнилась (ее можно удалить)."""
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class BucketStore:
+    """
+    Набор корзин токенов по ключам с удалением неактивных.
+    Полностью пополнившаяся корзина не отличается от новой,
+    поэтому при росте числа ключей такие корзины удаляются.
+    """
+
+    def __init__(self, capacity: float, rate: float, max_idle_keys: int = 10000):
+        """
+        Конструктор класса BucketStore.
+
+        Параметры:
+            capacity (float): размер всплеска корзин.
+            rate (float): скорость пополнения корзин в токенах в секунду.
+            max_idle_keys (int): число корзин, после которого удаляются неактивные.
+        """
+        self.capacity = capacity
+        self.rate = rate
+        self._max_keys = max_idle_keys
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+
+    def get(self, key: Hashable, now: float) -> TokenBucket:
+        """Возвращает корзину ключа, создавая ее при необходимости."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self._max_keys:
+                self._prune(now)
+            bucket = TokenBucket(self.capacity, self.rate, now)
+            self._buckets[key] = bucket
+        return bucket
+
+    def _prune(self, now: float) -> None:
+        """Удаляет корзины, которые полностью пополнились."""
+        for key in [key for key, bucket in self._buckets.items() if bucket.is_full(now)]:
+            del self._buckets[key]
+        # Если активных корзин больше лимита, лимит растет вместе с ними
+        self._max_keys = max(self._max_keys, len(self._buckets) * 2)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """
+    Ограничение частоты сообщений и нажатий кнопок от одного пользователя.
+
+    Каждое событие расходует токен общей корзины пользователя. Обработчики
+    с флагом throttling_key дополнительно расходуют токен корзины
+    (пользователь, ключ): так дорогие операции (выгрузки, импорт файлов)
+    ограничиваются строже остальных команд.
+
+    Отклоненное событие не передается обработчику. Пользователь получает
+    одно предупреждение на серию отклоненных событий, чтобы ответы на спам
+    сами не упирались в лимиты Telegram.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 10,
+        key_limits: Optional[Mapping[str, Tuple[int, float]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        max_warned: int = 10000,
+    ):
+        """
+        Конструктор класса ThrottlingMiddleware.
+
+        Параметры:
+            rate (float): событий в секунду на пользователя в среднем.
+            burst (int): событий пользователя подряд без ожидания.
+            key_limits (Optional[Mapping[str, Tuple[int, float]]]): лимиты по ключам
+                флага throttling_key: (событий подряд, секунд на пополнение одного токена).
+            clock (Callable[[], float]): источник времени (для проверок без задержек).
+            max_warned (int): число записей о предупреждениях, после которого
+                удаляются записи о закончившихся сериях.
+        """
+        self._users = BucketStore(burst, rate)
+        self._keys: Dict[str, BucketStore] = {
+            key: BucketStore(key_burst, 1 / interval)
+            for key, (key_burst, interval) in (key_limits or {}).items()
+        }
+        self._clock = clock
+        # Пользователи, уже получившие предупреждение в текущей серии отклонений,
+        # и время, когда серия заканчивается (снова появляется токен)
+        self._warned: Dict[Tuple[int, str], float] = {}
+        self._max_warned = max_warned
+        self.rejected = 0
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        now = self._clock()
+        key = get_flag(data, THROTTLING_FLAG)
+        scope = "user"
+        wait = self._users.get(user.id, now).consume(now)
+        if not wait and key in self._keys:
+            scope = key
+            wait = self._keys[key].get(user.id, now).consume(now)
+            if wait:
+                # Токен общей корзины не расходуется на отклоненное событие
+                self._users.get(user.id, now).tokens += 1
+
+        if not wait:
+            self._warned.pop((user.id, "user"), None)
+            self._warned.pop((user.id, scope), None)
+            return await handler(event, data)
+
+        self.rejected += 1
+        logger.info(
+            "Пользователь %s ограничен (%s), повтор через %.1f с", user.id, scope, wait
+        )
+        if (user.id, scope) not in self._warned:
+            if len(self._warned) >= self._max_warned:
+                self._prune_warned(now)
+            self._warned[(user.id, scope)] = now + wait
+            await self._notify(event, wait)
+        return None
+
+    def _prune_warned(self, now: float) -> None:
+        """
+        Удаляет записи о сериях, которые уже закончились: пользователь, который
+        больше не писал боту, иначе остался бы в _warned навсегда.
+        """
+        for key in [key for key, ends_at in self._warned.items() if ends_at <= now]:
+            del self._warned[key]
+        # Если активных серий больше лимита, лимит растет вместе с ними
+        self._max_warned = max(self._max_warned, len(self._warned) * 2)
+
+    @staticmethod
+    async def _notify(event: TelegramObject, wait: float) -> None:
+        """Сообщает пользователю, через сколько секунд можно повторить запрос."""
+        text = f"Слишком много запросов. Повторите через {max(1, round(wait))} с."
+        if isinstance(event, CallbackQuery):
+            await event.answer(text)
+        elif isinstance(event, Message):
+            await event.answer(text)
+
+
+def setup_throttling(dispatcher: Dispatcher, middleware: ThrottlingMiddleware) -> None:
+    """
+    Подключает ограничение частоты к сообщениям и нажатиям кнопок всех роутеров.
+
+    Middleware регистрируется как внутренний: к моменту вызова уже выбран
+    обработчик, поэтому доступен его флаг throttling_key.
+
+    Параметры:
+        dispatcher (Dispatcher): диспетчер бота.
+        middleware (ThrottlingMiddleware): настроенный middleware.
+    """
+    dispatcher.message.middleware(middleware)
+    dispatcher.callback_query.middleware(middleware)
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import signal
+from typing import Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+async def wait_for_stop_signal() -> None:
+    """
+    Ожидает SIGINT или SIGTERM в текущем цикле событий.
+    Если обработчики сигналов недоступны (Windows, не главный поток),
+    ожидание завершается только отменой задачи.
+    """
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    installed = []
+    for stop_signal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(stop_signal, stop_event.set)
+            installed.append(stop_signal)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    try:
+        await stop_event.wait()
+    finally:
+        for stop_signal in installed:
+            loop.remove_signal_handler(stop_signal)
+
+
+def build_webhook_app(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    path: str = "/webhook",
+    secret_token: Optional[str] = None,
+    handle_in_background: bool = True,
+) -> web.Application:
+    """
+    Создает aiohttp-приложение, принимающее обновления Telegram по webhook.
+
+    Параметры:
+        dispatcher (Dispatcher): диспетчер с подключенными роутерами.
+        bot (Bot): экземпляр бота.
+        path (str): путь, на который Telegram отправляет обновления.
+        secret_token (Optional[str]): секрет, ожидаемый в заголовке
+            X-Telegram-Bot-Api-Secret-Token; запросы без него получают 401.
+        handle_in_background (bool): отвечать Telegram сразу и обрабатывать
+            обновление в фоне; False — отвечать после обработки.
+
+    Возвращает:
+        web.Application: приложение со связанным жизненным циклом диспетчера.
+    """
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dispatcher,
+        bot=bot,
+        secret_token=secret_token or None,
+        handle_in_background=handle_in_background,
+    ).register(app, path=path)
+    # Запуск и остановка приложения вызывают startup/shutdown диспетчера
+    setup_application(app, dispatcher, bot=bot)
+    return app
+
+
+async def run_webhook(
+    dispatcher: Dispatcher,
+    bot: Bot,
+    host: str,
+    port: int,
+    path: str = "/webhook",
+    secret_token: Optional[str] = None,
+    base_url: Optional[str] = None,
+) -> None:
+    """
+    Запускает webhook-сервер и работает до получения SIGINT/SIGTERM.
+
+    Если задан base_url, при запуске бот регистрирует webhook в Telegram
+    по адресу base_url + path. Без base_url сервер только принимает
+    запросы, что удобно для локальной проверки синтетическими обновлениями.
+
+    Параметры:
+        dispatcher (Dispatcher): диспетчер с подключенными роутерами.
+        bot (Bot): экземпляр бота.
+        host (str): адрес, на котором слушает сервер.
+        port (int): порт сервера.
+        path (str): путь для приема обновлений.
+        secret_token (Optional[str]): секрет для проверки запросов Telegram.
+        base_url (Optional[str]): публичный адрес бота для регистрации webhook.
+
+    Логирует запуск и остановку сервера на уровне INFO.
+    """
+    app = build_webhook_app(dispatcher, bot, path=path, secret_token=secret_token)
+
+    if base_url:
+        webhook_url = base_url.rstrip("/") + path
+        await bot.set_webhook(
+            webhook_url,
+            secret_token=secret_token or None,
+            allowed_updates=dispatcher.resolve_used_update_types(),
+        )
+        logger.info("Webhook зарегистрирован: %s", webhook_url)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=host, port=port)
+    await site.start()
+    logger.info("Webhook-сервер слушает %s:%s%s", host, port, path)
+
+    try:
+        await wait_for_stop_signal()
+        logger.info("Получен сигнал остановки webhook-сервера")
+    finally:
+        # Останавливаем прием запросов и дожидаемся shutdown диспетчера
+        await runner.cleanup()
+        logger.info("Webhook-сервер остановлен")